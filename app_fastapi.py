@@ -1 +1,260 @@
+"""
+시장 가판대 OCR REST API 서버 (FastAPI)
+모바일 앱/다른 서비스에서 프로그래밍 방식으로 OCR을 호출할 수 있습니다.
 
+실행:
+    python app_fastapi.py
+    (API 문서: http://localhost:8000/docs)
+"""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from settings import get_settings
+from ocr_processor import COMPOSITE_METHODS, MarketOCRProcessor, SUPPORTED_METHODS, get_engine_concurrency
+from upload_spool import UPLOAD_CHUNK_SIZE, SpooledUpload, UploadTooLarge, get_max_upload_bytes
+
+
+# 환경변수 로드 (아래 모듈 상수가 설정 파일 값을 읽을 수 있도록 먼저)
+get_settings()
+
+# 업로드 제한 (환경변수로 변경 가능)
+MAX_UPLOAD_BYTES = get_max_upload_bytes()
+BATCH_MAX_FILES = int(os.getenv("OCR_BATCH_MAX_FILES", 50))
+
+DEFAULT_METHOD = os.getenv("OCR_DEFAULT_METHOD", "gpt4_vision")
+
+# 방법별 프로세서 (요청마다 새로 만들지 않음)
+_processors = {}
+
+
+def get_processor(method: str) -> MarketOCRProcessor:
+    """
+    방법별 공용 MarketOCRProcessor 반환
+
+    Raises:
+        HTTPException: 지원하지 않는 방법이거나 API 키 설정이 없는 경우 (400)
+    """
+    if method not in SUPPORTED_METHODS + COMPOSITE_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": f"지원하지 않는 OCR 방법: {method}", "supported_methods": SUPPORTED_METHODS + COMPOSITE_METHODS}
+        )
+
+    processor = _processors.get(method)
+    if processor is None:
+        try:
+            processor = MarketOCRProcessor(method=method)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"error": str(e), "method": method})
+        _processors[method] = processor
+    return processor
+
+
+async def read_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> SpooledUpload:
+    """
+    업로드 파일 확인 - Starlette가 이미 스풀한 UploadFile.file을 복사하지 않고 그대로 사용
+    (청크 단위로 읽으며 크기 제한 확인 + 해시 계산, 최대 크기 초과 시 즉시 중단)
+
+    Returns:
+        SpooledUpload (사용 후 close() 필요)
+
+    Raises:
+        HTTPException: 파일이 비었거나(400) 너무 큰 경우(413)
+    """
+    # 크기를 알면 읽기 전에 바로 거절
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail={"error": str(UploadTooLarge(max_bytes)), "filename": file.filename})
+
+    upload = SpooledUpload(max_bytes, filename=file.filename, file=file.file)
+    try:
+        await file.seek(0)
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            upload.write(chunk)
+    except UploadTooLarge as e:
+        upload.close()
+        raise HTTPException(status_code=413, detail={"error": str(e), "filename": file.filename})
+
+    if upload.size == 0:
+        upload.close()
+        raise HTTPException(status_code=400, detail={"error": "빈 파일입니다.", "filename": file.filename})
+
+    return upload
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 로컬 엔진 예열, 종료 시 공용 클라이언트 정리"""
+    from warmup import start_prewarm
+    start_prewarm()
+
+    from ocr_jobs import start_job_workers
+    workers = start_job_workers()
+
+    yield
+
+    workers.stop()
+
+    from ocr_clients import close_naver_session, close_openai_clients
+    close_naver_session()
+    close_openai_clients()
+
+
+app = FastAPI(
+    title="시장 가판대 OCR API",
+    description="시장 가판대 사진에서 상품명과 가격을 인식하여 JSON으로 반환합니다.",
+    version="1.0.0",
+    lifespan=lifespan,
+)
+
+
+@app.post("/ocr")
+async def ocr(
+    file: UploadFile = File(...),
+    method: str = Form(DEFAULT_METHOD),
+    timeout: Optional[float] = Form(None)
+):
+    """
+    단일 이미지 OCR
+
+    - **file**: 이미지 파일 (jpg, png, webp)
+    - **method**: gpt4_vision, google_vision, naver_clova, pp_ocrv5, race (여러 엔진 동시 실행), cascade (로컬 엔진부터, 신뢰도가 낮을 때만 유료 엔진)
+    - **timeout**: 전체 제한 시간 (초, 선택 - 재시도/대기 포함)
+    """
+    processor = get_processor(method)
+    with await read_upload(file) as upload:
+        result = await processor.process_image_bytes_async(
+            upload.read(), method=method, image_path=file.filename, image_digest=upload.digest, timeout=timeout
+        )
+
+    if result.get("rate_limited"):
+        headers = {"Retry-After": str(int(result["retry_after"]) + 1)} if "retry_after" in result else None
+        return JSONResponse(status_code=429, content=result, headers=headers)
+    if "error" in result:
+        return JSONResponse(status_code=502, content=result)
+    return result
+
+
+@app.post("/ocr/batch")
+async def ocr_batch(files: List[UploadFile] = File(...), method: str = Form(DEFAULT_METHOD)):
+    """
+    여러 이미지 배치 OCR (동시 처리, 엔진별 동시 실행 수 제한 적용)
+
+    - **files**: 이미지 파일 목록
+    - **method**: gpt4_vision, google_vision, naver_clova, pp_ocrv5
+    """
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail={"error": f"한 번에 최대 {BATCH_MAX_FILES}개까지 처리할 수 있습니다.", "received": len(files)}
+        )
+
+    processor = get_processor(method)
+
+    async def process_one(file: UploadFile) -> Dict:
+        try:
+            upload = await read_upload(file)
+        except HTTPException as e:
+            return {**e.detail, "filename": file.filename}
+        with upload:
+            result = await processor.process_image_bytes_async(
+                upload.read(), method=method, image_path=file.filename, image_digest=upload.digest
+            )
+        result.setdefault("filename", file.filename)
+        return result
+
+    results = await asyncio.gather(*[process_one(file) for file in files])
+
+    return {
+        "results": results,
+        "total": len(results),
+        "succeeded": sum(1 for result in results if "error" not in result),
+        "method": method,
+    }
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    file: UploadFile = File(...),
+    method: str = Form(DEFAULT_METHOD),
+    callback_url: Optional[str] = Form(None)
+):
+    """
+    비동기 OCR 작업 등록 - 작업 ID를 바로 반환하고 백그라운드 워커가 처리
+
+    - **file**: 이미지 파일
+    - **method**: gpt4_vision, google_vision, naver_clova, pp_ocrv5
+    - **callback_url**: 완료 시 작업 결과를 POST할 URL (선택)
+    """
+    if method not in SUPPORTED_METHODS + COMPOSITE_METHODS:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": f"지원하지 않는 OCR 방법: {method}", "supported_methods": SUPPORTED_METHODS + COMPOSITE_METHODS}
+        )
+
+    from ocr_jobs import get_job_queue
+
+    with await read_upload(file) as upload:
+        try:
+            job_id = await asyncio.to_thread(
+                get_job_queue().submit, upload.stream(), method, file.filename, callback_url
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"error": str(e), "callback_url": callback_url})
+    return {"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """비동기 OCR 작업 상태/결과 조회 (폴링용)"""
+    from ocr_jobs import get_job_queue
+
+    job = await asyncio.to_thread(get_job_queue().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail={"error": "작업을 찾을 수 없습니다.", "job_id": job_id})
+    return job
+
+
+@app.get("/health")
+async def health():
+    """서버 상태 확인 (예열 상태, 엔진별 동시 실행 제한 포함)"""
+    from engine_registry import engine_status
+    from rate_limit import rate_limit_status
+    from resilience import circuit_status, latency_status
+    from singleflight import inflight
+    from warmup import readiness
+
+    return {
+        "status": "ok",
+        "engines": engine_status(),
+        "ready": readiness.ready,
+        "warmup": readiness.snapshot(),
+        "supported_methods": SUPPORTED_METHODS + COMPOSITE_METHODS,
+        "engine_concurrency": {method: get_engine_concurrency(method) for method in SUPPORTED_METHODS},
+        "rate_limits": rate_limit_status(),
+        "latency": latency_status(),
+        "circuit_breakers": circuit_status(),
+        "singleflight": inflight.snapshot(),
+    }
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("FASTAPI_PORT", 8000))
+
+    print("=" * 60)
+    print("🚀 시장 가판대 OCR API 서버 시작")
+    print("=" * 60)
+    print(f"📄 API 문서: http://localhost:{port}/docs")
+    print(f"🤖 기본 OCR 엔진: {DEFAULT_METHOD}")
+    print("=" * 60)
+
+    uvicorn.run(app, host="0.0.0.0", port=port)
@@ -5,10 +5,9 @@
 
 import streamlit as st
 import json
-import os
 from pathlib import Path
-from PIL import Image
-import tempfile
+from settings import get_settings
+from upload_spool import UploadTooLarge, spool_stream
 
 # 사용자 정의 OCR 프로세서 임포트
 try:
@@ -40,6 +39,24 @@ st.set_page_config(
 )
 
 
+@st.cache_resource
+def get_ultra_safe_processor():
+    """UltraSafeOCR 인스턴스 재사용 (클릭마다 새로 만들지 않음)"""
+    return UltraSafeOCR()
+
+
+@st.cache_resource
+def get_simple_processor():
+    """SimpleOCRProcessor 인스턴스 재사용"""
+    return SimpleOCRProcessor()
+
+
+@st.cache_resource
+def get_market_processor(method: str):
+    """방법별 MarketOCRProcessor 인스턴스 재사용"""
+    return MarketOCRProcessor(method=method)
+
+
 def main():
     """
     메인 애플리케이션 함수
@@ -81,10 +98,9 @@ def main():
     st.sidebar.subheader("🔑 API 키 상태")
     
     # 선택한 OCR 방법에 따라 API 키 상태 확인
+    settings = get_settings()
     if ocr_method == "naver_clova":
-        naver_secret = os.getenv("NAVER_OCR_SECRET_KEY")
-        naver_url = os.getenv("NAVER_OCR_API_URL")
-        if naver_secret and naver_url and "여기에" not in naver_secret:
+        if not settings.missing_for("naver_clova"):
             st.sidebar.success("✅ Naver Clova OCR 설정 완료")
         else:
             st.sidebar.error("❌ Naver Clova OCR 키가 설정되지 않았습니다.")
@@ -98,16 +114,14 @@ def main():
             """)
     
     elif ocr_method == "gpt4_vision":
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
+        if settings.openai_api_key:
             st.sidebar.success("✅ OpenAI API 키 확인됨")
         else:
             st.sidebar.error("❌ OpenAI API 키가 설정되지 않았습니다.")
             st.sidebar.info("`.env` 파일에 `OPENAI_API_KEY`를 추가하세요.")
     
     elif ocr_method == "google_vision":
-        credentials = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        if credentials:
+        if settings.google_credentials:
             st.sidebar.success("✅ Google Cloud 인증 확인됨")
         else:
             st.sidebar.error("❌ Google Cloud 인증이 설정되지 않았습니다.")
@@ -148,36 +162,35 @@ def main():
         with col1:
             st.subheader("📷 업로드된 이미지")
             
-            # 이미지 표시 및 임시 저장
+            # 이미지 표시 및 스풀링 (디코딩/재인코딩/임시 파일 저장 없이 원본 바이트 그대로 사용)
+            upload = None
             if uploaded_file:
                 # 업로드된 파일 표시
-                image = Image.open(uploaded_file)
-                st.image(image, use_container_width=True)
+                st.image(uploaded_file, use_container_width=True)
                 
-                # 임시 파일로 저장 (파일명 강제 ASCII화)
-                import uuid
-                temp_filename = f"uploaded_image_{uuid.uuid4().hex}.jpg"
-                temp_image_path = os.path.join(tempfile.gettempdir(), temp_filename)
-                image.save(temp_image_path)
+                try:
+                    uploaded_file.seek(0)
+                    upload = spool_stream(uploaded_file, filename=uploaded_file.name)
+                except UploadTooLarge as e:
+                    st.error(f"❌ {e}")
             
             else:
                 # 샘플 이미지 (실제로는 사용자가 제공한 이미지를 사용)
                 st.info("샘플 이미지를 사용하려면 `sample_images/` 폴더에 이미지를 넣으세요.")
-                temp_image_path = None
         
         with col2:
             st.subheader("🔍 OCR 결과")
             
             # OCR 처리 버튼
             if st.button("🚀 OCR 시작", type="primary", use_container_width=True):
-                if temp_image_path and os.path.exists(temp_image_path):
+                if upload is not None:
                     # 프로그레스 표시
                     with st.spinner(f"🤖 {ocr_method}로 이미지 분석 중... (약 5-10초 소요)"):
                         try:
                             # OCR 프로세서 생성 (초안전 프로세서 우선 사용)
                             if USE_ULTRA_SAFE_OCR and ocr_method == "gpt4_vision":
-                                processor = UltraSafeOCR()
-                                result = processor.process_image(temp_image_path)
+                                processor = get_ultra_safe_processor()
+                                result = processor.process_base64(upload.base64())
                                 
                                 # 결과 형식 통일
                                 if result.get("success"):
@@ -192,8 +205,8 @@ def main():
                                 else:
                                     result = {"error": result.get("error", "Unknown error")}
                             elif USE_SIMPLE_PROCESSOR and ocr_method == "gpt4_vision":
-                                processor = SimpleOCRProcessor()
-                                result = processor.process_image(temp_image_path)
+                                processor = get_simple_processor()
+                                result = processor.process_base64(upload.base64())
                                 
                                 # 결과 형식 통일
                                 if result.get("success"):
@@ -210,8 +223,10 @@ def main():
                             else:
                                 # 기존 프로세서 사용 (가용성 확인)
                                 if MARKET_OCR_AVAILABLE:
-                                    processor = MarketOCRProcessor(method=ocr_method)
-                                    result = processor.process_image(temp_image_path)
+                                    processor = get_market_processor(ocr_method)
+                                    result = processor.process_image_bytes(
+                                        upload.read(), image_path=upload.filename, image_digest=upload.digest
+                                    )
                                 else:
                                     result = {"error": "MarketOCRProcessor not available", "message": "OCR processor could not be loaded"}
                             
@@ -268,13 +283,12 @@ def main():
                         except Exception as e:
                             st.error(f"❌ Unexpected Error: {e}")
                     
-                    # 임시 파일 삭제
-                    try:
-                        os.unlink(temp_image_path)
-                    except:
-                        pass
                 else:
                     st.error("Image file not found.")
+            
+            # 스풀 정리
+            if upload is not None:
+                upload.close()
     
     # 하단 - 사용 방법
     st.markdown("---")
@@ -0,0 +1,146 @@
+"""
+OCR 엔진 레지스트리
+엔진별 의존 라이브러리를 선언해 두고, 실제로 그 엔진을 처음 사용할 때만 import
+(Naver만 쓰는 서버가 cv2/numpy/torch/paddle 로딩 시간을 기다리지 않도록)
+"""
+
+import importlib
+import importlib.util
+import threading
+from typing import Dict, List, Tuple
+
+
+class EngineSpec:
+    """엔진 선언 (이름, 종류, 의존 라이브러리, 설치 안내)"""
+
+    def __init__(self, name: str, kind: str, dependencies: Tuple[str, ...], install_hint: str):
+        """
+        초기화 함수
+
+        Args:
+            name: 엔진 이름 (OCR 방법)
+            kind: "remote" (원격 API, I/O 대기) 또는 "local" (로컬 모델, CPU 사용)
+            dependencies: import할 모듈 이름 ("a|b"는 둘 중 하나만 있으면 됨)
+            install_hint: 라이브러리가 없을 때 보여줄 설치 방법
+        """
+        self.name = name
+        self.kind = kind
+        self.dependencies = dependencies
+        self.install_hint = install_hint
+
+
+ENGINES = {
+    "gpt4_vision": EngineSpec("gpt4_vision", "remote", ("openai",), "pip install openai"),
+    "google_vision": EngineSpec("google_vision", "remote", ("google.cloud.vision",), "pip install google-cloud-vision"),
+    "naver_clova": EngineSpec("naver_clova", "remote", ("requests",), "pip install requests"),
+    "pp_ocrv5": EngineSpec(
+        "pp_ocrv5", "local", ("numpy", "cv2", "paddle", "paddleocr"),
+        "pip install paddleocr paddlepaddle opencv-python"
+    ),
+    "tesseract": EngineSpec(
+        "tesseract", "local", ("numpy", "cv2", "PIL", "tesserocr|pytesseract"),
+        "pip install pytesseract opencv-python pillow (또는 pip install tesserocr)"
+    ),
+}
+
+_lock = threading.Lock()
+_missing = {}
+_loaded = {}
+
+
+def get_engine(name: str) -> EngineSpec:
+    """
+    엔진 선언 조회
+
+    Raises:
+        KeyError: 등록되지 않은 엔진
+    """
+    return ENGINES[name]
+
+
+def engines_of_kind(kind: str) -> List[str]:
+    """종류별 엔진 이름 목록 (등록 순서)"""
+    return [name for name, spec in ENGINES.items() if spec.kind == kind]
+
+
+def _module_available(module_name: str) -> bool:
+    """모듈을 import하지 않고 설치 여부만 확인"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        # 상위 패키지가 없으면 find_spec이 ModuleNotFoundError를 냄 (google.cloud.vision 등)
+        return False
+
+
+def missing_dependencies(name: str) -> List[str]:
+    """
+    엔진에 필요한데 설치되지 않은 라이브러리 (import 없이 확인, 결과는 캐시)
+
+    Args:
+        name: 엔진 이름
+
+    Returns:
+        설치되지 않은 의존성 목록 (모두 있으면 빈 목록)
+    """
+    missing = _missing.get(name)
+    if missing is None:
+        missing = [
+            dependency for dependency in get_engine(name).dependencies
+            if not any(_module_available(module) for module in dependency.split("|"))
+        ]
+        _missing[name] = missing
+    return missing
+
+
+def load_engine(name: str) -> Dict:
+    """
+    엔진 의존 라이브러리 import (처음 사용할 때 한 번만)
+
+    Args:
+        name: 엔진 이름
+
+    Returns:
+        {모듈 이름: 모듈} ("a|b" 의존성은 먼저 import된 쪽)
+
+    Raises:
+        ImportError: 필요한 라이브러리가 설치되지 않은 경우 (설치 안내 포함)
+    """
+    modules = _loaded.get(name)
+    if modules is not None:
+        return modules
+
+    spec = get_engine(name)
+    with _lock:
+        modules = _loaded.get(name)
+        if modules is None:
+            modules = {}
+            for dependency in spec.dependencies:
+                error = None
+                for module_name in dependency.split("|"):
+                    try:
+                        modules[module_name] = importlib.import_module(module_name)
+                        break
+                    except ImportError as e:
+                        error = e
+                else:
+                    raise ImportError(f"{name} 엔진에 필요한 라이브러리가 없습니다 ({dependency}): {error}. 설치: {spec.install_hint}")
+            _loaded[name] = modules
+    return modules
+
+
+def engine_status() -> Dict:
+    """
+    엔진별 설치/로드 상태 (상태 확인용 - 아무것도 import하지 않음)
+
+    Returns:
+        {엔진 이름: {"kind", "available", "loaded", "missing"}}
+    """
+    return {
+        name: {
+            "kind": spec.kind,
+            "available": not missing_dependencies(name),
+            "loaded": name in _loaded,
+            "missing": missing_dependencies(name),
+        }
+        for name, spec in ENGINES.items()
+    }
@@ -0,0 +1,143 @@
+"""
+업로드 전 이미지 최적화
+원격 OCR API로 보내기 전에 크기를 줄이고 다시 압축하여 업로드 시간 단축
+"""
+
+import io
+import os
+from typing import Dict, Tuple
+
+
+# 선명도(라플라시안 분산) 기준값 - 이 값 이상이면 최고 품질로 인코딩
+SHARPNESS_REFERENCE = 300.0
+
+
+def get_upload_settings() -> Dict:
+    """
+    업로드 최적화 설정 (환경변수)
+
+    환경변수:
+        OCR_UPLOAD_MAX_DIMENSION: 긴 변 최대 픽셀 (기본 2048, 0이면 최적화 끔)
+        OCR_UPLOAD_MIN_QUALITY: 최소 JPEG 품질 (기본 75)
+        OCR_UPLOAD_MAX_QUALITY: 최대 JPEG 품질 (기본 92)
+        OCR_UPLOAD_SKIP_BYTES: 이 크기 이하이고 리사이즈가 필요 없으면 원본 그대로 전송 (기본 1.5MB)
+
+    Returns:
+        설정 딕셔너리
+    """
+    return {
+        "max_dimension": int(os.getenv("OCR_UPLOAD_MAX_DIMENSION", 2048)),
+        "min_quality": int(os.getenv("OCR_UPLOAD_MIN_QUALITY", 75)),
+        "max_quality": int(os.getenv("OCR_UPLOAD_MAX_QUALITY", 92)),
+        "skip_bytes": int(os.getenv("OCR_UPLOAD_SKIP_BYTES", 1536 * 1024)),
+    }
+
+
+def measure_sharpness(gray_array) -> float:
+    """
+    텍스트 선명도 측정 (그레이스케일 라플라시안 분산)
+
+    Args:
+        gray_array: 그레이스케일 numpy 배열
+
+    Returns:
+        선명도 점수 (클수록 경계가 뚜렷함)
+    """
+    import cv2
+
+    return float(cv2.Laplacian(gray_array, cv2.CV_64F).var())
+
+
+def choose_jpeg_quality(sharpness: float, min_quality: int, max_quality: int) -> int:
+    """
+    선명도에 따라 JPEG 품질 선택
+
+    선명한 사진일수록 작은 손글씨 숫자의 가는 획이 살아 있으므로 품질을 높여
+    블록/링잉 손상을 막고, 이미 흐린 사진은 높은 품질이 인식률에 도움이 되지 않으므로
+    낮은 품질로 용량을 줄입니다.
+
+    Args:
+        sharpness: measure_sharpness 결과
+        min_quality: 최소 품질
+        max_quality: 최대 품질
+
+    Returns:
+        JPEG 품질 (min_quality ~ max_quality)
+    """
+    ratio = min(1.0, max(0.0, sharpness / SHARPNESS_REFERENCE))
+    return int(round(min_quality + (max_quality - min_quality) * ratio))
+
+
+def prepare_for_upload(image_data: bytes, settings: Dict = None) -> Tuple[bytes, Dict]:
+    """
+    원격 API 업로드용 이미지 준비
+    EXIF 방향 적용 → 긴 변 제한 → 선명도 기반 품질로 JPEG 재압축
+
+    작은 사진은 손실 없이 원본을 그대로 돌려주고, 재압축 결과가 원본보다
+    크면 원본을 사용합니다.
+
+    Args:
+        image_data: 원본 이미지 바이트
+        settings: get_upload_settings() 형식 설정 (None이면 환경변수 사용)
+
+    Returns:
+        (업로드할 바이트, 처리 정보 딕셔너리)
+    """
+    settings = settings or get_upload_settings()
+    info = {"optimized": False, "original_bytes": len(image_data), "upload_bytes": len(image_data)}
+
+    max_dimension = settings["max_dimension"]
+    if max_dimension <= 0:
+        return image_data, info
+
+    from PIL import Image, ImageOps
+    import numpy as np
+
+    try:
+        image = Image.open(io.BytesIO(image_data))
+        orientation = image.getexif().get(0x0112, 1)  # EXIF Orientation 태그
+        width, height = image.size
+    except Exception:
+        # 판별할 수 없는 형식은 원본 그대로 전송
+        return image_data, info
+
+    needs_resize = max(width, height) > max_dimension
+    if not needs_resize and orientation == 1 and len(image_data) <= settings["skip_bytes"]:
+        return image_data, info
+
+    # EXIF 방향 적용 (회전 정보가 있는 휴대폰 사진)
+    image = ImageOps.exif_transpose(image)
+
+    if needs_resize:
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+    # 투명 배경은 흰색으로 합성 (JPEG는 알파 채널 없음)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    sharpness = measure_sharpness(np.asarray(image.convert("L")))
+    quality = choose_jpeg_quality(sharpness, settings["min_quality"], settings["max_quality"])
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    optimized = buffer.getvalue()
+
+    # 회전이 필요 없는데 재압축 결과가 더 크면 원본 사용
+    if len(optimized) >= len(image_data) and not needs_resize and orientation == 1:
+        return image_data, info
+
+    info.update({
+        "optimized": True,
+        "upload_bytes": len(optimized),
+        "original_size": [width, height],
+        "upload_size": list(image.size),
+        "jpeg_quality": quality,
+        "sharpness": round(sharpness, 1),
+        "exif_orientation": orientation,
+    })
+    return optimized, info
@@ -0,0 +1,113 @@
+"""
+로컬 OCR 모델 레지스트리
+프로세스 전체에서 PaddleOCR 모델을 한 번만 로드하여 공유
+"""
+
+import threading
+from typing import Dict, Tuple
+
+
+class _ModelEntry:
+    """로드된 모델과 추론 직렬화용 잠금"""
+
+    def __init__(self, model, info: Dict):
+        self.model = model
+        self.info = info
+        # Paddle 예측기는 스레드 안전하지 않으므로 같은 모델의 추론은 한 번에 하나씩
+        self.lock = threading.Lock()
+
+
+_paddle_models = {}
+_paddle_load_locks = {}
+_registry_lock = threading.Lock()
+_gpu_info = None
+
+
+def detect_paddle_gpu() -> Dict:
+    """
+    PaddlePaddle GPU 사용 가능 여부 확인 (프로세스당 한 번만 검사)
+
+    Returns:
+        GPU 정보 딕셔너리 (gpu_available, gpu_device, using_gpu)
+    """
+    global _gpu_info
+
+    if _gpu_info is not None:
+        return _gpu_info
+
+    import paddle
+
+    gpu_available = False
+    gpu_device = "CPU"
+    try:
+        # PaddlePaddle이 CUDA를 지원하는지 확인
+        if paddle.device.is_compiled_with_cuda():
+            # GPU가 사용 가능한지 확인
+            if paddle.device.cuda.device_count() > 0:
+                gpu_available = True
+                gpu_device = f"GPU (CUDA {paddle.device.cuda.device_count()}개)"
+                print(f"🚀 GPU 감지됨: {gpu_device}")
+            else:
+                print("⚠️ CUDA는 지원되지만 사용 가능한 GPU가 없습니다. CPU 사용.")
+        else:
+            print("ℹ️ CUDA가 지원되지 않는 빌드입니다. CPU 사용.")
+    except Exception as e:
+        print(f"⚠️ GPU 확인 중 오류: {e}. CPU 사용.")
+
+    _gpu_info = {
+        "gpu_available": gpu_available,
+        "gpu_device": gpu_device,
+        "using_gpu": gpu_available  # PaddleOCR은 자동으로 GPU 사용
+    }
+    return _gpu_info
+
+
+def get_paddle_ocr(lang: str = "korean", **config) -> Tuple[object, threading.Lock, Dict]:
+    """
+    PaddleOCR 모델 반환 (언어 + 설정별로 프로세스에서 한 번만 로드)
+
+    여러 MarketOCRProcessor 인스턴스가 같은 모델을 공유하므로
+    요청마다 모델을 다시 로드하지 않습니다.
+
+    Args:
+        lang: PaddleOCR 언어 ('korean', 'ch' 등)
+        **config: PaddleOCR 생성자 추가 인자
+
+    Returns:
+        (PaddleOCR 객체, 추론 시 잡아야 할 잠금, GPU 정보)
+    """
+    key = (lang, tuple(sorted(config.items())))
+
+    entry = _paddle_models.get(key)
+    if entry is not None:
+        return entry.model, entry.lock, entry.info
+
+    # 같은 모델을 두 스레드가 동시에 로드하지 않도록 키별 잠금
+    with _registry_lock:
+        load_lock = _paddle_load_locks.setdefault(key, threading.Lock())
+
+    with load_lock:
+        entry = _paddle_models.get(key)
+        if entry is None:
+            from paddleocr import PaddleOCR
+
+            gpu_info = detect_paddle_gpu()
+            model = PaddleOCR(lang=lang, **config)
+            entry = _ModelEntry(model, gpu_info)
+            _paddle_models[key] = entry
+            print(f"✅ PP-OCRv5 모델 로드 완료 ({lang}, {gpu_info['gpu_device']})")
+
+    return entry.model, entry.lock, entry.info
+
+
+def loaded_models() -> Dict:
+    """
+    현재 로드된 모델 목록 (상태 확인용)
+
+    Returns:
+        {"언어|설정": GPU 정보} 딕셔너리
+    """
+    return {
+        f"{lang}|{dict(config)}": entry.info
+        for (lang, config), entry in list(_paddle_models.items())
+    }
@@ -0,0 +1,138 @@
+"""
+Naver Clova OCR 다중 이미지 배치
+대기 중인 여러 이미지를 하나의 V2 요청(images[])으로 묶어 전송
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+
+def get_naver_max_images_per_request() -> int:
+    """
+    Clova V2 요청 1건에 담을 최대 이미지 수
+
+    General OCR 도메인은 현재 요청당 1장만 허용하므로 기본값은 1입니다.
+    여러 장을 받는 도메인/요금제라면 NAVER_OCR_MAX_IMAGES_PER_REQUEST로 늘리세요.
+
+    Returns:
+        최대 이미지 수 (1 이상)
+    """
+    return max(1, int(os.getenv("NAVER_OCR_MAX_IMAGES_PER_REQUEST", 1)))
+
+
+class NaverClovaBatcher:
+    """
+    Naver Clova OCR 마이크로 배처
+
+    여러 스레드가 submit()한 이미지를 모아 최대 max_batch장씩 한 요청으로 보내고,
+    응답의 images[]를 원래 호출자에게 나눠 돌려줍니다.
+    """
+
+    def __init__(
+        self,
+        processor,
+        max_batch: Optional[int] = None,
+        max_wait: float = 0.05,
+        max_in_flight: int = 4,
+    ):
+        """
+        초기화 함수
+
+        Args:
+            processor: process_with_naver_clova_batch를 가진 MarketOCRProcessor
+            max_batch: 요청당 최대 이미지 수 (None이면 환경변수 설정값)
+            max_wait: 첫 이미지가 들어온 뒤 추가 이미지를 기다리는 최대 시간 (초)
+            max_in_flight: 동시에 보낼 수 있는 배치 요청 수
+        """
+        self.processor = processor
+        self.max_batch = max_batch or get_naver_max_images_per_request()
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._sender = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="clova-batch")
+        self._collector = threading.Thread(target=self._collect_loop, name="clova-batch-collector", daemon=True)
+        self._collector.start()
+
+    def submit(self, image_data: bytes, image_path: Optional[str] = None) -> Future:
+        """
+        이미지를 배치 대기열에 추가
+
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+
+        Returns:
+            인식 결과 딕셔너리를 돌려줄 Future
+        """
+        if self._closed:
+            raise RuntimeError("배처가 이미 종료되었습니다.")
+
+        future = Future()
+        self._queue.put((image_data, image_path, future))
+        return future
+
+    def close(self):
+        """대기 중인 이미지를 모두 보낸 뒤 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._collector.join()
+        self._sender.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _collect_loop(self):
+        """대기열에서 이미지를 모아 배치 단위로 전송"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._sender.submit(self._send_batch, batch)
+
+            if stop:
+                return
+
+    def _send_batch(self, batch: List):
+        """배치 1건 전송 후 각 Future에 결과 전달"""
+        try:
+            # submit()하는 쪽(process_images → _run_method)에서 이미지마다 이미 속도 제한/월간 사용량을 차감함
+            results = self.processor.process_with_naver_clova_batch(
+                [(image_data, image_path) for image_data, image_path, _ in batch], admitted=True
+            )
+        except Exception as e:
+            # 호출자마다 결과를 고칠 수 있으므로 항목별로 별도 딕셔너리
+            results = [{
+                "error": str(e),
+                "message": "Naver Clova OCR 처리 중 오류가 발생했습니다."
+            } for _ in batch]
+
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
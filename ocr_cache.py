@@ -0,0 +1,265 @@
+"""
+OCR 결과 캐시
+이미지 바이트 해시 기반 2단계(메모리 LRU + 디스크) 결과 캐시
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class OCRResultCache:
+    """
+    콘텐츠 주소 기반 OCR 결과 캐시
+
+    - 1단계: 프로세스 메모리 LRU (TTL + 최대 항목 수)
+    - 2단계: 디스크 JSON 저장소 (TTL + 최대 용량)
+    같은 사진을 여러 번 업로드해도 엔진(유료 API)을 다시 호출하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        memory_ttl: float = 3600,
+        disk_dir: Optional[str] = ".ocr_cache",
+        disk_ttl: float = 7 * 24 * 3600,
+        disk_max_bytes: int = 200 * 1024 * 1024,
+    ):
+        """
+        초기화 함수
+
+        Args:
+            max_entries: 메모리 캐시 최대 항목 수
+            memory_ttl: 메모리 캐시 유효 시간 (초)
+            disk_dir: 디스크 캐시 폴더 (None이면 디스크 캐시 사용 안 함)
+            disk_ttl: 디스크 캐시 유효 시간 (초)
+            disk_max_bytes: 디스크 캐시 최대 용량 (바이트)
+        """
+        self.max_entries = max_entries
+        self.memory_ttl = memory_ttl
+        self.disk_dir = disk_dir
+        self.disk_ttl = disk_ttl
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory = OrderedDict()  # key -> (만료 시각, 결과)
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(image_data: bytes, method: str, engine_version: str = "") -> str:
+        """
+        캐시 키 생성 - 디코딩 전 원본 바이트 해시 + 방법 + 엔진/프롬프트 버전
+
+        Args:
+            image_data: 원본 이미지 바이트
+            method: OCR 방법
+            engine_version: 엔진/프롬프트 버전 문자열
+
+        Returns:
+            SHA-256 16진수 문자열
+        """
+        return OCRResultCache.make_key_from_digest(
+            hashlib.sha256(image_data).hexdigest(), method, engine_version
+        )
+
+    @staticmethod
+    def make_key_from_digest(image_digest: str, method: str, engine_version: str = "") -> str:
+        """
+        이미 계산된 이미지 해시로 캐시 키 생성
+
+        Args:
+            image_digest: 이미지 바이트의 SHA-256 16진수 문자열
+            method: OCR 방법
+            engine_version: 엔진/프롬프트 버전 문자열
+
+        Returns:
+            SHA-256 16진수 문자열
+        """
+        key_source = f"{image_digest}|{method}|{engine_version}"
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        캐시 조회 (메모리 → 디스크 순서)
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 결과 (없거나 만료되면 None)
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    return json.loads(result)
+                del self._memory[key]
+
+        result = self._disk_get(key, now)
+        if result is not None:
+            # 디스크에서 찾은 결과는 메모리로 승격
+            self._memory_set(key, json.dumps(result, ensure_ascii=False), now)
+        return result
+
+    def set(self, key: str, result: Dict):
+        """
+        캐시 저장 (메모리 + 디스크)
+
+        Args:
+            key: 캐시 키
+            result: OCR 결과 딕셔너리
+        """
+        now = time.time()
+        serialized = json.dumps(result, ensure_ascii=False)
+        self._memory_set(key, serialized, now)
+        self._disk_set(key, serialized)
+
+    def clear(self):
+        """메모리 및 디스크 캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+
+        if not self.disk_dir:
+            return
+        with self._disk_lock:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".json"):
+                    try:
+                        os.unlink(os.path.join(self.disk_dir, name))
+                    except OSError:
+                        pass
+
+    def _memory_set(self, key: str, serialized: str, now: float):
+        """메모리 LRU에 저장하고 초과분 제거"""
+        with self._lock:
+            self._memory[key] = (now + self.memory_ttl, serialized)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        """디스크 캐시 파일 경로"""
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_get(self, key: str, now: float) -> Optional[Dict]:
+        """디스크 캐시 조회 (mtime 기준 TTL 확인)"""
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            mtime = os.path.getmtime(path)
+            if now - mtime > self.disk_ttl:
+                os.unlink(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            # 접근 시각 갱신 (디스크 LRU 정리에 사용)
+            os.utime(path, None)
+            return result
+        except (OSError, ValueError):
+            return None
+
+    def _disk_set(self, key: str, serialized: str):
+        """디스크 캐시 저장 (임시 파일 → rename으로 원자적 교체)"""
+        if not self.disk_dir:
+            return
+
+        path = self._disk_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(serialized)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return
+
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """디스크 캐시 정리 - 만료 항목 삭제 후 용량 초과 시 오래된 순으로 삭제"""
+        with self._disk_lock:
+            now = time.time()
+            entries = []
+            total_size = 0
+
+            for name in os.listdir(self.disk_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.disk_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.disk_ttl:
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+            if total_size <= self.disk_max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total_size <= self.disk_max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total_size -= size
+                except OSError:
+                    pass
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[OCRResultCache]:
+    """
+    프로세스 공용 캐시 반환 (환경변수로 설정)
+
+    환경변수:
+        OCR_CACHE_ENABLED: "true"이면 캐시 사용 (기본 false - 결과가 디스크에 남으므로 명시적으로 켤 때만)
+        OCR_CACHE_MAX_ENTRIES: 메모리 캐시 항목 수 (기본 256)
+        OCR_CACHE_TTL: 메모리 캐시 유효 시간 초 (기본 3600)
+        OCR_CACHE_DIR: 디스크 캐시 폴더 (기본 .ocr_cache, 빈 값이면 디스크 캐시 끔)
+        OCR_CACHE_DISK_TTL: 디스크 캐시 유효 시간 초 (기본 7일)
+        OCR_CACHE_DISK_MAX_MB: 디스크 캐시 최대 용량 MB (기본 200)
+
+    Returns:
+        OCRResultCache 또는 None (비활성화 시)
+    """
+    global _default_cache
+
+    if os.getenv("OCR_CACHE_ENABLED", "False").lower() != "true":
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = OCRResultCache(
+                max_entries=int(os.getenv("OCR_CACHE_MAX_ENTRIES", 256)),
+                memory_ttl=float(os.getenv("OCR_CACHE_TTL", 3600)),
+                disk_dir=os.getenv("OCR_CACHE_DIR", ".ocr_cache") or None,
+                disk_ttl=float(os.getenv("OCR_CACHE_DISK_TTL", 7 * 24 * 3600)),
+                disk_max_bytes=int(float(os.getenv("OCR_CACHE_DISK_MAX_MB", 200)) * 1024 * 1024),
+            )
+        return _default_cache
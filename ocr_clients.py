@@ -0,0 +1,295 @@
+"""
+OCR API 클라이언트 공용 풀
+프로세스 전체에서 재사용하는 HTTP 세션/클라이언트 관리
+"""
+
+import os
+import threading
+from typing import Optional
+
+
+# Naver Clova OCR 공용 세션 (keep-alive 연결 재사용)
+_naver_session = None
+_naver_session_lock = threading.Lock()
+
+
+def get_naver_session():
+    """
+    Naver Clova OCR용 공용 requests 세션 반환 (처음 호출 시 생성)
+
+    연결 풀을 공유하므로 요청마다 TCP+TLS 핸드셰이크를 다시 하지 않습니다.
+    urllib3 연결 풀은 스레드 안전하므로 Flask 워커 스레드끼리 공유해도 됩니다.
+
+    환경변수:
+        NAVER_OCR_POOL_SIZE: 호스트당 최대 유지 연결 수 (기본 10)
+        NAVER_OCR_POOL_BLOCK: "true"이면 풀이 가득 찼을 때 새 연결 대신 대기 (기본 false)
+
+    Returns:
+        requests.Session
+    """
+    global _naver_session
+
+    if _naver_session is not None:
+        return _naver_session
+
+    with _naver_session_lock:
+        if _naver_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            pool_size = int(os.getenv("NAVER_OCR_POOL_SIZE", 10))
+            pool_block = os.getenv("NAVER_OCR_POOL_BLOCK", "False").lower() == "true"
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,  # Clova 엔드포인트 호스트는 하나
+                pool_maxsize=pool_size,
+                pool_block=pool_block,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Connection": "keep-alive"})
+            _naver_session = session
+
+    return _naver_session
+
+
+def preconnect_naver(url: Optional[str] = None, timeout: float = 5) -> bool:
+    """
+    Naver Clova OCR 엔드포인트에 미리 연결 (서버 시작 시 호출)
+
+    가벼운 HEAD 요청으로 TLS 연결을 열어 풀에 넣어 두므로
+    첫 OCR 요청이 핸드셰이크 비용을 부담하지 않습니다.
+    응답 상태 코드(403/405 등)는 상관없이 연결만 확보합니다.
+
+    Args:
+        url: Clova API URL (None이면 NAVER_OCR_API_URL 사용)
+        timeout: 연결/응답 타임아웃 (초)
+
+    Returns:
+        연결 성공 여부
+    """
+    url = url or os.getenv("NAVER_OCR_API_URL")
+    if not url:
+        return False
+
+    try:
+        response = get_naver_session().head(url, timeout=timeout)
+        response.close()
+        return True
+    except Exception as e:
+        print(f"⚠️ Naver Clova OCR 사전 연결 실패: {e}")
+        return False
+
+
+def close_naver_session():
+    """공용 세션 종료 (테스트 또는 종료 시 사용)"""
+    global _naver_session
+
+    with _naver_session_lock:
+        if _naver_session is not None:
+            _naver_session.close()
+            _naver_session = None
+
+
+# OpenAI 클라이언트 레지스트리 (API 키별 1개, 스레드 안전)
+_openai_clients = {}
+_openai_clients_lock = threading.Lock()
+
+
+def _openai_client_options() -> dict:
+    """
+    OpenAI 클라이언트 공통 옵션 (환경변수로 설정)
+
+    환경변수:
+        OPENAI_TIMEOUT: 전체 요청 타임아웃 초 (기본 60)
+        OPENAI_CONNECT_TIMEOUT: 연결 타임아웃 초 (기본 10)
+        OPENAI_MAX_CONNECTIONS: 최대 동시 연결 수 (기본 20)
+        OPENAI_MAX_KEEPALIVE: 유지할 keep-alive 연결 수 (기본 10)
+        OPENAI_MAX_RETRIES: SDK 자동 재시도 횟수 (기본 2)
+    """
+    import httpx
+
+    return {
+        "timeout": httpx.Timeout(
+            float(os.getenv("OPENAI_TIMEOUT", 60)),
+            connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT", 10)),
+        ),
+        "limits": httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", 20)),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", 10)),
+        ),
+        "max_retries": int(os.getenv("OPENAI_MAX_RETRIES", 2)),
+    }
+
+
+def get_openai_client(api_key: Optional[str] = None):
+    """
+    공용 OpenAI 클라이언트 반환 (API 키별로 한 번만 생성)
+
+    OpenAI 클라이언트는 스레드 안전하므로 모든 GPT 경로가 같은 인스턴스와
+    연결 풀을 공유합니다. 요청마다 클라이언트를 새로 만들지 않습니다.
+
+    Args:
+        api_key: OpenAI API 키 (None이면 OPENAI_API_KEY 사용)
+
+    Returns:
+        openai.OpenAI
+
+    Raises:
+        ValueError: API 키가 없는 경우
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+
+    client = _openai_clients.get(api_key)
+    if client is not None:
+        return client
+
+    with _openai_clients_lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+
+            options = _openai_client_options()
+            client = OpenAI(
+                api_key=api_key,
+                timeout=options["timeout"],
+                max_retries=options["max_retries"],
+                http_client=httpx.Client(limits=options["limits"], timeout=options["timeout"]),
+            )
+            _openai_clients[api_key] = client
+
+    return client
+
+
+def close_openai_clients():
+    """등록된 OpenAI 클라이언트 모두 종료"""
+    with _openai_clients_lock:
+        for client in _openai_clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _openai_clients.clear()
+
+
+# Google Cloud Vision 공용 클라이언트 (gRPC 채널 재사용)
+_google_vision_client = None
+_google_vision_lock = threading.Lock()
+
+
+def get_google_vision_client():
+    """
+    공용 Google Vision ImageAnnotatorClient 반환 (처음 호출 시 생성)
+
+    Returns:
+        google.cloud.vision.ImageAnnotatorClient
+    """
+    global _google_vision_client
+
+    if _google_vision_client is not None:
+        return _google_vision_client
+
+    with _google_vision_lock:
+        if _google_vision_client is None:
+            from google.cloud import vision
+            _google_vision_client = vision.ImageAnnotatorClient()
+
+    return _google_vision_client
+
+
+# 비동기 클라이언트 (이벤트 루프별 1개 - 다른 루프의 연결을 재사용하면 안 됨)
+_async_clients = {}
+_async_clients_lock = threading.Lock()
+
+
+def _get_loop_client(name: str, factory):
+    """
+    현재 이벤트 루프에 묶인 비동기 클라이언트 반환 (없으면 factory로 생성)
+
+    Args:
+        name: 클라이언트 구분 키
+        factory: 클라이언트 생성 함수
+
+    Returns:
+        비동기 클라이언트
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    key = (name, id(loop))
+
+    with _async_clients_lock:
+        entry = _async_clients.get(key)
+        # 같은 id의 다른(종료된) 루프에서 만든 클라이언트는 다시 만든다
+        if entry is None or entry[0] is not loop:
+            for stale_key in [k for k, v in _async_clients.items() if v[0].is_closed()]:
+                del _async_clients[stale_key]
+            entry = (loop, factory())
+            _async_clients[key] = entry
+        return entry[1]
+
+
+def get_async_openai_client(api_key: Optional[str] = None):
+    """
+    현재 이벤트 루프용 공용 AsyncOpenAI 클라이언트 반환
+
+    Args:
+        api_key: OpenAI API 키 (None이면 OPENAI_API_KEY 사용)
+
+    Returns:
+        openai.AsyncOpenAI
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+
+    def factory():
+        import httpx
+        from openai import AsyncOpenAI
+
+        options = _openai_client_options()
+        return AsyncOpenAI(
+            api_key=api_key,
+            timeout=options["timeout"],
+            max_retries=options["max_retries"],
+            http_client=httpx.AsyncClient(limits=options["limits"], timeout=options["timeout"]),
+        )
+
+    return _get_loop_client(f"openai:{api_key}", factory)
+
+
+def get_naver_async_client():
+    """
+    현재 이벤트 루프용 Naver Clova OCR 공용 httpx.AsyncClient 반환
+
+    Returns:
+        httpx.AsyncClient (keep-alive 연결 풀 공유)
+    """
+    def factory():
+        import httpx
+
+        pool_size = int(os.getenv("NAVER_OCR_POOL_SIZE", 10))
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(30, connect=10),
+        )
+
+    return _get_loop_client("naver", factory)
+
+
+def get_google_vision_async_client():
+    """
+    현재 이벤트 루프용 Google Vision ImageAnnotatorAsyncClient 반환
+
+    Returns:
+        google.cloud.vision.ImageAnnotatorAsyncClient
+    """
+    def factory():
+        from google.cloud import vision
+        return vision.ImageAnnotatorAsyncClient()
+
+    return _get_loop_client("google_vision", factory)
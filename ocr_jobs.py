@@ -0,0 +1,521 @@
+"""
+비동기 OCR 작업 큐
+요청은 작업 ID를 바로 돌려받고, 백그라운드 워커가 SQLite 큐에서 꺼내 처리
+"""
+
+import os
+import json
+import shutil
+import socket
+import time
+import uuid
+import sqlite3
+import ipaddress
+import threading
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional, Union
+
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+def get_max_job_attempts() -> int:
+    """작업 최대 시도 횟수 (환경변수 OCR_JOB_MAX_ATTEMPTS, 기본 3 - 처리 중 워커가 계속 죽는 작업은 실패 처리)"""
+    return max(1, int(os.getenv("OCR_JOB_MAX_ATTEMPTS", 3)))
+
+
+def get_callback_allowed_hosts() -> List[str]:
+    """콜백을 허용할 호스트 (환경변수 OCR_CALLBACK_ALLOWED_HOSTS, 쉼표 구분 - 비어 있으면 공인 주소만 허용)"""
+    value = os.getenv("OCR_CALLBACK_ALLOWED_HOSTS", "")
+    return [host.strip().lower() for host in value.split(",") if host.strip()]
+
+
+def validate_callback_url(url: str) -> Optional[List[str]]:
+    """
+    콜백 URL 확인 (서버가 내부망 주소로 요청을 보내지 않도록)
+
+    http/https만 허용하고, OCR_CALLBACK_ALLOWED_HOSTS가 있으면 그 호스트만,
+    없으면 사설/루프백/링크 로컬 등 공인 주소가 아닌 곳으로 해석되는 호스트를 거절합니다.
+
+    Args:
+        url: 콜백 URL
+
+    Returns:
+        확인한 IP 주소 목록 (전송 시 이 주소로만 연결 - 다시 조회하면 DNS 리바인딩으로 내부 주소가 나올 수 있음),
+        허용 호스트 목록으로 허용한 경우 None
+
+    Raises:
+        ValueError: 허용되지 않는 URL
+    """
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("callback_url은 http 또는 https 주소여야 합니다.")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+
+    allowed_hosts = get_callback_allowed_hosts()
+    if allowed_hosts:
+        if parts.hostname.lower() not in allowed_hosts:
+            raise ValueError(f"허용되지 않은 callback_url 호스트입니다: {parts.hostname}")
+        return None
+
+    try:
+        infos = socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)
+    except socket.gaierror:
+        raise ValueError(f"callback_url 호스트를 찾을 수 없습니다: {parts.hostname}")
+
+    addresses = []
+    for info in infos:
+        address = info[4][0]
+        if not ipaddress.ip_address(address.split("%")[0]).is_global:
+            raise ValueError("내부/사설 주소로는 콜백을 보낼 수 없습니다.")
+        if address not in addresses:
+            addresses.append(address)
+    return addresses
+
+
+def _pinned_request(url: str, address: str):
+    """
+    확인한 IP로 직접 연결하는 요청 준비 (호스트 이름은 Host 헤더와 TLS SNI/인증서 확인에만 사용)
+
+    Args:
+        url: 원래 콜백 URL
+        address: validate_callback_url이 확인한 IP 주소
+
+    Returns:
+        (IP로 바꾼 URL, Host 헤더, https면 호스트 이름으로 인증서를 확인하는 requests 세션 아니면 None)
+    """
+    from urllib.parse import urlsplit, urlunsplit
+
+    parts = urlsplit(url)
+    netloc = f"[{address}]" if ":" in address else address
+    if parts.port:
+        netloc = f"{netloc}:{parts.port}"
+    pinned_url = urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment))
+    host_header = parts.netloc.rsplit("@", 1)[-1]
+
+    if parts.scheme != "https":
+        return pinned_url, host_header, None
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    hostname = parts.hostname
+
+    class _PinnedHostAdapter(HTTPAdapter):
+        """IP로 연결하되 SNI와 인증서 확인은 원래 호스트 이름으로"""
+
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs["server_hostname"] = hostname
+            kwargs["assert_hostname"] = hostname
+            super().init_poolmanager(*args, **kwargs)
+
+    session = requests.Session()
+    session.mount("https://", _PinnedHostAdapter())
+    return pinned_url, host_header, session
+
+
+class OCRJobQueue:
+    """
+    SQLite 기반 영속 작업 큐
+
+    - 작업 메타데이터/결과: SQLite (여러 프로세스가 같은 파일을 공유해도 안전)
+    - 이미지 원본: 파일 시스템 (처리가 끝나면 삭제)
+    서버가 재시작되어도 대기/처리 중이던 작업은 다시 처리됩니다.
+    """
+
+    def __init__(self, base_dir: str = ".ocr_jobs"):
+        """
+        초기화 함수
+
+        Args:
+            base_dir: 큐 DB와 이미지 보관 폴더
+        """
+        self.base_dir = base_dir
+        self.db_path = os.path.join(base_dir, "jobs.db")
+        self.image_dir = os.path.join(base_dir, "images")
+        os.makedirs(self.image_dir, exist_ok=True)
+
+        self._local = threading.local()
+        self._new_job = threading.Event()
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    method TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    image_name TEXT,
+                    callback_url TEXT,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """스레드별 SQLite 연결 (연결은 스레드 간 공유하지 않음)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _image_path(self, job_id: str) -> str:
+        """작업 이미지 보관 경로"""
+        return os.path.join(self.image_dir, f"{job_id}.bin")
+
+    def submit(
+        self,
+        image_data: Union[bytes, BinaryIO],
+        method: str,
+        image_name: Optional[str] = None,
+        callback_url: Optional[str] = None
+    ) -> str:
+        """
+        작업 등록 (즉시 반환)
+
+        Args:
+            image_data: 이미지 바이트 데이터 또는 읽을 수 있는 파일 객체 (업로드 스풀 등)
+            method: OCR 방법
+            image_name: 원본 파일명 (결과 메타데이터용)
+            callback_url: 완료 시 결과를 POST할 URL (선택, validate_callback_url로 확인)
+
+        Returns:
+            작업 ID
+
+        Raises:
+            ValueError: 허용되지 않는 callback_url
+        """
+        if callback_url is not None:
+            validate_callback_url(callback_url)
+
+        job_id = uuid.uuid4().hex
+
+        # 이미지를 먼저 저장한 뒤 큐에 등록 (워커가 빈 파일을 읽지 않도록)
+        temp_path = self._image_path(job_id) + ".tmp"
+        with open(temp_path, "wb") as f:
+            if isinstance(image_data, (bytes, bytearray)):
+                f.write(image_data)
+            else:
+                shutil.copyfileobj(image_data, f)
+        os.replace(temp_path, self._image_path(job_id))
+
+        self._connect().execute(
+            "INSERT INTO jobs (id, method, status, image_name, callback_url, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, method, JOB_QUEUED, image_name, callback_url, time.time())
+        )
+        self._new_job.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        작업 상태 조회
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            작업 정보 딕셔너리 (없으면 None)
+        """
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def claim_next(self) -> Optional[Dict]:
+        """
+        가장 오래된 대기 작업을 원자적으로 가져와 running으로 변경
+
+        Returns:
+            작업 정보 (대기 작업이 없으면 None)
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (JOB_QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (JOB_RUNNING, time.time(), row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        job = self._row_to_dict(row)
+        job["status"] = JOB_RUNNING
+        return job
+
+    def load_image(self, job_id: str) -> bytes:
+        """작업 이미지 읽기"""
+        with open(self._image_path(job_id), "rb") as f:
+            return f.read()
+
+    def finish(self, job_id: str, result: Dict):
+        """
+        작업 완료 기록 (결과에 error가 있으면 failed)
+
+        Args:
+            job_id: 작업 ID
+            result: OCR 결과 딕셔너리
+        """
+        status = JOB_FAILED if "error" in result else JOB_DONE
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+            (status, json.dumps(result, ensure_ascii=False), result.get("error"), time.time(), job_id)
+        )
+        try:
+            os.unlink(self._image_path(job_id))
+        except OSError:
+            pass
+
+    def requeue_stale(self, older_than: float = 600, max_attempts: Optional[int] = None) -> int:
+        """
+        처리 중에 워커가 죽은 작업을 다시 대기 상태로 변경
+        (시도 횟수를 다 쓴 작업은 실패 처리 - 워커를 죽이는 이미지가 끝없이 다시 처리되지 않도록)
+
+        Args:
+            older_than: running 상태로 이 시간(초) 이상 지난 작업만 대상
+            max_attempts: 최대 시도 횟수 (None이면 get_max_job_attempts())
+
+        Returns:
+            다시 대기시킨 작업 수
+        """
+        max_attempts = get_max_job_attempts() if max_attempts is None else max_attempts
+        cutoff = time.time() - older_than
+        conn = self._connect()
+
+        exhausted = conn.execute(
+            "SELECT id FROM jobs WHERE status = ? AND started_at < ? AND attempts >= ?",
+            (JOB_RUNNING, cutoff, max_attempts)
+        ).fetchall()
+        for row in exhausted:
+            self.finish(row["id"], {
+                "error": f"처리 중 워커가 {max_attempts}번 중단되어 더 이상 재시도하지 않습니다.",
+                "message": "작업 처리 중 오류가 발생했습니다."
+            })
+
+        cursor = conn.execute(
+            "UPDATE jobs SET status = ? WHERE status = ? AND started_at < ? AND attempts < ?",
+            (JOB_QUEUED, JOB_RUNNING, cutoff, max_attempts)
+        )
+        if cursor.rowcount:
+            self._new_job.set()
+        return cursor.rowcount
+
+    def purge_finished(self, older_than: float) -> int:
+        """
+        오래된 완료/실패 작업 삭제
+
+        Args:
+            older_than: 완료 후 이 시간(초)이 지난 작업 삭제
+
+        Returns:
+            삭제한 작업 수
+        """
+        cursor = self._connect().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (JOB_DONE, JOB_FAILED, time.time() - older_than)
+        )
+        return cursor.rowcount
+
+    def wait_for_job(self, timeout: float):
+        """새 작업 등록 신호 대기 (다른 프로세스의 등록은 timeout 후 폴링으로 확인)"""
+        self._new_job.wait(timeout)
+        self._new_job.clear()
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        """DB 행을 응답용 딕셔너리로 변환"""
+        def iso(timestamp):
+            return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+        return {
+            "job_id": row["id"],
+            "method": row["method"],
+            "status": row["status"],
+            "image_name": row["image_name"],
+            "callback_url": row["callback_url"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "attempts": row["attempts"],
+            "created_at": iso(row["created_at"]),
+            "started_at": iso(row["started_at"]),
+            "finished_at": iso(row["finished_at"]),
+        }
+
+
+class OCRJobWorkers:
+    """
+    백그라운드 OCR 워커 스레드 묶음
+
+    큐에서 작업을 꺼내 MarketOCRProcessor로 처리하고, callback_url이 있으면 결과를 POST합니다.
+    """
+
+    def __init__(self, job_queue: OCRJobQueue, num_workers: int = 2, poll_interval: float = 1.0):
+        """
+        초기화 함수
+
+        Args:
+            job_queue: 작업 큐
+            num_workers: 워커 스레드 수
+            poll_interval: 새 작업 확인 주기 (초)
+        """
+        self.job_queue = job_queue
+        self.num_workers = max(1, num_workers)
+        self.poll_interval = poll_interval
+        self.retention = float(os.getenv("OCR_JOB_RETENTION_HOURS", 24)) * 3600
+
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._processors = {}
+        self._processors_lock = threading.Lock()
+
+    def start(self):
+        """워커 시작 (이전 실행에서 남은 작업 복구 포함)"""
+        if self._threads:
+            return
+        self.job_queue.requeue_stale()
+        for index in range(self.num_workers):
+            thread = threading.Thread(target=self._run, name=f"ocr-job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5):
+        """워커 종료 요청"""
+        self._stop.set()
+        self.job_queue._new_job.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _get_processor(self, method: str):
+        """방법별 공용 프로세서"""
+        from ocr_processor import MarketOCRProcessor
+
+        with self._processors_lock:
+            processor = self._processors.get(method)
+            if processor is None:
+                processor = MarketOCRProcessor(method=method)
+                self._processors[method] = processor
+            return processor
+
+    def _run(self):
+        """워커 루프"""
+        last_maintenance = 0.0
+        while not self._stop.is_set():
+            # 주기적 정리: 죽은 워커의 작업 복구, 오래된 작업 삭제
+            if time.time() - last_maintenance > 300:
+                last_maintenance = time.time()
+                try:
+                    self.job_queue.requeue_stale()
+                    self.job_queue.purge_finished(self.retention)
+                except Exception as e:
+                    print(f"⚠️ 작업 큐 정리 실패: {e}")
+
+            job = self.job_queue.claim_next()
+            if job is None:
+                self.job_queue.wait_for_job(self.poll_interval)
+                continue
+
+            self._process(job)
+
+    def _process(self, job: Dict):
+        """작업 1건 처리"""
+        job_id = job["job_id"]
+        try:
+            image_data = self.job_queue.load_image(job_id)
+            processor = self._get_processor(job["method"])
+            result = processor.process_image_bytes(image_data, method=job["method"], image_path=job["image_name"])
+        except Exception as e:
+            result = {
+                "error": str(e),
+                "message": "작업 처리 중 오류가 발생했습니다."
+            }
+
+        self.job_queue.finish(job_id, result)
+
+        if job.get("callback_url"):
+            self._send_callback(job["callback_url"], self.job_queue.get(job_id))
+
+    def _send_callback(self, url: str, job: Dict, attempts: int = 3):
+        """
+        완료 콜백 전송 (실패 시 짧게 재시도, 리다이렉트는 따라가지 않음)
+        보내기 직전에 주소를 다시 확인하고 확인한 IP로만 연결 (확인과 전송 사이 DNS 리바인딩 방지)
+        """
+        import requests
+
+        try:
+            addresses = validate_callback_url(url)
+        except ValueError as e:
+            print(f"⚠️ 콜백 전송 안 함: {e}")
+            return
+
+        for attempt in range(attempts):
+            session = None
+            try:
+                if addresses:
+                    # 주소가 여러 개면 재시도마다 다음 주소로
+                    pinned_url, host_header, session = _pinned_request(url, addresses[attempt % len(addresses)])
+                    response = (session or requests).post(
+                        pinned_url, json=job, headers={"Host": host_header},
+                        timeout=(5, 10), allow_redirects=False
+                    )
+                else:
+                    response = requests.post(url, json=job, timeout=(5, 10), allow_redirects=False)
+                if response.status_code < 500:
+                    return
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ 콜백 전송 실패 ({attempt + 1}/{attempts}): {e}")
+            finally:
+                if session is not None:
+                    session.close()
+            if attempt + 1 < attempts:
+                time.sleep(2 ** attempt)
+
+
+_default_queue = None
+_default_workers = None
+_default_lock = threading.Lock()
+
+
+def get_job_queue() -> OCRJobQueue:
+    """프로세스 공용 작업 큐 (OCR_JOB_DIR 환경변수, 기본 .ocr_jobs)"""
+    global _default_queue
+
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = OCRJobQueue(os.getenv("OCR_JOB_DIR", ".ocr_jobs"))
+        return _default_queue
+
+
+def start_job_workers() -> OCRJobWorkers:
+    """
+    공용 작업 큐의 워커 시작 (여러 번 호출해도 한 번만 시작)
+
+    환경변수:
+        OCR_JOB_WORKERS: 워커 스레드 수 (기본 2)
+    """
+    global _default_workers
+
+    job_queue = get_job_queue()
+    with _default_lock:
+        if _default_workers is None:
+            _default_workers = OCRJobWorkers(job_queue, num_workers=int(os.getenv("OCR_JOB_WORKERS", 2)))
+            _default_workers.start()
+        return _default_workers
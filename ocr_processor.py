@@ -5,19 +5,287 @@
 
 import os
 import json
+import asyncio
 import base64
-from typing import Dict, List, Optional, Union
+import hashlib
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
-# 환경 변수 로드
-from dotenv import load_dotenv
-load_dotenv("sibangaiocr.env")  # sibangaiocr.env 파일에서 환경변수 로드
+# 이미지 처리 라이브러리(cv2/numpy/PIL)와 엔진별 SDK는 해당 엔진을 처음 쓸 때 import
+# (engine_registry 참고 - Naver만 쓰는 서버는 로딩하지 않음)
 
-# 이미지 처리 라이브러리
-from PIL import Image
-import cv2
-import numpy as np
+from settings import Settings, get_settings
+from engine_registry import engines_of_kind, get_engine, load_engine, missing_dependencies
+from rate_limit import RateLimitExceeded, admit, admit_async, get_max_wait
+from resilience import (
+    Deadline, DeadlineExceeded, RetryPolicy, call_with_retries, call_with_retries_async,
+    circuit_breaker_enabled, get_circuit_breaker, get_fallback_chain,
+    get_latency_tracker, is_engine_failure, is_transient_httpx_error, is_transient_requests_error,
+)
+from ocr_cache import OCRResultCache, get_default_cache
+from singleflight import inflight, singleflight_enabled
+from image_prep import prepare_for_upload
+from model_registry import get_paddle_ocr
+from naver_batch import NaverClovaBatcher, get_naver_max_images_per_request
+from ocr_clients import (
+    get_async_openai_client,
+    get_google_vision_async_client,
+    get_google_vision_client,
+    get_naver_async_client,
+    get_naver_session,
+    get_openai_client,
+)
+
+
+# GPT-4 Vision 프롬프트 (ASCII 전용)
+GPT4_VISION_PROMPT = """
+This image shows products and price tags from a market stall.
+Please identify all product names and prices from the image and organize them in JSON format.
+
+Output format:
+{
+  "products": [
+    {
+      "product_name": "Product name in Korean",
+      "price": "Price with won currency",
+      "unit": "Unit (e.g., 1 piece, 1 basket, 1kg, etc.)",
+      "additional_info": "Additional information if available"
+    }
+  ]
+}
+
+- Recognize Korean handwriting as accurately as possible
+- Include won currency unit in the price
+- Extract unit information if available
+- Recognize all price tags without missing any
+"""
+
+# PP-OCRv5 공통 설정 (모델 레지스트리 키에 포함)
+PP_OCRV5_CONFIG = {
+    "use_doc_orientation_classify": True,  # 문서 방향 분류 활성화 (성능 향상)
+    "use_textline_orientation": True,  # 텍스트 라인 방향 감지 활성화 (성능 향상)
+    "text_rec_score_thresh": 0.5,  # 텍스트 인식 신뢰도 임계값 (0.5 = 50% 이상)
+    "ocr_version": "PP-OCRv5",  # PP-OCRv5 버전 명시
+}
+
+# 지원하는 OCR 방법
+SUPPORTED_METHODS = ["gpt4_vision", "google_vision", "naver_clova", "pp_ocrv5"]
+
+# 여러 엔진을 조합하는 방법
+# - "race": OCR_RACE_ENGINES를 동시에 실행해 품질 기준을 먼저 통과한 결과 사용
+# - "cascade": OCR_CASCADE_ENGINES를 차례로 실행 (로컬 결과의 신뢰도/파싱 완성도가 충분하면 유료 엔진 생략)
+COMPOSITE_METHODS = ["race", "cascade"]
+
+# 가격 패턴 (예: 800원, 5000원, 10,000원, 1만원)
+PRICE_PATTERN = r'(\d[\d,]*)\s*원|(\d+)\s*만\s*원'
+
+# 텍스트 → 상품 파싱(_parse_text_to_products) 버전 - 파싱 결과(필드, 신뢰도 등)가 바뀌면 올림
+PRODUCT_PARSER_VERSION = "parser2"
+
+# 엔진/프롬프트 버전 (캐시 키에 포함 - 모델이나 프롬프트, 파서가 바뀌면 캐시 자동 무효화)
+ENGINE_VERSIONS = {
+    "gpt4_vision": "gpt-4o:" + hashlib.sha256(GPT4_VISION_PROMPT.encode("utf-8")).hexdigest()[:12],
+    "google_vision": "text_detection:v1:" + PRODUCT_PARSER_VERSION,
+    "naver_clova": "clova-general:V2:" + PRODUCT_PARSER_VERSION,
+    "pp_ocrv5": "PP-OCRv5:" + PRODUCT_PARSER_VERSION,
+}
+
+# 원격 API 엔진 (I/O 대기 - 스레드 풀) / 로컬 모델 엔진 (CPU 사용 - 프로세스 풀)
+REMOTE_METHODS = [method for method in engines_of_kind("remote") if method in SUPPORTED_METHODS]
+LOCAL_METHODS = [method for method in engines_of_kind("local") if method in SUPPORTED_METHODS]
+
+# 엔진별 기본 동시 실행 수 (환경변수 OCR_MAX_CONCURRENCY_<METHOD>로 변경 가능)
+DEFAULT_ENGINE_CONCURRENCY = {
+    "gpt4_vision": 8,
+    "google_vision": 8,
+    "naver_clova": 4,
+    "pp_ocrv5": max(1, (os.cpu_count() or 2) // 2),
+}
+
+_engine_semaphores = {}
+_engine_semaphores_lock = threading.Lock()
+_race_executor = None
+
+
+def get_engine_concurrency(method: str) -> int:
+    """
+    엔진별 최대 동시 실행 수
+    
+    Args:
+        method: OCR 방법
+        
+    Returns:
+        최대 동시 실행 수 (OCR_MAX_CONCURRENCY_<METHOD> 환경변수 우선)
+    """
+    env_value = os.getenv(f"OCR_MAX_CONCURRENCY_{method.upper()}")
+    if env_value:
+        return max(1, int(env_value))
+    return DEFAULT_ENGINE_CONCURRENCY.get(method, 4)
+
+
+def _get_engine_semaphore(method: str) -> threading.BoundedSemaphore:
+    """엔진별 프로세스 공용 세마포어 (모든 프로세서 인스턴스가 공유)"""
+    with _engine_semaphores_lock:
+        semaphore = _engine_semaphores.get(method)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(get_engine_concurrency(method))
+            _engine_semaphores[method] = semaphore
+        return semaphore
+
+
+# 비동기 엔진 세마포어 (이벤트 루프별) / 로컬 엔진 실행용 스레드 풀
+_async_engine_semaphores = {}
+_local_engine_executors = {}
+_local_engine_executors_lock = threading.Lock()
+
+
+def _get_async_engine_semaphore(method: str) -> asyncio.Semaphore:
+    """현재 이벤트 루프에서 사용할 엔진별 asyncio 세마포어"""
+    loop = asyncio.get_running_loop()
+    key = (method, id(loop))
+    
+    with _engine_semaphores_lock:
+        entry = _async_engine_semaphores.get(key)
+        # 같은 id의 다른(종료된) 루프에서 만든 세마포어는 다시 만들고, 종료된 루프의 항목은 정리
+        if entry is None or entry[0] is not loop:
+            for stale_key in [k for k, v in _async_engine_semaphores.items() if v[0].is_closed()]:
+                del _async_engine_semaphores[stale_key]
+            entry = (loop, asyncio.Semaphore(get_engine_concurrency(method)))
+            _async_engine_semaphores[key] = entry
+        return entry[1]
+
+
+def _get_engine_list(env_name: str, default: str) -> List[str]:
+    """
+    쉼표로 구분한 엔진 목록 환경변수 읽기
+    
+    Args:
+        env_name: 환경변수 이름
+        default: 환경변수가 없을 때 사용할 목록
+        
+    Returns:
+        지원하는 엔진 이름 목록 (중복 제외, 적힌 순서 유지)
+    """
+    engines = []
+    for name in os.getenv(env_name, default).split(","):
+        name = name.strip()
+        if name in SUPPORTED_METHODS and name not in engines:
+            engines.append(name)
+    return engines
+
+
+def get_race_engines() -> List[str]:
+    """race 모드에서 동시에 실행할 엔진 (환경변수 OCR_RACE_ENGINES, 기본 pp_ocrv5,naver_clova)"""
+    return _get_engine_list("OCR_RACE_ENGINES", "pp_ocrv5,naver_clova")
+
+
+def get_cascade_engines() -> List[str]:
+    """cascade 모드에서 차례로 실행할 엔진 - 싼 엔진부터 (환경변수 OCR_CASCADE_ENGINES, 기본 pp_ocrv5,naver_clova,gpt4_vision)"""
+    return _get_engine_list("OCR_CASCADE_ENGINES", "pp_ocrv5,naver_clova,gpt4_vision")
+
+
+def get_cascade_thresholds() -> Tuple[float, float]:
+    """
+    cascade 모드에서 다음 엔진으로 넘어가지 않을 기준
+    
+    환경변수:
+        OCR_CASCADE_MIN_CONFIDENCE: 상품(가격 줄)별 인식 신뢰도 최솟값 (0~1, 기본 0.85)
+        OCR_CASCADE_MIN_COMPLETENESS: 가격이 있는 줄 중 상품으로 파싱된 비율 (0~1, 기본 0.8)
+    
+    Returns:
+        (최소 신뢰도, 최소 파싱 완성도)
+    """
+    return (
+        float(os.getenv("OCR_CASCADE_MIN_CONFIDENCE", 0.85)),
+        float(os.getenv("OCR_CASCADE_MIN_COMPLETENESS", 0.8)),
+    )
+
+
+def get_min_products() -> int:
+    """결과를 채택할 최소 상품 수 (환경변수 OCR_MIN_PRODUCTS, 기본 1)"""
+    return max(0, int(os.getenv("OCR_MIN_PRODUCTS", 1)))
+
+
+def _get_race_executor() -> ThreadPoolExecutor:
+    """
+    race 모드용 공용 스레드 풀
+    엔진별 동시 실행 수의 합만큼 스레드를 두어 풀이 아니라 각 엔진 세마포어가 동시 실행을 제한하도록 함
+    (세마포어 대기는 호출자의 제한 시간까지만 - 진 엔진의 스레드가 풀을 오래 붙잡지 않음)
+    """
+    global _race_executor
+    
+    with _engine_semaphores_lock:
+        if _race_executor is None:
+            workers = sum(get_engine_concurrency(method) for method in SUPPORTED_METHODS)
+            _race_executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ocr-race")
+        return _race_executor
+
+
+def _get_local_engine_executor(method: str) -> ThreadPoolExecutor:
+    """로컬 엔진(pp_ocrv5)을 이벤트 루프 밖에서 실행할 엔진별 스레드 풀"""
+    with _local_engine_executors_lock:
+        executor = _local_engine_executors.get(method)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=get_engine_concurrency(method),
+                thread_name_prefix=f"ocr-{method}"
+            )
+            _local_engine_executors[method] = executor
+        return executor
+
+
+# 로컬 엔진 일괄 처리용 프로세스 풀 (엔진별 - 호출마다 새로 만들면 워커 시작 + 모델 로드를 매번 다시 함)
+_local_process_pools = {}
+_local_process_pools_lock = threading.Lock()
+
+
+def _get_local_process_pool(method: str) -> ProcessPoolExecutor:
+    """로컬 엔진(pp_ocrv5)을 실행할 엔진별 프로세스 공용 프로세스 풀 (처음 사용할 때 생성)"""
+    with _local_process_pools_lock:
+        pool = _local_process_pools.get(method)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=get_engine_concurrency(method))
+            _local_process_pools[method] = pool
+        return pool
+
+
+def _reset_local_process_pool(method: str):
+    """워커가 죽어 망가진 풀 폐기 (다음 요청에서 새로 생성)"""
+    with _local_process_pools_lock:
+        pool = _local_process_pools.pop(method, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# 프로세스 풀 워커별 프로세서 (워커 프로세스마다 모델을 한 번만 로드)
+_worker_processors = {}
+
+
+def _run_engine_in_worker(method: str, image_data: bytes, image_path: Optional[str]) -> Dict:
+    """
+    프로세스 풀 워커에서 로컬 엔진 실행 (pickle 가능하도록 모듈 최상위 함수)
+    
+    Args:
+        method: OCR 방법
+        image_data: 이미지 바이트 데이터
+        image_path: 결과 메타데이터에 기록할 원본 경로
+        
+    Returns:
+        인식된 상품 정보
+    """
+    processor = _worker_processors.get(method)
+    if processor is None:
+        processor = MarketOCRProcessor(method=method, use_cache=False)
+        _worker_processors[method] = processor
+    return processor._run_engine(image_data, method, image_path)
 
 
 class MarketOCRProcessor:
@@ -26,7 +294,15 @@ class MarketOCRProcessor:
     여러 OCR 엔진을 지원합니다.
     """
     
-    def __init__(self, method: str = "gpt4_vision"):
+    def __init__(
+        self,
+        method: str = "gpt4_vision",
+        cache: Optional[OCRResultCache] = None,
+        use_cache: bool = True,
+        optimize_upload: bool = True,
+        settings: Optional[Settings] = None,
+        circuit_breaker: Optional[bool] = None
+    ):
         """
         초기화 함수
         
@@ -36,37 +312,81 @@ class MarketOCRProcessor:
                 - "google_vision": Google Cloud Vision API
                 - "naver_clova": Naver Clova OCR
                 - "pp_ocrv5": PaddleOCR PP-OCRv5 (한국어 특화, 로컬 실행)
+                - "race": 여러 엔진을 동시에 실행해 먼저 나온 쓸 만한 결과 사용
+                - "cascade": 로컬 엔진부터 실행해 신뢰도가 낮을 때만 유료 엔진 사용
+            cache: 결과 캐시 (None이면 프로세스 공용 캐시 사용)
+            use_cache: False이면 결과 캐시를 사용하지 않음
+            optimize_upload: 원격 엔진 전송 전 이미지 축소/재압축 여부
+            settings: 사용할 설정 (None이면 공용 설정 - 설정 파일이 바뀌면 자동 반영)
+            circuit_breaker: 엔진별 회로 차단기 + 대체 엔진 자동 전환 사용 여부
+                (None이면 OCR_CIRCUIT_BREAKER, 대체 엔진은 OCR_FALLBACK_* 설정)
         """
         self.method = method
         self.api_key = None
+        self._settings = settings
+        self._configured_settings = None
         self.pp_ocr_ocr = None  # PP-OCRv5 OCR 객체 (지연 로딩)
+        self.optimize_upload = optimize_upload
+        self.circuit_breaker = circuit_breaker_enabled() if circuit_breaker is None else circuit_breaker
+        self._configured_methods = set()
+        
+        # 선택한 방법에 따라 API 키 확인 (공용 설정이면 이때 설정 파일 로드)
+        # 조합 방법(race)은 실제 엔진을 실행할 때 엔진별로 확인
+        if method not in COMPOSITE_METHODS:
+            self._configure_method(method)
+        
+        self.cache = (cache or get_default_cache()) if use_cache else None
+    
+    
+    @property
+    def settings(self) -> Settings:
+        """현재 설정 (주입된 설정이 없으면 공용 설정)"""
+        return self._settings or get_settings()
+    
+    
+    def _configure_method(self, method: str):
+        """
+        OCR 방법별 설정(API 키 등) 확인 및 로드
+        process_image_bytes에서 다른 방법을 지정할 때도 사용
+        
+        Args:
+            method: OCR 방법
+            
+        Raises:
+            ValueError: 필요한 설정이 없는 경우
+        """
+        settings = self.settings
+        # 설정 파일이 다시 로드되었으면 방법별 설정도 다시 확인
+        if settings is not self._configured_settings:
+            self._configured_methods = set()
+            self._configured_settings = settings
+        
+        if method in self._configured_methods:
+            return
+        
+        settings.require(method)
         
-        # 선택한 방법에 따라 API 키 확인
         if method == "gpt4_vision":
-            self.api_key = os.getenv("OPENAI_API_KEY")
-            if not self.api_key:
-                raise ValueError("OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다.")
+            self.api_key = settings.openai_api_key
         
         elif method == "google_vision":
-            self.credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-            if not self.credentials_path:
-                raise ValueError("GOOGLE_APPLICATION_CREDENTIALS가 설정되지 않았습니다.")
+            self.credentials_path = settings.google_credentials
         
         elif method == "naver_clova":
-            self.naver_secret = os.getenv("NAVER_OCR_SECRET_KEY")
-            self.naver_url = os.getenv("NAVER_OCR_API_URL")
-            if not self.naver_secret or not self.naver_url:
-                raise ValueError("Naver Clova OCR 설정이 완료되지 않았습니다.")
+            self.naver_secret = settings.naver_secret
+            self.naver_url = settings.naver_url
         
         elif method == "pp_ocrv5":
             # PP-OCRv5는 지연 로딩 (처음 사용할 때 모델 로드)
             # 모델 경로 설정 (선택사항, 기본값은 자동 다운로드)
-            self.pp_ocrv5_model_path = os.getenv("PP_OCRV5_MODEL_PATH", None)
+            self.pp_ocrv5_model_path = settings.pp_ocrv5_model_path
             # 한국어 모델 사용 여부 설정
-            self.pp_ocrv5_use_korean = os.getenv("PP_OCRV5_USE_KOREAN", "True").lower() == "true"
+            self.pp_ocrv5_use_korean = settings.pp_ocrv5_use_korean
+        
+        self._configured_methods.add(method)
     
     
-    def preprocess_image(self, image_path: str) -> np.ndarray:
+    def preprocess_image(self, image_path: str) -> "np.ndarray":
         """
         이미지 전처리 - 인식률 향상을 위한 이미지 품질 개선
         
@@ -76,6 +396,8 @@ class MarketOCRProcessor:
         Returns:
             전처리된 이미지 (numpy array)
         """
+        import cv2
+        
         # 이미지 읽기
         image = cv2.imread(image_path)
         
@@ -105,7 +427,7 @@ class MarketOCRProcessor:
     def encode_image_to_base64(self, image_path: str) -> str:
         """
         이미지를 Base64로 인코딩 (API 전송용)
-        한글 경로 및 인코딩 문제 완전 해결
+        바이너리 모드로 바로 읽으므로 한글 경로도 안전하게 처리됨
         
         Args:
             image_path: 이미지 파일 경로
@@ -113,43 +435,64 @@ class MarketOCRProcessor:
         Returns:
             Base64 인코딩된 문자열
         """
-        import tempfile
-        import shutil
-        
-        # 항상 임시 파일을 사용하여 안전하게 처리
-        temp_fd = None
-        temp_path = None
-        
         try:
-            # 안전한 임시 파일 생성
-            temp_fd, temp_path = tempfile.mkstemp(suffix='.jpg')
-            os.close(temp_fd)  # 파일 디스크립터 즉시 닫기
-            
-            # 원본 파일을 임시 파일로 복사
-            shutil.copy2(image_path, temp_path)
-            
-            # 임시 파일에서 바이너리 데이터 읽기
-            with open(temp_path, "rb") as temp_file:
-                image_data = temp_file.read()
+            return self.encode_bytes_to_base64(self._read_image_bytes(image_path))
+        except Exception as e:
+            raise Exception(f"이미지 인코딩 실패: {str(e)}")
+    
+    
+    def encode_bytes_to_base64(self, image_data: bytes) -> str:
+        """
+        이미지 바이트를 Base64로 인코딩 (파일 시스템 사용 안 함)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
             
-            # Base64 인코딩 (ASCII로 안전하게 디코딩)
-            base64_encoded = base64.b64encode(image_data).decode('ascii')
-            return base64_encoded
+        Returns:
+            Base64 인코딩된 문자열 (ASCII)
+        """
+        return base64.b64encode(image_data).decode('ascii')
+    
+    
+    def _read_image_bytes(self, image_path: str) -> bytes:
+        """
+        이미지 파일을 바이트로 읽기
+        
+        Args:
+            image_path: 이미지 파일 경로
             
-        except Exception as e:
-            # 오류 발생 시 더 자세한 정보 제공
-            error_msg = f"이미지 인코딩 실패: {str(e)}"
-            if temp_path and os.path.exists(temp_path):
-                error_msg += f" (임시 파일: {temp_path})"
-            raise Exception(error_msg)
+        Returns:
+            이미지 바이트 데이터
+        """
+        with open(image_path, "rb") as image_file:
+            return image_file.read()
+    
+    
+    @staticmethod
+    def _detect_image_format(image_data: bytes, default: str = "jpg") -> str:
+        """
+        매직 바이트로 이미지 형식 판별 (디코딩 없이)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            default: 판별 실패 시 기본값
             
-        finally:
-            # 임시 파일 정리
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+        Returns:
+            형식 문자열 (jpg, png, webp, gif, bmp, tiff)
+        """
+        if image_data.startswith(b"\xff\xd8\xff"):
+            return "jpg"
+        if image_data.startswith(b"\x89PNG\r\n\x1a\n"):
+            return "png"
+        if image_data[:4] == b"RIFF" and image_data[8:12] == b"WEBP":
+            return "webp"
+        if image_data[:6] in (b"GIF87a", b"GIF89a"):
+            return "gif"
+        if image_data.startswith(b"BM"):
+            return "bmp"
+        if image_data[:4] in (b"II*\x00", b"MM\x00*"):
+            return "tiff"
+        return default
     
     
     def process_with_gpt4_vision(self, image_path: str) -> Dict:
@@ -163,154 +506,175 @@ class MarketOCRProcessor:
         Returns:
             인식된 상품 정보 딕셔너리
         """
-        from openai import OpenAI
-        
         try:
-            # OpenAI 클라이언트 초기화
-            client = OpenAI(api_key=self.api_key)
-            
-            # 이미지를 Base64로 인코딩 (안전한 방식)
-            base64_image = self.encode_image_to_base64(image_path)
+            image_data = self._read_image_bytes(image_path)
+        except Exception as e:
+            return self._engine_error(e, "GPT-4 Vision 처리 중 오류가 발생했습니다.")
+        return self.process_with_gpt4_vision_bytes(image_data, image_path=image_path)
+    
+    
+    def process_with_gpt4_vision_bytes(self, image_data: bytes, image_path: Optional[str] = None) -> Dict:
+        """
+        GPT-4 Vision API를 사용한 OCR 처리 (이미지 바이트 직접 전달)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
             
-            # GPT-4 Vision에게 프롬프트 전송 (ASCII 전용으로 변경)
-            prompt = """
-This image shows products and price tags from a market stall.
-Please identify all product names and prices from the image and organize them in JSON format.
-
-Output format:
-{
-  "products": [
-    {
-      "product_name": "Product name in Korean",
-      "price": "Price with won currency",
-      "unit": "Unit (e.g., 1 piece, 1 basket, 1kg, etc.)",
-      "additional_info": "Additional information if available"
-    }
-  ]
-}
-
-- Recognize Korean handwriting as accurately as possible
-- Include won currency unit in the price
-- Extract unit information if available
-- Recognize all price tags without missing any
-"""
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        try:
+            # 공용 OpenAI 클라이언트 (연결 풀 재사용)
+            client = get_openai_client(self.api_key)
             
             # API 호출
-            response = client.chat.completions.create(
-                model="gpt-4o",  # 또는 "gpt-4-vision-preview"
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=1000
-            )
+            response = client.chat.completions.create(**self._build_gpt4_vision_request(image_data))
             
             # 응답에서 JSON 추출
-            result_text = response.choices[0].message.content
-            
-            # JSON 파싱 (코드 블록 제거)
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0]
-            
-            result = json.loads(result_text.strip())
-            
-            # 메타데이터 추가
-            result["metadata"] = {
-                "method": "gpt4_vision",
-                "timestamp": datetime.now().isoformat(),
-                "image_path": image_path,
-                "total_items": len(result.get("products", []))
-            }
-            
-            return result
+            return self._parse_gpt4_vision_response(response.choices[0].message.content, image_path)
             
         except UnicodeDecodeError as e:
-            return {
-                "error": f"인코딩 오류: {str(e)}",
-                "message": "파일 인코딩 문제가 발생했습니다. 파일명에 한글이 포함되어 있을 수 있습니다.",
-                "solution": "파일명을 영문으로 변경하거나 다른 이미지를 시도해보세요."
-            }
+            return self._gpt4_vision_unicode_error(e)
         except Exception as e:
-            return {
-                "error": str(e),
-                "message": "GPT-4 Vision 처리 중 오류가 발생했습니다."
-            }
+            return self._engine_error(e, "GPT-4 Vision 처리 중 오류가 발생했습니다.")
     
     
-    def process_with_google_vision(self, image_path: str) -> Dict:
+    def _build_gpt4_vision_request(self, image_data: bytes) -> Dict:
         """
-        Google Cloud Vision API를 사용한 OCR 처리
+        GPT-4 Vision 요청 인자 생성 (동기/비동기 공통)
         
         Args:
-            image_path: 이미지 파일 경로
+            image_data: 이미지 바이트 데이터
             
         Returns:
-            인식된 상품 정보 딕셔너리
+            chat.completions.create 인자 딕셔너리
         """
-        from google.cloud import vision
+        # 이미지를 Base64로 인코딩 (메모리에서 바로 처리)
+        base64_image = self.encode_bytes_to_base64(image_data)
+        image_format = self._detect_image_format(image_data)
+        mime_type = "jpeg" if image_format == "jpg" else image_format
         
-        # Vision API 클라이언트 초기화
-        client = vision.ImageAnnotatorClient()
+        # GPT-4 Vision에게 프롬프트 전송 (ASCII 전용으로 변경)
+        prompt = GPT4_VISION_PROMPT
         
-        try:
-            # 이미지 읽기
-            with open(image_path, 'rb') as image_file:
-                content = image_file.read()
-            
-            image = vision.Image(content=content)
-            
-            # 텍스트 감지 수행
-            response = client.text_detection(image=image)
-            texts = response.text_annotations
-            
-            if not texts:
-                return {
-                    "products": [],
-                    "message": "텍스트를 찾을 수 없습니다."
+        return {
+            "model": "gpt-4o",  # 또는 "gpt-4-vision-preview"
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/{mime_type};base64,{base64_image}"
+                            }
+                        }
+                    ]
                 }
+            ],
+            "max_tokens": 1000
+        }
+    
+    
+    def _parse_gpt4_vision_response(self, result_text: str, image_path: Optional[str] = None) -> Dict:
+        """
+        GPT-4 Vision 응답 텍스트를 결과 딕셔너리로 변환
+        
+        Args:
+            result_text: 모델 응답 텍스트
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        # JSON 파싱 (코드 블록 제거)
+        if "```json" in result_text:
+            result_text = result_text.split("```json")[1].split("```")[0]
+        elif "```" in result_text:
+            result_text = result_text.split("```")[1].split("```")[0]
+        
+        result = json.loads(result_text.strip())
+        
+        # 메타데이터 추가
+        result["metadata"] = {
+            "method": "gpt4_vision",
+            "timestamp": datetime.now().isoformat(),
+            "image_path": image_path,
+            "total_items": len(result.get("products", []))
+        }
+        
+        return result
+    
+    
+    async def process_with_gpt4_vision_async(self, image_data: bytes, image_path: Optional[str] = None) -> Dict:
+        """
+        GPT-4 Vision API를 사용한 OCR 처리 (비동기, AsyncOpenAI 사용)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
             
-            # 전체 텍스트 추출
-            full_text = texts[0].description
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        try:
+            client = get_async_openai_client(self.api_key)
+            response = await client.chat.completions.create(**self._build_gpt4_vision_request(image_data))
+            return self._parse_gpt4_vision_response(response.choices[0].message.content, image_path)
             
-            # 텍스트를 분석하여 상품 정보 파싱
-            products = self._parse_text_to_products(full_text)
+        except UnicodeDecodeError as e:
+            return self._gpt4_vision_unicode_error(e)
+        except Exception as e:
+            return self._engine_error(e, "GPT-4 Vision 처리 중 오류가 발생했습니다.")
+    
+    
+    @staticmethod
+    def _engine_error(error: Exception, message: str) -> Dict:
+        """
+        엔진 호출 오류 결과
+        
+        Args:
+            error: 발생한 예외 (사용자용 메시지로 바꾼 예외면 원인 예외로 판별)
+            message: 사용자에게 보여줄 안내
             
+        Returns:
+            오류 결과 (제공사 장애(타임아웃/연결 실패/429·5xx)면 engine_failure: True - 회로 차단기는 이것만 실패로 기록,
+            재시도/헤지 요청이 속도 제한에 걸렸으면 rate_limited: True)
+        """
+        cause = error.__cause__ or error
+        if isinstance(cause, RateLimitExceeded):
             result = {
-                "products": products,
-                "raw_text": full_text,
-                "metadata": {
-                    "method": "google_vision",
-                    "timestamp": datetime.now().isoformat(),
-                    "image_path": image_path,
-                    "total_items": len(products)
-                }
+                "error": str(cause),
+                "message": message,
+                "rate_limited": True
             }
-            
+            if cause.retry_after is not None:
+                result["retry_after"] = cause.retry_after
             return result
-            
-        except Exception as e:
-            return {
-                "error": str(e),
-                "message": "Google Vision 처리 중 오류가 발생했습니다."
-            }
+        
+        result = {
+            "error": str(error),
+            "message": message
+        }
+        if is_engine_failure(cause):
+            result["engine_failure"] = True
+        return result
     
     
-    def process_with_naver_clova(self, image_path: str) -> Dict:
+    def _gpt4_vision_unicode_error(self, e: UnicodeDecodeError) -> Dict:
+        """GPT-4 Vision 인코딩 오류 응답"""
+        return {
+            "error": f"인코딩 오류: {str(e)}",
+            "message": "파일 인코딩 문제가 발생했습니다. 파일명에 한글이 포함되어 있을 수 있습니다.",
+            "solution": "파일명을 영문으로 변경하거나 다른 이미지를 시도해보세요."
+        }
+    
+    
+    def process_with_google_vision(self, image_path: str) -> Dict:
         """
-        Naver Clova OCR을 사용한 처리
-        한국어에 특화된 OCR
+        Google Cloud Vision API를 사용한 OCR 처리
         
         Args:
             image_path: 이미지 파일 경로
@@ -318,111 +682,430 @@ Output format:
         Returns:
             인식된 상품 정보 딕셔너리
         """
-        import requests
-        
         try:
-            # API 요청 준비
-            url = self.naver_url
-            headers = {
-                'X-OCR-SECRET': self.naver_secret,
-                'Content-Type': 'application/json'
-            }
-            
-            # 이미지를 Base64로 인코딩
-            base64_image = self.encode_image_to_base64(image_path)
-            
-            # 안전한 파일명 처리 (한글 경로 대응)
-            try:
-                file_name = Path(image_path).name
-                file_format = Path(image_path).suffix[1:] or 'jpg'
-            except:
-                file_name = 'image.jpg'
-                file_format = 'jpg'
+            image_data = self._read_image_bytes(image_path)
+        except Exception as e:
+            return self._engine_error(e, "Google Vision 처리 중 오류가 발생했습니다.")
+        return self.process_with_google_vision_bytes(image_data, image_path=image_path)
+    
+    
+    def process_with_google_vision_bytes(self, image_data: bytes, image_path: Optional[str] = None) -> Dict:
+        """
+        Google Cloud Vision API를 사용한 OCR 처리 (이미지 바이트 직접 전달)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
             
-            data = {
-                'version': 'V2',
-                'requestId': f'market_ocr_{datetime.now().timestamp()}',
-                'timestamp': int(datetime.now().timestamp() * 1000),
-                'images': [
-                    {
-                        'format': file_format,
-                        'name': file_name,
-                        'data': base64_image
-                    }
-                ]
-            }
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        from google.cloud import vision
+        
+        try:
+            # 공용 Vision API 클라이언트
+            client = get_google_vision_client()
             
-            # API 호출 (타임아웃 설정 추가 - 연결 10초, 읽기 30초)
-            # 네트워크 연결 문제 시 빠르게 실패하도록 타임아웃 설정
-            try:
-                response = requests.post(
-                    url, 
-                    headers=headers, 
-                    json=data,
-                    timeout=(10, 30)  # 연결 타임아웃 10초, 읽기 타임아웃 30초
-                )
-                response.raise_for_status()
-            except requests.exceptions.Timeout:
-                raise Exception("네이버 Clova OCR API 서버 연결 타임아웃 (30초 초과). 네트워크 연결을 확인해주세요.")
-            except requests.exceptions.ConnectionError as e:
-                raise Exception(f"네이버 Clova OCR API 서버에 연결할 수 없습니다. 네트워크 연결을 확인해주세요. (상세: {str(e)})")
-            except requests.exceptions.RequestException as e:
-                raise Exception(f"네이버 Clova OCR API 요청 실패: {str(e)}")
+            image = vision.Image(content=image_data)
             
-            result_data = response.json()
+            # 텍스트 감지 수행
+            response = client.text_detection(image=image)
+            return self._build_google_vision_result(response.text_annotations, image_path)
             
-            # 텍스트 추출
-            full_text = ""
-            for image in result_data.get('images', []):
-                for field in image.get('fields', []):
-                    full_text += field.get('inferText', '') + "\n"
+        except Exception as e:
+            return self._engine_error(e, "Google Vision 처리 중 오류가 발생했습니다.")
+    
+    
+    async def process_with_google_vision_async(self, image_data: bytes, image_path: Optional[str] = None) -> Dict:
+        """
+        Google Cloud Vision API를 사용한 OCR 처리 (비동기, ImageAnnotatorAsyncClient 사용)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
             
-            # 상품 정보 파싱
-            products = self._parse_text_to_products(full_text)
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        from google.cloud import vision
+        
+        try:
+            client = get_google_vision_async_client()
             
-            result = {
-                "products": products,
-                "raw_text": full_text,
-                "metadata": {
-                    "method": "naver_clova",
-                    "timestamp": datetime.now().isoformat(),
-                    "image_path": image_path,
-                    "total_items": len(products)
-                }
-            }
+            request = vision.AnnotateImageRequest(
+                image=vision.Image(content=image_data),
+                features=[vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)]
+            )
+            response = await client.batch_annotate_images(requests=[request])
+            annotation = response.responses[0]
+            if annotation.error.message:
+                raise Exception(annotation.error.message)
             
-            return result
+            return self._build_google_vision_result(annotation.text_annotations, image_path)
             
         except Exception as e:
+            return self._engine_error(e, "Google Vision 처리 중 오류가 발생했습니다.")
+    
+    
+    def _build_google_vision_result(self, texts, image_path: Optional[str] = None) -> Dict:
+        """
+        Google Vision text_annotations를 결과 딕셔너리로 변환 (동기/비동기 공통)
+        
+        Args:
+            texts: text_annotations 목록
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        if not texts:
             return {
-                "error": str(e),
-                "message": "Naver Clova OCR 처리 중 오류가 발생했습니다."
+                "products": [],
+                "message": "텍스트를 찾을 수 없습니다."
+            }
+        
+        # 전체 텍스트 추출
+        full_text = texts[0].description
+        
+        # 텍스트를 분석하여 상품 정보 파싱
+        products = self._parse_text_to_products(full_text)
+        
+        return {
+            "products": products,
+            "raw_text": full_text,
+            "metadata": {
+                "method": "google_vision",
+                "timestamp": datetime.now().isoformat(),
+                "image_path": image_path,
+                "total_items": len(products)
             }
+        }
     
-    def process_with_naver_clova_from_data(self, image_data: bytes) -> Dict:
+    
+    def process_with_naver_clova(self, image_path: str) -> Dict:
         """
-        Naver Clova OCR을 사용한 처리 (이미지 데이터 직접 전달)
+        Naver Clova OCR을 사용한 처리
         한국어에 특화된 OCR
         
+        Args:
+            image_path: 이미지 파일 경로
+            
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        try:
+            image_data = self._read_image_bytes(image_path)
+        except Exception as e:
+            return self._engine_error(e, "Naver Clova OCR 처리 중 오류가 발생했습니다.")
+        return self.process_with_naver_clova_bytes(image_data, image_path=image_path)
+    
+    
+    def process_with_naver_clova_bytes(
+        self,
+        image_data: bytes,
+        image_path: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        Naver Clova OCR을 사용한 처리 (이미지 바이트 직접 전달)
+        
         Args:
             image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            deadline: 호출자의 제한 시간 (None이면 NAVER_OCR_DEADLINE)
             
         Returns:
-            인식된 텍스트 정보 딕셔너리
+            인식된 상품 정보 딕셔너리
+        """
+        try:
+            # API 요청 준비
+            data = self._build_naver_payload([self._build_naver_image(image_data, image_path)])
+            
+            # API 호출 (일시적 오류 재시도 + 선택적 헤지 요청, 제한 시간 안에서만)
+            response = self._post_naver(data, deadline)
+            
+            return self._parse_naver_response(response.json(), image_path)
+            
+        except Exception as e:
+            return self._engine_error(e, "Naver Clova OCR 처리 중 오류가 발생했습니다.")
+    
+    
+    def process_with_naver_clova_batch(
+        self,
+        images: List[Tuple[bytes, Optional[str]]],
+        admitted: bool = True
+    ) -> List[Dict]:
+        """
+        Naver Clova OCR 다중 이미지 처리
+        여러 이미지를 images[]에 담아 요청 수를 줄이고, 응답을 입력 순서대로 나눠 반환
+        
+        Args:
+            images: (이미지 바이트, 원본 경로) 목록
+            admitted: 이미지마다 이미 허가(차감)되었는지 (process_images는 _run_method에서 이미지별로 차감),
+                False면 요청마다 차감
+            
+        Returns:
+            입력 순서와 같은 인식 결과 목록
+        """
+        max_batch = get_naver_max_images_per_request()
+        results = []
+        
+        for start in range(0, len(images), max_batch):
+            chunk = images[start:start + max_batch]
+            
+            try:
+                # 응답을 원래 이미지에 되돌려 주기 위해 요청 내에서 고유한 이름 부여
+                request_images = []
+                for offset, (image_data, image_path) in enumerate(chunk):
+                    image = self._build_naver_image(image_data, image_path)
+                    image['name'] = f"{offset}_{image['name']}"
+                    request_images.append(image)
+                
+                data = self._build_naver_payload(request_images)
+                
+                with _get_engine_semaphore("naver_clova"):
+                    response = self._post_naver(data, admitted=admitted)
+                
+                response_images = response.json().get('images', [])
+                by_name = {image.get('name'): image for image in response_images}
+                
+                for offset, (image_data, image_path) in enumerate(chunk):
+                    # 이름으로 매칭, 없으면 같은 위치의 응답 사용
+                    image_result = by_name.get(request_images[offset]['name'])
+                    if image_result is None and offset < len(response_images):
+                        image_result = response_images[offset]
+                    
+                    if image_result is None:
+                        results.append({
+                            "error": "응답에 해당 이미지 결과가 없습니다.",
+                            "message": "Naver Clova OCR 처리 중 오류가 발생했습니다."
+                        })
+                    elif image_result.get('inferResult', 'SUCCESS') != 'SUCCESS':
+                        results.append({
+                            "error": image_result.get('message', image_result.get('inferResult')),
+                            "message": "Naver Clova OCR 처리 중 오류가 발생했습니다."
+                        })
+                    else:
+                        results.append(self._parse_naver_response({'images': [image_result]}, image_path))
+                
+            except Exception as e:
+                results.extend([self._engine_error(e, "Naver Clova OCR 처리 중 오류가 발생했습니다.") for _ in chunk])
+        
+        return results
+    
+    
+    async def process_with_naver_clova_async(
+        self,
+        image_data: bytes,
+        image_path: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        Naver Clova OCR을 사용한 처리 (비동기, httpx.AsyncClient 사용)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            deadline: 호출자의 제한 시간 (None이면 NAVER_OCR_DEADLINE)
+            
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        try:
+            data = self._build_naver_payload([self._build_naver_image(image_data, image_path)])
+            response = await self._post_naver_async(data, deadline)
+            return self._parse_naver_response(response.json(), image_path)
+            
+        except Exception as e:
+            return self._engine_error(e, "Naver Clova OCR 처리 중 오류가 발생했습니다.")
+    
+    
+    def _post_naver(self, data: Dict, deadline: Optional[Deadline] = None, admitted: bool = True):
+        """
+        Clova API 호출 (일시적 오류는 지터 백오프로 재시도, NAVER_OCR_HEDGE면 느린 요청에 헤지 요청)
+        재시도/헤지 요청도 실제 호출이므로 한 건씩 속도 제한/월간 사용량에 차감
+        (추가 요청은 기다리지 않음 - 바로 허가되지 않으면 보내지 않음)
+        
+        Args:
+            data: 요청 본문
+            deadline: 호출자의 제한 시간 (재시도/헤지 포함 전체 시간이 이를 넘지 않음)
+            admitted: 첫 요청이 이미 허가(차감)되었는지 (_run_method 경유), False면 첫 요청도 차감
+            
+        Returns:
+            requests.Response
+            
+        Raises:
+            Exception: 사용자에게 보여줄 오류 메시지
         """
         import requests
         
+        attempts = itertools.count()
+        
+        def send(timeout):
+            if next(attempts) > 0 or not admitted:
+                admit("naver_clova", self._rate_limit_key("naver_clova"), 0 if admitted else None)
+            response = get_naver_session().post(
+                self.naver_url,
+                headers=self._naver_headers(),
+                json=data,
+                timeout=timeout  # (연결, 읽기) - 기본 10초/30초, 남은 제한 시간만큼으로 줄어듦
+            )
+            response.raise_for_status()
+            return response
+        
         try:
-            # API 요청 준비
-            url = self.naver_url
-            headers = {
-                'X-OCR-SECRET': self.naver_secret,
-                'Content-Type': 'application/json'
+            return call_with_retries(
+                send, is_transient_requests_error, RetryPolicy.from_env("NAVER_OCR"),
+                get_latency_tracker("naver_clova"), deadline
+            )
+        except DeadlineExceeded as e:
+            raise Exception(f"네이버 Clova OCR API {e} 잠시 후 다시 시도해주세요.") from e
+        except requests.exceptions.Timeout as e:
+            raise Exception("네이버 Clova OCR API 서버 연결 타임아웃 (30초 초과). 네트워크 연결을 확인해주세요.") from e
+        except requests.exceptions.ConnectionError as e:
+            raise Exception(f"네이버 Clova OCR API 서버에 연결할 수 없습니다. 네트워크 연결을 확인해주세요. (상세: {str(e)})") from e
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"네이버 Clova OCR API 요청 실패: {str(e)}") from e
+    
+    
+    async def _post_naver_async(self, data: Dict, deadline: Optional[Deadline] = None):
+        """Clova API 호출 (비동기 - 늦은 헤지 요청은 취소, 나머지는 _post_naver와 같음)"""
+        import httpx
+        
+        attempts = itertools.count()
+        
+        async def send(timeout):
+            if next(attempts) > 0:
+                await admit_async("naver_clova", self._rate_limit_key("naver_clova"), 0)
+            response = await get_naver_async_client().post(
+                self.naver_url,
+                headers=self._naver_headers(),
+                json=data,
+                timeout=httpx.Timeout(timeout[1], connect=timeout[0])
+            )
+            response.raise_for_status()
+            return response
+        
+        try:
+            return await call_with_retries_async(
+                send, is_transient_httpx_error, RetryPolicy.from_env("NAVER_OCR"),
+                get_latency_tracker("naver_clova"), deadline
+            )
+        except DeadlineExceeded as e:
+            raise Exception(f"네이버 Clova OCR API {e} 잠시 후 다시 시도해주세요.") from e
+        except httpx.TimeoutException as e:
+            raise Exception("네이버 Clova OCR API 서버 연결 타임아웃 (30초 초과). 네트워크 연결을 확인해주세요.") from e
+        except httpx.ConnectError as e:
+            raise Exception(f"네이버 Clova OCR API 서버에 연결할 수 없습니다. 네트워크 연결을 확인해주세요. (상세: {str(e)})") from e
+        except httpx.HTTPError as e:
+            raise Exception(f"네이버 Clova OCR API 요청 실패: {str(e)}") from e
+    
+    
+    def _naver_headers(self) -> Dict:
+        """Naver Clova OCR 요청 헤더"""
+        return {
+            'X-OCR-SECRET': self.naver_secret,
+            'Content-Type': 'application/json'
+        }
+    
+    
+    def _build_naver_image(self, image_data: bytes, image_path: Optional[str] = None) -> Dict:
+        """
+        Naver Clova V2 요청의 images[] 항목 생성
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 원본 경로 (파일명으로 사용, 선택)
+            
+        Returns:
+            images[] 항목 딕셔너리
+        """
+        # 형식은 매직 바이트로 판별, 파일명은 경로가 있으면 사용 (한글 경로 대응)
+        file_format = self._detect_image_format(image_data)
+        try:
+            file_name = Path(image_path).name if image_path else f'image.{file_format}'
+        except:
+            file_name = f'image.{file_format}'
+        
+        return {
+            'format': file_format,
+            'name': file_name,
+            'data': self.encode_bytes_to_base64(image_data)
+        }
+    
+    
+    def _build_naver_payload(self, naver_images: List[Dict]) -> Dict:
+        """
+        Naver Clova V2 요청 본문 생성 (동기/비동기/배치 공통)
+        
+        Args:
+            naver_images: _build_naver_image로 만든 images[] 항목 목록
+            
+        Returns:
+            요청 본문 딕셔너리
+        """
+        return {
+            'version': 'V2',
+            'requestId': f'market_ocr_{datetime.now().timestamp()}',
+            'timestamp': int(datetime.now().timestamp() * 1000),
+            'images': naver_images
+        }
+    
+    
+    def _parse_naver_response(self, result_data: Dict, image_path: Optional[str] = None) -> Dict:
+        """
+        Naver Clova 응답을 결과 딕셔너리로 변환 (동기/비동기 공통)
+        
+        Args:
+            result_data: Clova 응답 JSON
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        # 텍스트 추출 (필드별 inferConfidence를 줄 신뢰도로 사용)
+        full_text = ""
+        text_lines = []
+        for image in result_data.get('images', []):
+            for field in image.get('fields', []):
+                text = field.get('inferText', '')
+                full_text += text + "\n"
+                confidence = field.get('inferConfidence')
+                text_lines.append({
+                    "text": text,
+                    "confidence": None if confidence is None else float(confidence)
+                })
+        
+        # 상품 정보 파싱
+        products = self._parse_text_to_products(full_text, text_lines)
+        
+        return {
+            "products": products,
+            "raw_text": full_text,
+            "text_lines": text_lines,
+            "metadata": {
+                "method": "naver_clova",
+                "timestamp": datetime.now().isoformat(),
+                "image_path": image_path,
+                "total_items": len(products)
             }
+        }
+    
+    
+    def process_with_naver_clova_from_data(self, image_data: bytes) -> Dict:
+        """
+        Naver Clova OCR을 사용한 처리 (이미지 데이터 직접 전달)
+        한국어에 특화된 OCR
+        
+        Args:
+            image_data: 이미지 바이트 데이터
             
+        Returns:
+            인식된 텍스트 정보 딕셔너리
+        """
+        try:
             # 이미지 데이터를 Base64로 인코딩
-            import base64
-            base64_image = base64.b64encode(image_data).decode('ascii')
+            base64_image = self.encode_bytes_to_base64(image_data)
             
             # API 요청 데이터
             data = {
@@ -432,28 +1115,14 @@ Output format:
                 "images": [
                     {
                         "name": "image",
-                        "format": "jpg",
+                        "format": self._detect_image_format(image_data),
                         "data": base64_image
                     }
                 ]
             }
             
-            # API 호출 (타임아웃 설정 추가 - 연결 10초, 읽기 30초)
-            # 네트워크 연결 문제 시 빠르게 실패하도록 타임아웃 설정
-            try:
-                response = requests.post(
-                    url, 
-                    headers=headers, 
-                    json=data,
-                    timeout=(10, 30)  # 연결 타임아웃 10초, 읽기 타임아웃 30초
-                )
-                response.raise_for_status()
-            except requests.exceptions.Timeout:
-                raise Exception("네이버 Clova OCR API 서버 연결 타임아웃 (30초 초과). 네트워크 연결을 확인해주세요.")
-            except requests.exceptions.ConnectionError as e:
-                raise Exception(f"네이버 Clova OCR API 서버에 연결할 수 없습니다. 네트워크 연결을 확인해주세요. (상세: {str(e)})")
-            except requests.exceptions.RequestException as e:
-                raise Exception(f"네이버 Clova OCR API 요청 실패: {str(e)}")
+            # API 호출 (일시적 오류 재시도 + 선택적 헤지 요청, 요청마다 사용량 차감)
+            response = self._post_naver(data, admitted=False)
             
             # 응답 처리
             result = response.json()
@@ -481,63 +1150,24 @@ Output format:
     def _load_pp_ocrv5_model(self):
         """
         PP-OCRv5 모델 로드 (지연 로딩)
-        처음 사용할 때만 모델을 로드하여 메모리 효율성 향상
+        모델은 프로세스 공용 레지스트리에서 가져오므로 인스턴스를 새로 만들어도
+        처음 한 번만 로드됨
         """
         if self.pp_ocr_ocr is None:
+            # 의존 라이브러리 import (처음 한 번만, 미설치 시 설치 안내와 함께 ImportError)
+            load_engine("pp_ocrv5")
+            
             try:
-                from paddleocr import PaddleOCR
-                import paddle
-                
-                # GPU 사용 가능 여부 확인
-                gpu_available = False
-                gpu_device = "CPU"
-                try:
-                    # PaddlePaddle이 CUDA를 지원하는지 확인
-                    if paddle.device.is_compiled_with_cuda():
-                        # GPU가 사용 가능한지 확인
-                        if paddle.device.cuda.device_count() > 0:
-                            gpu_available = True
-                            gpu_device = f"GPU (CUDA {paddle.device.cuda.device_count()}개)"
-                            print(f"🚀 GPU 감지됨: {gpu_device}")
-                        else:
-                            print("⚠️ CUDA는 지원되지만 사용 가능한 GPU가 없습니다. CPU 사용.")
-                    else:
-                        print("ℹ️ CUDA가 지원되지 않는 빌드입니다. CPU 사용.")
-                except Exception as e:
-                    print(f"⚠️ GPU 확인 중 오류: {e}. CPU 사용.")
-                
                 # 한국어 모델 사용 여부에 따라 설정
-                if self.pp_ocrv5_use_korean:
-                    # 한국어 특화 모델 사용
-                    # lang='korean': 한국어 모델 사용 (korean_PP-OCRv5_mobile_rec)
-                    # use_doc_orientation_classify: 문서 방향 분류 사용 (성능 향상)
-                    # use_textline_orientation: 텍스트 라인 방향 감지 사용 (성능 향상)
-                    # text_rec_score_thresh: 텍스트 인식 신뢰도 임계값 (낮을수록 더 많은 텍스트 인식)
-                    self.pp_ocr_ocr = PaddleOCR(
-                        lang='korean',  # 한국어 모델
-                        use_doc_orientation_classify=True,  # 문서 방향 분류 활성화 (성능 향상)
-                        use_textline_orientation=True,  # 텍스트 라인 방향 감지 활성화 (성능 향상)
-                        text_rec_score_thresh=0.5,  # 텍스트 인식 신뢰도 임계값 (0.5 = 50% 이상)
-                        ocr_version='PP-OCRv5'  # PP-OCRv5 버전 명시
-                    )
-                else:
-                    # 기본 다국어 모델 사용
-                    self.pp_ocr_ocr = PaddleOCR(
-                        lang='ch',  # 중국어/영어 기본 모델 (한국어도 지원)
-                        use_doc_orientation_classify=True,
-                        use_textline_orientation=True,
-                        text_rec_score_thresh=0.5,
-                        ocr_version='PP-OCRv5'
-                    )
-                
-                # GPU 사용 정보 저장 (결과에 포함하기 위해)
-                self.pp_ocr_gpu_info = {
-                    "gpu_available": gpu_available,
-                    "gpu_device": gpu_device,
-                    "using_gpu": gpu_available  # PaddleOCR은 자동으로 GPU 사용
-                }
-                
-                print(f"✅ PP-OCRv5 모델 로드 완료 ({gpu_device})")
+                # lang='korean': 한국어 모델 사용 (korean_PP-OCRv5_mobile_rec)
+                # lang='ch': 중국어/영어 기본 모델 (한국어도 지원)
+                # use_doc_orientation_classify: 문서 방향 분류 사용 (성능 향상)
+                # use_textline_orientation: 텍스트 라인 방향 감지 사용 (성능 향상)
+                # text_rec_score_thresh: 텍스트 인식 신뢰도 임계값 (0.5 = 50% 이상)
+                self.pp_ocr_ocr, self.pp_ocr_lock, self.pp_ocr_gpu_info = get_paddle_ocr(
+                    lang='korean' if self.pp_ocrv5_use_korean else 'ch',
+                    **PP_OCRV5_CONFIG
+                )
                 
             except ImportError:
                 raise ImportError(
@@ -558,6 +1188,28 @@ Output format:
         Args:
             image_path: 이미지 파일 경로
             
+        Returns:
+            인식된 상품 정보 딕셔너리
+        """
+        try:
+            image_data = self._read_image_bytes(image_path)
+        except Exception as e:
+            return {
+                "error": str(e),
+                "message": "PP-OCRv5 처리 중 오류가 발생했습니다."
+            }
+        return self.process_with_pp_ocrv5_bytes(image_data, image_path=image_path)
+    
+    
+    def process_with_pp_ocrv5_bytes(self, image_data: bytes, image_path: Optional[str] = None) -> Dict:
+        """
+        PP-OCRv5 모델을 사용한 OCR 처리 (이미지 바이트 직접 전달)
+        cv2.imdecode로 메모리에서 바로 디코딩 (임시 파일 사용 안 함)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            
         Returns:
             인식된 상품 정보 딕셔너리
         """
@@ -565,16 +1217,19 @@ Output format:
             # PP-OCRv5 모델 로드 (지연 로딩)
             ocr = self._load_pp_ocrv5_model()
             
-            # 이미지 파일 읽기 (한글 경로 대응)
-            # PaddleOCR은 파일 경로를 직접 받을 수 있지만, 
-            # 한글 경로 문제를 방지하기 위해 numpy array로 변환
-            image = cv2.imread(image_path)
+            import cv2
+            import numpy as np
+            
+            # 메모리에서 numpy array로 디코딩 (한글 경로 문제 없음)
+            image = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_COLOR)
             if image is None:
-                raise ValueError(f"이미지를 불러올 수 없습니다: {image_path}")
+                raise ValueError(f"이미지를 불러올 수 없습니다: {image_path or '업로드 이미지'}")
             
             # OCR 수행
             # PaddleOCR 3.3.2에서는 result[0]이 OCRResult 객체
-            result = ocr.ocr(image)
+            # 공유 모델은 스레드 안전하지 않으므로 추론은 직렬화
+            with self.pp_ocr_lock:
+                result = ocr.ocr(image)
             
             # 결과 파싱
             full_text = ""
@@ -610,8 +1265,8 @@ Output format:
                     "message": "이미지에서 텍스트를 찾을 수 없습니다."
                 }
             
-            # 상품 정보 파싱
-            products = self._parse_text_to_products(full_text)
+            # 상품 정보 파싱 (줄별 rec_scores를 상품 신뢰도로 사용)
+            products = self._parse_text_to_products(full_text, text_lines)
             
             # GPU 사용 정보 가져오기 (모델이 로드된 경우)
             gpu_info = getattr(self, 'pp_ocr_gpu_info', {
@@ -650,36 +1305,40 @@ Output format:
             }
     
     
-    def _parse_text_to_products(self, text: str) -> List[Dict]:
+    def _parse_text_to_products(self, text: str, text_lines: Optional[List[Dict]] = None) -> List[Dict]:
         """
         추출된 텍스트에서 상품명과 가격 파싱
         간단한 규칙 기반 파싱 (개선 가능)
         
         Args:
             text: OCR로 추출된 텍스트
+            text_lines: 줄별 {"text", "confidence"} (엔진이 신뢰도를 주는 경우, text 대신 이 줄들을 파싱)
             
         Returns:
-            상품 정보 리스트
+            상품 정보 리스트 (confidence는 상품명/가격 줄 인식 신뢰도 중 낮은 값, 모르면 None)
         """
         import re
         
-        products = []
-        lines = text.strip().split('\n')
-        
-        # 가격 패턴 (예: 800원, 5000원, 10,000원, 1만원)
-        price_pattern = r'(\d[\d,]*)\s*원|(\d+)\s*만\s*원'
+        if text_lines:
+            lines = [line.get("text") or "" for line in text_lines]
+            scores = [line.get("confidence") for line in text_lines]
+        else:
+            lines = text.strip().split('\n')
+            scores = [None] * len(lines)
         
+        products = []
         for i, line in enumerate(lines):
             line = line.strip()
             if not line:
                 continue
             
             # 가격을 찾음
-            price_match = re.search(price_pattern, line)
+            price_match = re.search(PRICE_PATTERN, line)
             if price_match:
                 # 가격이 있는 경우, 이전 라인이나 같은 라인에서 상품명 찾기
                 product_name = ""
                 price = price_match.group(0)
+                line_scores = [scores[i]]
                 
                 # 가격 앞부분을 상품명으로 추정
                 product_name = line[:price_match.start()].strip()
@@ -687,18 +1346,40 @@ Output format:
                 # 상품명이 비어있으면 이전 라인 확인
                 if not product_name and i > 0:
                     product_name = lines[i-1].strip()
+                    line_scores.append(scores[i-1])
                 
                 if product_name:
+                    known = [score for score in line_scores if score is not None]
                     products.append({
                         "product_name": product_name,
                         "price": price,
                         "unit": "",
-                        "confidence": 0.7
+                        "confidence": round(min(known), 4) if known else None
                     })
         
         return products
     
     
+    @staticmethod
+    def _parse_completeness(result: Dict) -> float:
+        """
+        파싱 완성도 - 가격이 있는 줄 중 상품으로 파싱된 비율 (가격 줄이 없으면 0)
+        
+        Args:
+            result: 엔진 결과 (text_lines 또는 raw_text, products)
+        """
+        import re
+        
+        lines = [line.get("text") or "" for line in result.get("text_lines") or []]
+        if not lines:
+            lines = (result.get("raw_text") or "").split('\n')
+        
+        price_lines = sum(1 for line in lines if re.search(PRICE_PATTERN, line))
+        if price_lines == 0:
+            return 0.0
+        return min(1.0, len(result.get("products") or []) / price_lines)
+    
+    
     def process_image(self, image_path: str) -> Dict:
         """
         이미지 처리 메인 함수
@@ -717,20 +1398,1111 @@ Output format:
                 "image_path": image_path
             }
         
-        # 선택한 방법으로 처리
-        if self.method == "gpt4_vision":
-            return self.process_with_gpt4_vision(image_path)
-        elif self.method == "google_vision":
-            return self.process_with_google_vision(image_path)
-        elif self.method == "naver_clova":
-            return self.process_with_naver_clova(image_path)
-        elif self.method == "pp_ocrv5":
-            return self.process_with_pp_ocrv5(image_path)
-        else:
+        try:
+            image_data = self._read_image_bytes(image_path)
+        except Exception as e:
             return {
-                "error": f"지원하지 않는 OCR 방법: {self.method}",
-                "supported_methods": ["gpt4_vision", "google_vision", "naver_clova", "pp_ocrv5"]
+                "error": f"이미지를 읽을 수 없습니다: {str(e)}",
+                "image_path": image_path
             }
+        
+        return self.process_image_bytes(image_data, image_path=image_path)
+    
+    
+    def process_image_bytes(
+        self,
+        image_data: bytes,
+        method: Optional[str] = None,
+        image_path: Optional[str] = None,
+        image_digest: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        이미지 바이트 처리 메인 함수 (파일 시스템을 전혀 사용하지 않음)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            method: OCR 방법 (None이면 초기화 시 설정한 방법)
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            image_digest: 업로드 중 미리 계산한 SHA-256 (있으면 캐시 키 계산 시 다시 해시하지 않음)
+            timeout: 전체 제한 시간 (초, 속도 제한 대기/재시도 포함 - None이면 엔진 기본값)
+            
+        Returns:
+            인식된 상품 정보 (JSON 형태)
+        """
+        return self._process_bytes(
+            image_data, method or self.method, image_path, image_digest=image_digest, timeout=timeout
+        )
+    
+    
+    def _process_bytes(
+        self,
+        image_data: bytes,
+        method: str,
+        image_path: Optional[str] = None,
+        runner=None,
+        image_digest: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        캐시 조회 → 엔진 실행 → 캐시 저장 공통 처리
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            method: OCR 방법
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            runner: 엔진 실행 함수 (None이면 _run_engine - 배치 처리 시 프로세스 풀/Clova 배처로 대체)
+            image_digest: 미리 계산한 원본 바이트 SHA-256 (선택)
+            timeout: 전체 제한 시간 (초, 선택)
+            
+        Returns:
+            인식된 상품 정보
+        """
+        deadline = Deadline(timeout) if timeout is not None else None
+        
+        if method not in SUPPORTED_METHODS and method not in COMPOSITE_METHODS:
+            return {
+                "error": f"지원하지 않는 OCR 방법: {method}",
+                "supported_methods": SUPPORTED_METHODS + COMPOSITE_METHODS
+            }
+        
+        if not image_data:
+            return {
+                "error": "이미지 데이터가 비어 있습니다.",
+                "image_path": image_path
+            }
+        
+        # 같은 이미지 + 방법의 요청이 이미 진행 중이면 엔진을 다시 호출하지 않고 그 결과를 기다림
+        if singleflight_enabled():
+            image_digest = image_digest or hashlib.sha256(image_data).hexdigest()
+            try:
+                result, shared = inflight.do(
+                    self._make_flight_key(method, image_digest),
+                    lambda: self._process_uncoalesced(image_data, method, image_path, runner, image_digest, deadline),
+                    None if deadline is None else deadline.remaining()
+                )
+            except TimeoutError as e:
+                return {"error": str(e), "message": "잠시 후 다시 시도하세요."}
+            return self._mark_coalesced(result, image_path) if shared else result
+        
+        return self._process_uncoalesced(image_data, method, image_path, runner, image_digest, deadline)
+    
+    
+    def _process_uncoalesced(
+        self,
+        image_data: bytes,
+        method: str,
+        image_path: Optional[str] = None,
+        runner=None,
+        image_digest: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        조합 방법 분기 → 캐시 조회 → 엔진 실행 → 캐시 저장 (동일 요청 합치기 안쪽)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            method: OCR 방법
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            runner: 엔진 실행 함수 (선택)
+            image_digest: 미리 계산한 원본 바이트 SHA-256 (선택)
+            deadline: 호출자의 제한 시간 (선택)
+            
+        Returns:
+            인식된 상품 정보
+        """
+        # 조합 방법은 엔진별 처리(캐시/속도 제한 포함)를 그대로 재사용
+        if method == "race":
+            return self._run_race(image_data, image_path, image_digest, deadline)
+        if method == "cascade":
+            return self._run_cascade(image_data, image_path, image_digest, deadline)
+        
+        # 캐시 조회 (디코딩 전 원본 바이트 해시 기준 - 적중 시 OpenCV/PIL 미사용)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._make_cache_key(image_data, method, image_digest)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._mark_cache_hit(cached, image_path)
+        
+        if self.circuit_breaker:
+            result = self._run_with_failover(image_data, method, image_path, runner, deadline)
+        else:
+            result = self._run_method(image_data, method, image_path, runner, deadline)
+        
+        # 성공한 결과만 캐시에 저장 (대체 엔진 결과는 원래 엔진이 회복되면 다시 받도록 저장하지 않음)
+        if cache_key is not None and "error" not in result and "failover" not in result:
+            self.cache.set(cache_key, result)
+        
+        return result
+    
+    
+    def _run_method(
+        self,
+        image_data: bytes,
+        method: str,
+        image_path: Optional[str] = None,
+        runner=None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        설정 확인 → 의존성 확인 → 속도 제한 → 업로드 최적화 → 엔진 실행
+        
+        Args:
+            image_data: 이미지 바이트 데이터 (원본)
+            method: OCR 방법
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            runner: 엔진 실행 함수 (None이면 _run_engine)
+            deadline: 호출자의 제한 시간 (선택)
+            
+        Returns:
+            인식된 상품 정보
+        """
+        try:
+            self._configure_method(method)
+        except ValueError as e:
+            return {
+                "error": str(e),
+                "message": f"{method} 설정을 확인하세요."
+            }
+        
+        missing = self._check_dependencies(method)
+        if missing is not None:
+            return missing
+        
+        # 엔진/API 키별 속도 제한 (한도 안에서 잠시 대기) + 월간 사용량 차감
+        try:
+            admit(method, self._rate_limit_key(method), self._admission_wait(deadline))
+        except RateLimitExceeded as e:
+            return self._rate_limited_result(method, e)
+        
+        # 원격 엔진은 업로드 전 크기/용량 최적화 (캐시 키는 원본 바이트 기준)
+        upload_info = None
+        if method in REMOTE_METHODS and self.optimize_upload:
+            image_data, upload_info = self._prepare_upload(image_data)
+        
+        # 선택한 방법으로 처리
+        if runner is not None:
+            result = runner(image_data, method, image_path)
+        else:
+            result = self._run_engine(image_data, method, image_path, deadline)
+        self._attach_upload_info(result, upload_info)
+        
+        return result
+    
+    
+    def _run_with_failover(
+        self,
+        image_data: bytes,
+        method: str,
+        image_path: Optional[str] = None,
+        runner=None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        회로 차단기 + 대체 엔진 전환
+        차단(open)된 엔진은 바로 건너뛰고, 실패하면 OCR_FALLBACK_* 목록의 다음 엔진으로 넘어감
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            method: 요청한 OCR 방법
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            runner: 요청한 방법의 엔진 실행 함수 (대체 엔진은 _run_engine 사용)
+            deadline: 호출자의 제한 시간 (지나면 더 전환하지 않음)
+            
+        Returns:
+            인식된 상품 정보 (대체 엔진을 썼으면 "failover" 항목 포함)
+        """
+        failover = {"requested": method, "skipped": [], "errors": {}}
+        result = None
+        
+        for candidate in self._failover_candidates(method):
+            if deadline is not None and deadline.expired():
+                break
+            
+            breaker = get_circuit_breaker(candidate)
+            if not breaker.allow():
+                failover["skipped"].append(candidate)
+                continue
+            
+            started = time.monotonic()
+            try:
+                result = self._run_method(
+                    image_data, candidate, image_path, runner if candidate == method else None, deadline
+                )
+            except BaseException:
+                # 결과를 알 수 없으므로 기록 없이 시험 요청 자리만 반납
+                breaker.release()
+                raise
+            if self._record_breaker(breaker, result, time.monotonic() - started):
+                return self._finish_failover(result, candidate, failover)
+            failover["errors"][candidate] = result.get("error")
+        
+        return self._failover_error(method, result, failover)
+    
+    
+    def _failover_candidates(self, method: str) -> List[str]:
+        """요청한 방법 + 지원하는 대체 엔진 목록"""
+        return [method] + [name for name in get_fallback_chain(method) if name in SUPPORTED_METHODS]
+    
+    
+    @staticmethod
+    def _record_breaker(breaker, result: Dict, seconds: float) -> bool:
+        """
+        엔진 결과를 회로 차단기에 기록
+        
+        Returns:
+            성공 여부 (엔진 장애(engine_failure)만 실패로 기록 - 속도 제한 초과, 잘못된 이미지,
+            설정 오류처럼 엔진 상태와 무관한 오류는 기록하지 않고 시험 요청 자리만 반납)
+        """
+        success = "error" not in result
+        if success or (result.get("engine_failure") and not result.get("rate_limited")):
+            breaker.record(success, seconds)
+        else:
+            breaker.release()
+        return success
+    
+    
+    @staticmethod
+    def _finish_failover(result: Dict, used: str, failover: Dict) -> Dict:
+        """대체 엔진을 썼으면 결과에 전환 정보 기록"""
+        if used != failover["requested"]:
+            failover["used"] = used
+            result["failover"] = failover
+        return result
+    
+    
+    @staticmethod
+    def _failover_error(method: str, result: Optional[Dict], failover: Dict) -> Dict:
+        """요청한 엔진과 대체 엔진이 모두 실패/차단된 경우의 결과"""
+        if result is None:
+            result = {
+                "error": f"{method} 엔진이 일시적으로 차단되었고 사용할 수 있는 대체 엔진이 없습니다.",
+                "message": "잠시 후 다시 시도하세요."
+            }
+        if failover["skipped"] or len(failover["errors"]) > 1:
+            result["failover"] = failover
+        return result
+    
+    
+    def _run_race(
+        self,
+        image_data: bytes,
+        image_path: Optional[str] = None,
+        image_digest: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        race 모드 - 여러 엔진을 동시에 실행하고 품질 기준을 먼저 통과한 결과 반환
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            image_digest: 미리 계산한 원본 바이트 SHA-256 (선택)
+            deadline: 호출자의 제한 시간 (선택)
+            
+        Returns:
+            채택된 결과 ("race" 항목에 엔진별 진행 상황 기록)
+            
+        Note:
+            스레드에서 이미 실행 중인 엔진은 멈출 수 없으므로, 채택 후에도 끝까지 실행되고 결과만 버려짐
+            ("abandoned" - 유료 엔진은 그대로 과금). 남은 엔진 호출을 실제로 취소하려면 비동기 경로
+            (process_image_bytes_async) 사용
+        """
+        engines = get_race_engines()
+        started = time.monotonic()
+        executor = _get_race_executor()
+        futures = {
+            executor.submit(
+                self._process_bytes, image_data, engine, image_path,
+                image_digest=image_digest, timeout=None if deadline is None else deadline.remaining()
+            ): engine
+            for engine in engines
+        }
+        
+        results = {}
+        winner = None
+        try:
+            for future in as_completed(futures, timeout=None if deadline is None else deadline.remaining()):
+                engine = futures[future]
+                try:
+                    results[engine] = future.result()
+                except Exception as e:
+                    results[engine] = {"error": str(e), "message": f"{engine} 처리 중 오류가 발생했습니다."}
+                if self._is_acceptable(results[engine]):
+                    winner = engine
+                    break
+        except FuturesTimeoutError:
+            pass
+        
+        # 아직 시작하지 않은 엔진만 취소됨 - 실행 중인 엔진은 결과를 기다리지 않고 버림
+        cancelled = [futures[future] for future in futures if future.cancel()]
+        return self._race_result(winner, engines, results, started, cancelled)
+    
+    
+    async def _run_race_async(
+        self,
+        image_data: bytes,
+        image_path: Optional[str] = None,
+        image_digest: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """race 모드 (비동기 - 채택 후 남은 엔진 작업은 취소)"""
+        engines = get_race_engines()
+        started = time.monotonic()
+        tasks = {
+            asyncio.ensure_future(self.process_image_bytes_async(
+                image_data, engine, image_path, image_digest,
+                timeout=None if deadline is None else deadline.remaining()
+            )): engine
+            for engine in engines
+        }
+        
+        results = {}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=None if deadline is None else deadline.remaining(),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    engine = tasks[task]
+                    if task.exception() is not None:
+                        results[engine] = {"error": str(task.exception()), "message": f"{engine} 처리 중 오류가 발생했습니다."}
+                    else:
+                        results[engine] = task.result()
+                    if self._is_acceptable(results[engine]):
+                        return self._race_result(engine, engines, results, started)
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        return self._race_result(None, engines, results, started)
+    
+    
+    @staticmethod
+    def _is_acceptable(result: Dict, min_products: Optional[int] = None) -> bool:
+        """
+        결과 품질 기준 (오류 없음 + 상품이 min_products개 이상 파싱됨)
+        
+        Args:
+            result: 엔진 결과
+            min_products: 최소 상품 수 (None이면 OCR_MIN_PRODUCTS)
+        """
+        if "error" in result:
+            return False
+        if min_products is None:
+            min_products = get_min_products()
+        return len(result.get("products") or []) >= min_products
+    
+    
+    @staticmethod
+    def _race_result(
+        winner: Optional[str],
+        engines: List[str],
+        results: Dict[str, Dict],
+        started: float,
+        cancelled: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        race 결과 정리
+        
+        기준을 통과한 엔진이 없으면 오류가 아닌 결과 중 상품이 가장 많은 결과,
+        그것도 없으면 마지막 오류를 반환합니다.
+        
+        Args:
+            winner: 기준을 통과한 엔진 (없으면 None)
+            engines: 실행한 엔진 목록
+            results: 끝난 엔진별 결과
+            started: 시작 시각 (time.monotonic)
+            cancelled: 실제로 취소된 엔진 (None이면 끝나지 않은 엔진 전부 - 비동기 경로),
+                끝나지도 취소되지도 않은 엔진은 "abandoned" (계속 실행되고 결과만 버려짐)
+        """
+        if winner is None:
+            usable = [engine for engine, result in results.items() if "error" not in result]
+            if usable:
+                winner = max(usable, key=lambda engine: len(results[engine].get("products") or []))
+            elif results:
+                winner = list(results)[-1]
+        
+        if winner is None:
+            result = {
+                "error": "제한 시간 안에 결과를 낸 엔진이 없습니다.",
+                "message": "잠시 후 다시 시도하세요."
+            }
+        else:
+            # 캐시에 저장된 결과를 수정하지 않도록 복사
+            result = dict(results[winner])
+        
+        unfinished = [engine for engine in engines if engine not in results]
+        if cancelled is None:
+            cancelled = unfinished
+        
+        result["race"] = {
+            "engines": engines,
+            "winner": winner,
+            "finished": list(results),
+            "cancelled": cancelled,
+            "abandoned": [engine for engine in unfinished if engine not in cancelled],
+            "elapsed": round(time.monotonic() - started, 3),
+        }
+        return result
+    
+    
+    def _run_cascade(
+        self,
+        image_data: bytes,
+        image_path: Optional[str] = None,
+        image_digest: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        cascade 모드 - 싼 엔진(로컬 PP-OCRv5)부터 실행하고, 결과의 인식 신뢰도와 파싱 완성도가
+        기준에 못 미칠 때만 다음 엔진(naver_clova → gpt4_vision)으로 넘어감
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            image_digest: 미리 계산한 원본 바이트 SHA-256 (선택)
+            deadline: 호출자의 제한 시간 (지나면 더 넘어가지 않음)
+            
+        Returns:
+            채택된 결과 ("cascade" 항목에 단계별 판단 기록)
+        """
+        engines = get_cascade_engines()
+        started = time.monotonic()
+        results = {}
+        steps = []
+        
+        for engine in engines:
+            if deadline is not None and deadline.expired():
+                break
+            
+            result = self._process_bytes(
+                image_data, engine, image_path,
+                image_digest=image_digest, timeout=None if deadline is None else deadline.remaining()
+            )
+            results[engine] = result
+            step = self._cascade_step(engine, result)
+            steps.append(step)
+            if step["accepted"]:
+                return self._cascade_result(engine, engines, results, steps, started)
+        
+        return self._cascade_result(None, engines, results, steps, started)
+    
+    
+    async def _run_cascade_async(
+        self,
+        image_data: bytes,
+        image_path: Optional[str] = None,
+        image_digest: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """cascade 모드 (비동기)"""
+        engines = get_cascade_engines()
+        started = time.monotonic()
+        results = {}
+        steps = []
+        
+        for engine in engines:
+            if deadline is not None and deadline.expired():
+                break
+            
+            result = await self.process_image_bytes_async(
+                image_data, engine, image_path, image_digest,
+                timeout=None if deadline is None else deadline.remaining()
+            )
+            results[engine] = result
+            step = self._cascade_step(engine, result)
+            steps.append(step)
+            if step["accepted"]:
+                return self._cascade_result(engine, engines, results, steps, started)
+        
+        return self._cascade_result(None, engines, results, steps, started)
+    
+    
+    def _cascade_step(self, engine: str, result: Dict) -> Dict:
+        """
+        cascade 단계 판단 - 이 엔진 결과로 끝낼지 다음 엔진으로 넘어갈지
+        
+        상품 수(OCR_MIN_PRODUCTS), 상품별 최저 인식 신뢰도, 파싱 완성도를 모두 만족해야 채택합니다.
+        신뢰도를 주지 않는 엔진(GPT-4 Vision 등)은 신뢰도 조건을 건너뜁니다.
+        
+        Returns:
+            {"engine", "accepted", "products", "confidence", "completeness", "reason"}
+        """
+        min_confidence, min_completeness = get_cascade_thresholds()
+        products = result.get("products") or []
+        scores = [product.get("confidence") for product in products if product.get("confidence") is not None]
+        confidence = min(scores) if scores else None
+        completeness = self._parse_completeness(result)
+        
+        reason = None
+        if "error" in result:
+            reason = result["error"]
+        elif not self._is_acceptable(result):
+            reason = f"상품 {len(products)}개 (기준 {get_min_products()}개)"
+        elif confidence is not None and confidence < min_confidence:
+            reason = f"신뢰도 {confidence:.2f} < {min_confidence:.2f}"
+        elif result.get("text_lines") is not None and completeness < min_completeness:
+            # 줄 단위 결과를 주는 엔진만 완성도 확인 (GPT-4 Vision은 직접 상품 목록을 반환)
+            reason = f"파싱 완성도 {completeness:.2f} < {min_completeness:.2f}"
+        
+        return {
+            "engine": engine,
+            "accepted": reason is None,
+            "products": len(products),
+            "confidence": None if confidence is None else round(confidence, 4),
+            "completeness": round(completeness, 3),
+            "reason": reason,
+        }
+    
+    
+    @staticmethod
+    def _cascade_result(
+        used: Optional[str],
+        engines: List[str],
+        results: Dict[str, Dict],
+        steps: List[Dict],
+        started: float
+    ) -> Dict:
+        """
+        cascade 결과 정리
+        
+        기준을 통과한 엔진이 없으면 오류가 아닌 결과 중 상품이 가장 많은 결과
+        (같으면 나중에 실행한 더 비싼 엔진), 그것도 없으면 마지막 결과를 반환합니다.
+        """
+        if used is None:
+            usable = [engine for engine, result in results.items() if "error" not in result]
+            if usable:
+                used = max(reversed(usable), key=lambda engine: len(results[engine].get("products") or []))
+            elif results:
+                used = list(results)[-1]
+        
+        if used is None:
+            result = {
+                "error": "제한 시간 안에 실행한 엔진이 없습니다.",
+                "message": "잠시 후 다시 시도하세요."
+            }
+        else:
+            # 캐시에 저장된 결과를 수정하지 않도록 복사
+            result = dict(results[used])
+        
+        result["cascade"] = {
+            "engines": engines,
+            "used": used,
+            "steps": steps,
+            "elapsed": round(time.monotonic() - started, 3),
+        }
+        return result
+    
+    
+    def _check_dependencies(self, method: str) -> Optional[Dict]:
+        """
+        엔진 의존 라이브러리 확인 후 import (엔진을 처음 쓸 때 한 번만, 이후에는 조회만)
+        
+        Returns:
+            문제가 없으면 None, 라이브러리가 없으면 오류 결과
+        """
+        missing = missing_dependencies(method)
+        if missing:
+            return {
+                "error": f"{method} 엔진에 필요한 라이브러리가 설치되지 않았습니다: {', '.join(missing)}",
+                "message": f"설치 방법: {get_engine(method).install_hint}"
+            }
+        
+        try:
+            load_engine(method)
+        except ImportError as e:
+            return {
+                "error": str(e),
+                "message": f"설치 방법: {get_engine(method).install_hint}"
+            }
+        return None
+    
+    
+    def _rate_limit_key(self, method: str) -> Optional[str]:
+        """속도 제한을 따로 적용할 API 키 (키마다 제공사 한도가 별도)"""
+        if method == "gpt4_vision":
+            return self.api_key
+        if method == "naver_clova":
+            return getattr(self, "naver_secret", None)
+        if method == "google_vision":
+            return getattr(self, "credentials_path", None)
+        return None
+    
+    
+    @staticmethod
+    def _admission_wait(deadline: Optional[Deadline]) -> Optional[float]:
+        """속도 제한 최대 대기 시간 (제한 시간이 있으면 남은 시간 이내)"""
+        return None if deadline is None else deadline.cap(get_max_wait())
+    
+    
+    def _rate_limited_result(self, method: str, error: RateLimitExceeded) -> Dict:
+        """속도 제한/월간 한도 초과 결과"""
+        result = {
+            "error": str(error),
+            "message": f"{method} 요청 한도를 초과했습니다.",
+            "rate_limited": True,
+        }
+        if error.retry_after is not None:
+            result["retry_after"] = error.retry_after
+        return result
+    
+    
+    def _engine_busy_result(self, method: str) -> Dict:
+        """
+        엔진 동시 실행 자리를 제한 시간 안에 얻지 못한 결과
+        (엔진 장애가 아니므로 속도 제한 초과와 같이 처리 - 회로 차단기에 기록하지 않음)
+        """
+        return self._rate_limited_result(
+            method, RateLimitExceeded(f"{method} 엔진이 바빠 제한 시간 안에 처리를 시작하지 못했습니다.")
+        )
+    
+    
+    def _engine_version(self, method: str) -> str:
+        """캐시/합치기 키에 넣을 엔진 버전 (PP-OCRv5는 사용할 언어 모델 포함)"""
+        version = ENGINE_VERSIONS.get(method, "")
+        if method == "pp_ocrv5":
+            version += ":korean" if self.settings.pp_ocrv5_use_korean else ":ch"
+        return version
+    
+    
+    def _make_flight_key(self, method: str, image_digest: str) -> str:
+        """동일 요청 판별 키 (이미지 해시 + 방법 + 엔진 버전)"""
+        return OCRResultCache.make_key_from_digest(image_digest, method, self._engine_version(method))
+    
+    
+    def _mark_coalesced(self, result: Dict, image_path: Optional[str] = None) -> Dict:
+        """
+        진행 중이던 다른 요청의 결과를 받은 경우 표시
+        
+        Args:
+            result: 공유받은 결과 (복사본)
+            image_path: 현재 요청의 이미지 경로
+            
+        Returns:
+            합치기 표시가 추가된 결과
+        """
+        metadata = result.setdefault("metadata", {})
+        metadata["coalesced"] = True
+        if image_path is not None:
+            metadata["image_path"] = image_path
+        return result
+    
+    
+    def _make_cache_key(self, image_data: bytes, method: str, image_digest: Optional[str] = None) -> str:
+        """캐시 키 생성 (업로드 스풀에서 계산한 해시가 있으면 재사용)"""
+        if image_digest:
+            return self.cache.make_key_from_digest(image_digest, method, self._engine_version(method))
+        return self.cache.make_key(image_data, method, self._engine_version(method))
+    
+    
+    def _prepare_upload(self, image_data: bytes) -> Tuple[bytes, Optional[Dict]]:
+        """
+        원격 API 업로드 전 이미지 최적화 (실패 시 원본 그대로 사용)
+        
+        Args:
+            image_data: 원본 이미지 바이트
+            
+        Returns:
+            (업로드할 바이트, 처리 정보 또는 None)
+        """
+        try:
+            return prepare_for_upload(image_data)
+        except Exception as e:
+            print(f"⚠️ 업로드 이미지 최적화 실패 (원본 사용): {e}")
+            return image_data, None
+    
+    
+    def _attach_upload_info(self, result: Dict, upload_info: Optional[Dict]):
+        """최적화가 적용된 경우 결과 메타데이터에 업로드 정보 기록"""
+        if upload_info and upload_info.get("optimized") and isinstance(result.get("metadata"), dict):
+            result["metadata"]["upload"] = upload_info
+    
+    
+    def _run_engine(
+        self,
+        image_data: bytes,
+        method: str,
+        image_path: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        엔진 실행 (엔진별 동시 실행 수 제한 적용)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            method: OCR 방법
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            deadline: 호출자의 제한 시간 (Naver Clova 재시도/헤지에 적용)
+            
+        Returns:
+            인식된 상품 정보
+        """
+        # 자리가 날 때까지 기다리되 호출자의 제한 시간을 넘기지 않음
+        semaphore = _get_engine_semaphore(method)
+        if not semaphore.acquire(timeout=None if deadline is None else deadline.remaining()):
+            return self._engine_busy_result(method)
+        
+        try:
+            if method == "gpt4_vision":
+                return self.process_with_gpt4_vision_bytes(image_data, image_path=image_path)
+            elif method == "google_vision":
+                return self.process_with_google_vision_bytes(image_data, image_path=image_path)
+            elif method == "naver_clova":
+                return self.process_with_naver_clova_bytes(image_data, image_path=image_path, deadline=deadline)
+            else:
+                return self.process_with_pp_ocrv5_bytes(image_data, image_path=image_path)
+        finally:
+            semaphore.release()
+    
+    
+    async def process_image_async(self, image_path: str) -> Dict:
+        """
+        이미지 처리 메인 함수 (비동기)
+        원격 엔진은 비동기 클라이언트로, 로컬 엔진은 스레드 풀에서 실행하므로
+        이벤트 루프 하나로 많은 요청을 동시에 처리할 수 있음
+        
+        Args:
+            image_path: 이미지 파일 경로
+            
+        Returns:
+            인식된 상품 정보 (JSON 형태)
+        """
+        if not os.path.exists(image_path):
+            return {
+                "error": "파일을 찾을 수 없습니다.",
+                "image_path": image_path
+            }
+        
+        try:
+            image_data = await asyncio.to_thread(self._read_image_bytes, image_path)
+        except Exception as e:
+            return {
+                "error": f"이미지를 읽을 수 없습니다: {str(e)}",
+                "image_path": image_path
+            }
+        
+        return await self.process_image_bytes_async(image_data, image_path=image_path)
+    
+    
+    async def process_image_bytes_async(
+        self,
+        image_data: bytes,
+        method: Optional[str] = None,
+        image_path: Optional[str] = None,
+        image_digest: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        이미지 바이트 처리 메인 함수 (비동기)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            method: OCR 방법 (None이면 초기화 시 설정한 방법)
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            image_digest: 업로드 중 미리 계산한 SHA-256 (선택)
+            timeout: 전체 제한 시간 (초, 속도 제한 대기/재시도 포함 - None이면 엔진 기본값)
+            
+        Returns:
+            인식된 상품 정보 (JSON 형태)
+        """
+        method = method or self.method
+        deadline = Deadline(timeout) if timeout is not None else None
+        
+        if method not in SUPPORTED_METHODS and method not in COMPOSITE_METHODS:
+            return {
+                "error": f"지원하지 않는 OCR 방법: {method}",
+                "supported_methods": SUPPORTED_METHODS + COMPOSITE_METHODS
+            }
+        
+        if not image_data:
+            return {
+                "error": "이미지 데이터가 비어 있습니다.",
+                "image_path": image_path
+            }
+        
+        # 같은 이미지 + 방법의 진행 중인 요청과 합침 (해시는 이벤트 루프 밖에서)
+        if singleflight_enabled():
+            if not image_digest:
+                image_digest = await asyncio.to_thread(lambda: hashlib.sha256(image_data).hexdigest())
+            try:
+                result, shared = await inflight.do_async(
+                    self._make_flight_key(method, image_digest),
+                    lambda: self._process_uncoalesced_async(image_data, method, image_path, image_digest, deadline),
+                    None if deadline is None else deadline.remaining()
+                )
+            except TimeoutError as e:
+                return {"error": str(e), "message": "잠시 후 다시 시도하세요."}
+            return self._mark_coalesced(result, image_path) if shared else result
+        
+        return await self._process_uncoalesced_async(image_data, method, image_path, image_digest, deadline)
+    
+    
+    async def _process_uncoalesced_async(
+        self,
+        image_data: bytes,
+        method: str,
+        image_path: Optional[str] = None,
+        image_digest: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """_process_uncoalesced의 비동기 버전"""
+        if method == "race":
+            return await self._run_race_async(image_data, image_path, image_digest, deadline)
+        if method == "cascade":
+            return await self._run_cascade_async(image_data, image_path, image_digest, deadline)
+        
+        # 캐시 조회 (해시 계산/디스크 조회는 이벤트 루프 밖에서)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = await asyncio.to_thread(self._make_cache_key, image_data, method, image_digest)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return self._mark_cache_hit(cached, image_path)
+        
+        if self.circuit_breaker:
+            result = await self._run_with_failover_async(image_data, method, image_path, deadline)
+        else:
+            result = await self._run_method_async(image_data, method, image_path, deadline)
+        
+        # 성공한 결과만 캐시에 저장
+        if cache_key is not None and "error" not in result and "failover" not in result:
+            await asyncio.to_thread(self.cache.set, cache_key, result)
+        
+        return result
+    
+    
+    async def _run_method_async(
+        self,
+        image_data: bytes,
+        method: str,
+        image_path: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """_run_method의 비동기 버전"""
+        try:
+            self._configure_method(method)
+        except ValueError as e:
+            return {
+                "error": str(e),
+                "message": f"{method} 설정을 확인하세요."
+            }
+        
+        # 첫 사용 시 SDK import가 이벤트 루프를 막지 않도록 스레드에서
+        missing = await asyncio.to_thread(self._check_dependencies, method)
+        if missing is not None:
+            return missing
+        
+        try:
+            await admit_async(method, self._rate_limit_key(method), self._admission_wait(deadline))
+        except RateLimitExceeded as e:
+            return self._rate_limited_result(method, e)
+        
+        upload_info = None
+        if method in REMOTE_METHODS and self.optimize_upload:
+            image_data, upload_info = await asyncio.to_thread(self._prepare_upload, image_data)
+        
+        result = await self._run_engine_async(image_data, method, image_path, deadline)
+        self._attach_upload_info(result, upload_info)
+        
+        return result
+    
+    
+    async def _run_with_failover_async(
+        self,
+        image_data: bytes,
+        method: str,
+        image_path: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """_run_with_failover의 비동기 버전"""
+        failover = {"requested": method, "skipped": [], "errors": {}}
+        result = None
+        
+        for candidate in self._failover_candidates(method):
+            if deadline is not None and deadline.expired():
+                break
+            
+            breaker = get_circuit_breaker(candidate)
+            if not breaker.allow():
+                failover["skipped"].append(candidate)
+                continue
+            
+            started = time.monotonic()
+            try:
+                result = await self._run_method_async(image_data, candidate, image_path, deadline)
+            except BaseException:
+                # 취소/예외도 결과를 알 수 없으므로 기록 없이 시험 요청 자리만 반납
+                breaker.release()
+                raise
+            if self._record_breaker(breaker, result, time.monotonic() - started):
+                return self._finish_failover(result, candidate, failover)
+            failover["errors"][candidate] = result.get("error")
+        
+        return self._failover_error(method, result, failover)
+    
+    
+    async def _run_engine_async(
+        self,
+        image_data: bytes,
+        method: str,
+        image_path: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> Dict:
+        """
+        비동기 엔진 실행 (엔진별 동시 실행 수 제한 적용)
+        
+        Args:
+            image_data: 이미지 바이트 데이터
+            method: OCR 방법
+            image_path: 결과 메타데이터에 기록할 원본 경로 (선택)
+            deadline: 호출자의 제한 시간 (Naver Clova 재시도/헤지에 적용)
+            
+        Returns:
+            인식된 상품 정보
+        """
+        if method in LOCAL_METHODS:
+            # 로컬 모델은 블로킹 - 엔진별 스레드 풀로 넘김 (동시 실행 수는 _run_engine에서 제한)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                _get_local_engine_executor(method), self._run_engine, image_data, method, image_path, deadline
+            )
+        
+        semaphore = _get_async_engine_semaphore(method)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), None if deadline is None else deadline.remaining())
+        except asyncio.TimeoutError:
+            return self._engine_busy_result(method)
+        
+        try:
+            if method == "gpt4_vision":
+                return await self.process_with_gpt4_vision_async(image_data, image_path=image_path)
+            elif method == "google_vision":
+                return await self.process_with_google_vision_async(image_data, image_path=image_path)
+            else:
+                return await self.process_with_naver_clova_async(image_data, image_path=image_path, deadline=deadline)
+        finally:
+            semaphore.release()
+    
+    
+    def process_images(
+        self,
+        images: Iterable[Union[str, bytes]],
+        method: Optional[str] = None,
+        max_concurrency: int = 8,
+        ordered: bool = True
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        여러 이미지 동시 처리 (시장 조사 사진 일괄 처리용)
+        원격 엔진은 스레드 풀, 로컬 엔진(pp_ocrv5)은 공용 프로세스 풀(호출 간 재사용 - 모델은 워커마다 한 번만 로드)에서 실행
+        
+        Args:
+            images: 이미지 파일 경로 또는 이미지 바이트 목록
+            method: OCR 방법 (None이면 초기화 시 설정한 방법)
+            max_concurrency: 최대 동시 처리 수 (엔진별 제한과 함께 적용)
+            ordered: True면 입력 순서대로, False면 완료되는 순서대로 반환
+            
+        Yields:
+            (입력 순번, 인식 결과) 튜플
+        """
+        method = method or self.method
+        max_concurrency = max(1, max_concurrency)
+        
+        # 엔진 실행 방식 선택: 로컬 엔진은 공용 프로세스 풀, Clova는 (설정 시) 다중 이미지 배치
+        naver_batcher = None
+        runner = None
+        if method in LOCAL_METHODS:
+            def runner(image_data, method, image_path):
+                try:
+                    return _get_local_process_pool(method).submit(
+                        _run_engine_in_worker, method, image_data, image_path
+                    ).result()
+                except BrokenProcessPool:
+                    _reset_local_process_pool(method)
+                    raise
+        
+        elif method == "naver_clova" and get_naver_max_images_per_request() > 1:
+            try:
+                self._configure_method(method)
+                naver_batcher = NaverClovaBatcher(self, max_in_flight=get_engine_concurrency(method))
+            except ValueError:
+                naver_batcher = None  # 설정 오류는 항목별 결과로 반환됨
+            
+            if naver_batcher is not None:
+                def runner(image_data, method, image_path):
+                    return naver_batcher.submit(image_data, image_path).result()
+        
+        def process_one(item):
+            try:
+                if isinstance(item, (bytes, bytearray, memoryview)):
+                    return self._process_bytes(bytes(item), method, None, runner)
+                
+                image_path = str(item)
+                if not os.path.exists(image_path):
+                    return {
+                        "error": "파일을 찾을 수 없습니다.",
+                        "image_path": image_path
+                    }
+                image_data = self._read_image_bytes(image_path)
+                return self._process_bytes(image_data, method, image_path, runner)
+            except Exception as e:
+                return {
+                    "error": str(e),
+                    "message": "배치 처리 중 오류가 발생했습니다."
+                }
+        
+        # 입력을 한꺼번에 제출하지 않고 진행 중인 작업 수를 제한 (이미지 바이트/결과가 메모리에 쌓이지 않도록)
+        window = max_concurrency * 2
+        pool = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            if ordered:
+                pending = deque()
+                for index, item in enumerate(images):
+                    pending.append((index, pool.submit(process_one, item)))
+                    if len(pending) >= window:
+                        done_index, future = pending.popleft()
+                        yield done_index, future.result()
+                while pending:
+                    done_index, future = pending.popleft()
+                    yield done_index, future.result()
+            else:
+                futures = {}
+                for index, item in enumerate(images):
+                    futures[pool.submit(process_one, item)] = index
+                    if len(futures) >= window:
+                        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield futures.pop(future), future.result()
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+        finally:
+            # 중간에 반복을 멈추면 남은 작업은 취소
+            pool.shutdown(wait=True, cancel_futures=True)
+            if naver_batcher is not None:
+                naver_batcher.close()
+    
+    
+    def _mark_cache_hit(self, result: Dict, image_path: Optional[str] = None) -> Dict:
+        """
+        캐시에서 가져온 결과에 캐시 적중 정보 표시
+        
+        Args:
+            result: 캐시된 결과 (복사본)
+            image_path: 현재 요청의 이미지 경로
+            
+        Returns:
+            캐시 적중 표시가 추가된 결과
+        """
+        metadata = result.setdefault("metadata", {})
+        metadata["cache_hit"] = True
+        if image_path is not None:
+            metadata["image_path"] = image_path
+        return result
     
     
     def save_result(self, result: Dict, output_path: str = "result.json"):
@@ -759,7 +2531,7 @@ if __name__ == "__main__":
     parser.add_argument(
         "--method", "-m", 
         default="gpt4_vision",
-        choices=["gpt4_vision", "google_vision", "naver_clova", "pp_ocrv5"],
+        choices=SUPPORTED_METHODS,
         help="OCR 방법 선택 (gpt4_vision, google_vision, naver_clova, pp_ocrv5)"
     )
     parser.add_argument("--output", "-o", default="result.json", help="결과 저장 경로")
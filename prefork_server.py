@@ -0,0 +1,193 @@
+"""
+프리포크(pre-fork) 운영 서버
+마스터 프로세스에서 모델을 미리 로드한 뒤 워커 프로세스를 fork하여
+모델 메모리를 copy-on-write로 공유 (코어 수만큼 워커를 띄워도 메모리는 1배에 가깝게)
+
+gunicorn이 설치되어 있으면 gunicorn(preload_app + gthread 워커)으로 실행하고,
+없을 때만 내장 마스터 + Werkzeug 서버 워커로 실행합니다 (Werkzeug 서버는 개발용이므로 운영에서는 gunicorn 설치 권장).
+"""
+
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Optional
+
+
+def default_worker_count() -> int:
+    """기본 워커 수 (환경변수 OCR_WORKERS, 없으면 CPU 코어 수)"""
+    return max(1, int(os.getenv("OCR_WORKERS", os.cpu_count() or 1)))
+
+
+def default_worker_threads() -> int:
+    """워커당 요청 처리 스레드 수 (환경변수 OCR_WORKER_THREADS, 기본 8 - gunicorn gthread 워커)"""
+    return max(1, int(os.getenv("OCR_WORKER_THREADS", 8)))
+
+
+def _serve_gunicorn(app, host: str, port: int, workers: int, on_worker_start: Optional[Callable]) -> bool:
+    """
+    gunicorn으로 실행 (마스터에서 이미 로드한 앱을 preload_app으로 fork)
+
+    Returns:
+        gunicorn이 설치되어 있지 않으면 False (실행했으면 종료 시까지 반환하지 않음)
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        return False
+
+    def post_fork(server, worker):
+        # 스레드/네트워크 연결은 fork 후 워커마다 새로 시작해야 함
+        if on_worker_start is not None:
+            on_worker_start()
+
+    class _Application(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("threads", default_worker_threads())
+            self.cfg.set("preload_app", True)
+            # OCR 요청은 재시도/대기 포함 수십 초 걸릴 수 있음 (기본 30초면 워커가 강제 종료됨)
+            self.cfg.set("timeout", int(os.getenv("OCR_WORKER_TIMEOUT", 120)))
+            self.cfg.set("post_fork", post_fork)
+
+        def load(self):
+            return app
+
+    print(f"🧩 gunicorn 프리포크 서버: 워커 {workers}개 × 스레드 {default_worker_threads()}개, http://{host}:{port}")
+    _Application().run()
+    return True
+
+
+def _bind_socket(host: str, port: int, backlog: int = 128) -> socket.socket:
+    """마스터에서 리슨 소켓 생성 (모든 워커가 같은 소켓에서 accept)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, host: str, port: int, sock: socket.socket, on_worker_start: Optional[Callable]):
+    """
+    워커 프로세스 본체 - 공유 소켓으로 WSGI 서버 실행 (반환하지 않음)
+
+    gunicorn이 없는 환경용 대체 경로로, 의도적으로 Werkzeug 서버(스레드 모드)를 사용합니다.
+    (Flask에 포함되어 추가 설치가 필요 없음 - 요청마다 스레드를 만들고 연결 수 제한이 없으므로
+    운영 트래픽에는 gunicorn 설치 권장)
+    """
+    from werkzeug.serving import make_server
+
+    # 마스터의 시그널 핸들러 대신 기본 동작 사용
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    try:
+        # 스레드/네트워크 연결은 fork 후 워커마다 새로 시작해야 함
+        if on_worker_start is not None:
+            on_worker_start()
+
+        server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+        server.serve_forever()
+    except Exception as e:
+        print(f"❌ 워커 {os.getpid()} 오류: {e}")
+    finally:
+        os._exit(1)
+
+
+def serve_prefork(
+    app,
+    host: str = "0.0.0.0",
+    port: int = 8081,
+    workers: Optional[int] = None,
+    preload: Optional[Callable] = None,
+    on_worker_start: Optional[Callable] = None,
+):
+    """
+    프리포크 방식으로 WSGI 앱 실행
+
+    1. preload()로 모델/라이브러리를 마스터에서 로드
+    2. gc.freeze()로 로드된 객체를 GC 대상에서 제외 (GC가 페이지를 건드려 복사되는 것 방지)
+    3. gunicorn이 있으면 gunicorn에 맡기고, 없으면 리슨 소켓을 만들고 Werkzeug 서버 워커를 fork,
+       죽은 워커는 다시 띄움
+
+    fork를 지원하지 않는 OS(Windows)에서는 단일 프로세스 멀티스레드 서버로 실행합니다.
+
+    Args:
+        app: WSGI 앱 (Flask 등)
+        host: 바인드 주소
+        port: 포트
+        workers: 워커 프로세스 수 (None이면 default_worker_count())
+        preload: fork 전에 마스터에서 실행할 함수 (모델 로드만 - 추론/스레드 시작은 on_worker_start에서)
+        on_worker_start: fork 후 각 워커에서 실행할 함수 (스레드/연결 시작)
+    """
+    workers = workers or default_worker_count()
+
+    if preload is not None:
+        preload()
+
+    if not hasattr(os, "fork"):
+        print("⚠️ 이 OS는 fork를 지원하지 않아 단일 프로세스로 실행합니다.")
+        if on_worker_start is not None:
+            on_worker_start()
+        app.run(host=host, port=port, debug=False, threaded=True)
+        return
+
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+    if _serve_gunicorn(app, host, port, workers, on_worker_start):
+        return
+
+    print("⚠️ gunicorn이 설치되어 있지 않아 Werkzeug 서버 워커로 실행합니다 (운영 환경은 pip install gunicorn 권장).")
+    sock = _bind_socket(host, port)
+    children = {}
+    shutting_down = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(app, host, port, sock, on_worker_start)
+        children[pid] = time.time()
+
+    def shutdown(signum, frame):
+        nonlocal shutting_down
+        shutting_down = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"🧩 프리포크 서버: 마스터 {os.getpid()}, 워커 {workers}개, http://{host}:{port}")
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        started = children.pop(pid, None)
+        if shutting_down or started is None:
+            continue
+
+        print(f"⚠️ 워커 {pid} 종료 (상태 {status}) - 다시 시작합니다.")
+        # 시작 직후 계속 죽는 워커는 잠시 쉬었다가 재시작 (재시작 폭주 방지)
+        if time.time() - started < 1:
+            time.sleep(1)
+        spawn()
+
+    sock.close()
+    sys.exit(0)
@@ -0,0 +1,390 @@
+"""
+엔진별 요청 속도 제한 + 월간 사용량 관리
+순간적으로 몰린 요청은 제한 속도에 맞춰 잠시 대기시키고(최대 대기 시간 제한),
+월간 무료 사용량(Naver Clova 등)은 로컬 파일에 기록하여 초과 전에 차단
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+
+class RateLimitExceeded(Exception):
+    """최대 대기 시간 안에 처리할 수 없거나 월간 사용량을 모두 쓴 경우"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    토큰 버킷 (스레드 안전)
+
+    토큰을 미리 예약하는 방식이라 대기 중인 요청은 도착 순서대로 일정한 간격으로 처리됩니다.
+    (잔량이 음수 = 앞에서 예약한 요청 수, 대기 시간이 max_wait를 넘으면 예약하지 않고 거절)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        초기화 함수
+
+        Args:
+            rate: 초당 토큰 보충량 (지속 가능한 초당 요청 수)
+            capacity: 최대 토큰 수 (순간적으로 허용할 요청 수)
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.rejected = 0
+
+    def _refill(self, now: float):
+        """경과 시간만큼 토큰 보충"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait: float) -> float:
+        """
+        토큰 1개 예약
+
+        Args:
+            max_wait: 허용할 최대 대기 시간 (초)
+
+        Returns:
+            예약한 토큰을 쓸 수 있을 때까지 기다려야 하는 시간 (초)
+
+        Raises:
+            RateLimitExceeded: max_wait 안에 토큰을 받을 수 없는 경우
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > max_wait:
+                self.rejected += 1
+                raise RateLimitExceeded("요청이 너무 많습니다. 잠시 후 다시 시도하세요.", retry_after=round(wait, 1))
+            self._tokens -= 1
+            self.admitted += 1
+            return wait
+
+    def acquire(self, max_wait: float):
+        """토큰 1개 사용 (필요하면 최대 max_wait초까지 대기)"""
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, max_wait: float):
+        """토큰 1개 사용 (비동기 대기)"""
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def snapshot(self) -> Dict:
+        """현재 상태 (상태 확인용)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate_per_minute": round(self.rate * 60, 2),
+                "burst": self.capacity,
+                "available": round(self._tokens, 2),
+                "queued": max(0, int(-self._tokens + 0.999)),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
+
+
+class MonthlyQuota:
+    """
+    월간 사용량 기록 (로컬 JSON 파일, 달이 바뀌면 자동 초기화)
+
+    여러 워커 프로세스가 같은 파일을 쓰므로 POSIX에서는 파일 잠금을 사용합니다.
+    한도가 없는(기록만 하는) 엔진은 메모리에 모아 flush_interval마다 한 번에 기록하고,
+    한도가 있는 엔진만 요청마다 파일에서 확인 + 차감합니다.
+    실제 청구 기준과 약간 다를 수 있는 로컬 추정치입니다.
+    """
+
+    def __init__(self, path: str = ".ocr_quota.json", flush_interval: float = 60.0):
+        """
+        초기화 함수
+
+        Args:
+            path: 사용량 기록 파일 경로
+            flush_interval: 메모리에 모은 사용량을 파일에 기록하는 간격 (초)
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = {}  # 아직 파일에 기록하지 않은 사용량 (엔진 → 건수)
+        self._pending_month = self._current_month()
+        self._flushed = time.monotonic()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _current_month() -> str:
+        return datetime.now().strftime("%Y-%m")
+
+    @staticmethod
+    def _lock_file(f, exclusive: bool):
+        """파일 잠금 (fcntl이 없는 환경에서는 생략)"""
+        try:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        except ImportError:
+            pass
+
+    def _load(self, f) -> Dict:
+        """기록 파일 내용 (이번 달이 아니면 빈 기록)"""
+        f.seek(0)
+        try:
+            data = json.loads(f.read() or "{}")
+        except ValueError:
+            data = {}
+        if data.get("month") != self._current_month():
+            data = {"month": self._current_month(), "counts": {}}
+        return data
+
+    def _take_pending(self) -> Dict[str, int]:
+        """메모리에 모은 사용량을 꺼냄 (지난달 것은 버림, self._lock 안에서 호출)"""
+        pending = self._pending if self._pending_month == self._current_month() else {}
+        self._pending = {}
+        self._pending_month = self._current_month()
+        self._flushed = time.monotonic()
+        return pending
+
+    def _update(self, engine: Optional[str], limit: int, amount: int) -> Tuple[int, bool]:
+        """
+        모아 둔 사용량 기록 + (한도 안이면) 증가 (self._lock 안에서 호출)
+
+        Returns:
+            (변경 후 사용량, 증가 여부)
+        """
+        with open(self.path, "a+", encoding="utf-8") as f:
+            self._lock_file(f, exclusive=True)
+            data = self._load(f)
+
+            counts = data["counts"]
+            for name, count in self._take_pending().items():
+                counts[name] = max(0, counts.get(name, 0) + count)
+
+            used = counts.get(engine, 0) if engine else 0
+            consumed = bool(engine) and amount > 0 and not (limit > 0 and used + amount > limit)
+            if consumed:
+                used += amount
+                counts[engine] = used
+
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(data, ensure_ascii=False))
+            return used, consumed
+
+    def consume(self, engine: str, limit: int, amount: int = 1):
+        """
+        사용량 증가
+
+        Args:
+            engine: 엔진 이름
+            limit: 월간 한도 (0이면 기록만 - 파일에는 flush_interval마다 기록)
+            amount: 사용량
+
+        Raises:
+            RateLimitExceeded: 월간 한도를 넘는 경우
+        """
+        with self._lock:
+            if limit <= 0:
+                self._pending[engine] = self._pending.get(engine, 0) + amount
+                if time.monotonic() - self._flushed >= self.flush_interval:
+                    self._update(None, 0, 0)
+                return
+
+            _, consumed = self._update(engine, limit, amount)
+        if not consumed:
+            raise RateLimitExceeded(f"{engine} 이번 달 사용량 한도({limit}건)를 모두 사용했습니다.")
+
+    def refund(self, engine: str, amount: int = 1):
+        """차감했지만 보내지 않은 요청의 사용량 되돌리기 (다음 기록 때 파일에 반영)"""
+        with self._lock:
+            self._pending[engine] = self._pending.get(engine, 0) - amount
+
+    def flush(self):
+        """메모리에 모은 사용량을 파일에 기록"""
+        with self._lock:
+            if any(self._pending.values()):
+                self._update(None, 0, 0)
+
+    def used(self, engine: str) -> int:
+        """이번 달 사용량 (파일은 읽기만 - 없으면 만들지 않음)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._lock_file(f, exclusive=False)
+                used = self._load(f)["counts"].get(engine, 0)
+        except FileNotFoundError:
+            used = 0
+
+        with self._lock:
+            if self._pending_month == self._current_month():
+                used += self._pending.get(engine, 0)
+        return max(0, used)
+
+
+def _env_name(method: str) -> str:
+    return method.upper()
+
+
+def get_rate_limit(method: str) -> Optional[Tuple[float, float]]:
+    """
+    엔진별 속도 제한 설정
+
+    환경변수:
+        OCR_RATE_LIMIT_<METHOD>_RPM: 분당 요청 수 (없거나 0이면 제한 없음)
+        OCR_RATE_LIMIT_<METHOD>_BURST: 순간 허용 요청 수 (기본: 분당 요청 수의 1/10, 최소 1)
+
+    Returns:
+        (초당 요청 수, 버킷 크기) 또는 제한 없음이면 None
+    """
+    rpm = float(os.getenv(f"OCR_RATE_LIMIT_{_env_name(method)}_RPM", 0) or 0)
+    if rpm <= 0:
+        return None
+    burst = float(os.getenv(f"OCR_RATE_LIMIT_{_env_name(method)}_BURST", 0) or 0) or max(1.0, rpm / 10)
+    return rpm / 60, burst
+
+
+def get_monthly_limit(method: str) -> int:
+    """엔진별 월간 한도 (환경변수 OCR_MONTHLY_QUOTA_<METHOD>, 0이면 기록만)"""
+    return int(os.getenv(f"OCR_MONTHLY_QUOTA_{_env_name(method)}", 0) or 0)
+
+
+def get_max_wait() -> float:
+    """속도 제한 최대 대기 시간 (환경변수 OCR_RATE_LIMIT_MAX_WAIT, 기본 30초)"""
+    return float(os.getenv("OCR_RATE_LIMIT_MAX_WAIT", 30))
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+_quota = None
+
+
+def _key_id(api_key: Optional[str]) -> str:
+    """API 키 식별자 (키 원문은 보관/노출하지 않음)"""
+    if not api_key:
+        return "default"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+def get_bucket(method: str, api_key: Optional[str] = None) -> Optional[TokenBucket]:
+    """
+    엔진 + API 키별 토큰 버킷 (제한이 없으면 None)
+
+    Args:
+        method: OCR 방법
+        api_key: 요청에 쓰는 API 키 (키마다 한도가 따로 적용됨)
+    """
+    limit = get_rate_limit(method)
+    if limit is None:
+        return None
+
+    key = (method, _key_id(api_key))
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(*limit)
+            _buckets[key] = bucket
+        return bucket
+
+
+def get_quota() -> MonthlyQuota:
+    """
+    프로세스 공용 월간 사용량 기록
+
+    환경변수:
+        OCR_QUOTA_FILE: 기록 파일 경로 (기본 .ocr_quota.json)
+        OCR_QUOTA_FLUSH_SECONDS: 한도 없는 엔진 사용량을 파일에 기록하는 간격 (기본 60초)
+    """
+    global _quota
+
+    with _buckets_lock:
+        if _quota is None:
+            _quota = MonthlyQuota(
+                os.getenv("OCR_QUOTA_FILE", ".ocr_quota.json"),
+                float(os.getenv("OCR_QUOTA_FLUSH_SECONDS", 60)),
+            )
+        return _quota
+
+
+def _uses_quota(method: str) -> bool:
+    """월간 사용량을 기록할 엔진 (유료 원격 엔진 - 한도가 0이면 기록만, 0보다 크면 한도도 적용)"""
+    from engine_registry import engines_of_kind
+
+    return method in engines_of_kind("remote")
+
+
+def admit(method: str, api_key: Optional[str] = None, max_wait: Optional[float] = None):
+    """
+    요청 허가 - 월간 사용량 차감 후 속도 제한 대기
+    (월간 한도로 거절된 요청은 토큰을 쓰지 않고, 속도 제한으로 거절되면 차감한 사용량을 되돌림)
+
+    Raises:
+        RateLimitExceeded: 대기 한도 초과 또는 월간 한도 소진
+    """
+    quota = get_quota() if _uses_quota(method) else None
+    if quota is not None:
+        quota.consume(method, get_monthly_limit(method))
+
+    bucket = get_bucket(method, api_key)
+    if bucket is not None:
+        try:
+            bucket.acquire(get_max_wait() if max_wait is None else max_wait)
+        except RateLimitExceeded:
+            if quota is not None:
+                quota.refund(method)
+            raise
+
+
+async def admit_async(method: str, api_key: Optional[str] = None, max_wait: Optional[float] = None):
+    """요청 허가 (비동기 대기, 한도가 있는 엔진의 사용량 파일 기록은 스레드에서)"""
+    quota = get_quota() if _uses_quota(method) else None
+    if quota is not None:
+        limit = get_monthly_limit(method)
+        if limit > 0:
+            await asyncio.to_thread(quota.consume, method, limit)
+        else:
+            quota.consume(method, limit)
+
+    bucket = get_bucket(method, api_key)
+    if bucket is not None:
+        try:
+            await bucket.acquire_async(get_max_wait() if max_wait is None else max_wait)
+        except RateLimitExceeded:
+            if quota is not None:
+                quota.refund(method)
+            raise
+
+
+def rate_limit_status() -> Dict:
+    """
+    속도 제한/월간 사용량 상태 (상태 확인 엔드포인트용)
+
+    Returns:
+        {"buckets": {"방법|키": 상태}, "monthly": {방법: {"used", "limit"}}} (limit 0 = 기록만)
+    """
+    with _buckets_lock:
+        buckets = {f"{method}|{key_id}": bucket for (method, key_id), bucket in _buckets.items()}
+
+    from engine_registry import engines_of_kind
+
+    monthly = {}
+    for method in engines_of_kind("remote"):
+        monthly[method] = {"used": get_quota().used(method), "limit": get_monthly_limit(method)}
+
+    return {
+        "buckets": {name: bucket.snapshot() for name, bucket in buckets.items()},
+        "monthly": monthly,
+    }
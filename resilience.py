@@ -0,0 +1,675 @@
+"""
+원격 OCR 요청 안정화 (제한 시간, 재시도, 헤지 요청, 회로 차단기)
+일시적 오류는 지터를 넣은 지수 백오프로 재시도하고, 응답이 학습된 p90 시간보다 늦으면
+같은 요청을 한 번 더 보내 먼저 도착한 응답을 사용 (전체 시간은 호출자의 제한 시간을 넘지 않음)
+장애가 이어지는 엔진은 회로 차단기로 바로 건너뛰고 대체 엔진으로 전환
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# 재시도할 HTTP 상태 코드 (요청 과다, 서버 일시 오류)
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# 요청 1회의 기본 타임아웃 (연결, 읽기) - 남은 제한 시간이 더 짧으면 그만큼으로 줄임
+DEFAULT_ATTEMPT_TIMEOUT = (10.0, 30.0)
+
+# 헤지 요청을 보내는 스레드 풀 크기 (동기 경로)
+HEDGE_MAX_WORKERS = 32
+
+# 동시에 진행 중일 수 있는 헤지 요청 수 (동기 경로 - 진 요청은 취소할 수 없어 타임아웃까지 계속되므로
+# 엔진 동시 실행 수 밖에서 도는 요청이 이 수를 넘지 않도록 제한, 넘으면 헤지하지 않음)
+MAX_INFLIGHT_HEDGES = HEDGE_MAX_WORKERS // 2
+
+
+class DeadlineExceeded(TimeoutError):
+    """호출자가 준 제한 시간 안에 응답을 받지 못한 경우"""
+
+
+class Deadline:
+    """
+    요청 전체 제한 시간
+
+    재시도/헤지/대기 시간이 모두 이 제한 시간 안에서만 이루어지도록 남은 시간을 계산합니다.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        """
+        초기화 함수
+
+        Args:
+            seconds: 제한 시간 (초, None이면 제한 없음)
+        """
+        self.seconds = seconds
+        self._expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        """남은 시간 (초, 제한 없음이면 None)"""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """제한 시간이 지났는지 여부"""
+        return self._expires_at is not None and time.monotonic() >= self._expires_at
+
+    def cap(self, seconds: float) -> float:
+        """seconds와 남은 시간 중 짧은 쪽"""
+        remaining = self.remaining()
+        return seconds if remaining is None else min(seconds, remaining)
+
+    def attempt_timeout(self, timeout: Tuple[float, float] = DEFAULT_ATTEMPT_TIMEOUT) -> Tuple[float, float]:
+        """
+        요청 1회에 쓸 (연결, 읽기) 타임아웃
+
+        Raises:
+            DeadlineExceeded: 남은 시간이 없는 경우
+        """
+        if self.expired():
+            raise DeadlineExceeded(self._message())
+        return self.cap(timeout[0]), self.cap(timeout[1])
+
+    def _message(self) -> str:
+        return f"제한 시간({self.seconds:g}초) 안에 응답을 받지 못했습니다."
+
+
+class LatencyTracker:
+    """
+    최근 성공한 요청의 응답 시간 기록 (헤지 시점 학습용, 스레드 안전)
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        초기화 함수
+
+        Args:
+            window: 기억할 최근 응답 수
+            min_samples: 분위수를 신뢰하기 위한 최소 응답 수
+        """
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, seconds: float):
+        """성공한 요청의 응답 시간 기록"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count(self, **counters: int):
+        """시도/재시도/헤지 횟수 증가 (예: count(hedges=1))"""
+        with self._lock:
+            for name, amount in counters.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """응답 시간 분위수 (표본이 부족하면 None)"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def snapshot(self) -> Dict:
+        """현재 상태 (상태 확인용)"""
+        p50, p90, p99 = self.quantile(0.5), self.quantile(0.9), self.quantile(0.99)
+        with self._lock:
+            return {
+                "samples": len(self._samples),
+                "p50": None if p50 is None else round(p50, 3),
+                "p90": None if p90 is None else round(p90, 3),
+                "p99": None if p99 is None else round(p99, 3),
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+            }
+
+
+class RetryPolicy:
+    """재시도/헤지 설정"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 4.0,
+        deadline: float = 45.0,
+        hedge: bool = False,
+        hedge_delay: float = 3.0,
+        hedge_quantile: float = 0.9,
+    ):
+        """
+        초기화 함수
+
+        Args:
+            max_attempts: 최대 시도 횟수 (첫 요청 포함)
+            backoff_base: 첫 재시도 전 최대 대기 시간 (초, 재시도마다 2배)
+            backoff_max: 재시도 대기 시간 상한 (초)
+            deadline: 호출자가 제한 시간을 주지 않았을 때의 전체 제한 시간 (초)
+            hedge: 느린 요청에 중복 요청(헤지)을 보낼지 여부
+            hedge_delay: 응답 시간 표본이 모이기 전 헤지 요청을 보낼 시점 (초)
+            hedge_quantile: 헤지 요청을 보낼 응답 시간 분위수 (기본 p90)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.hedge_quantile = hedge_quantile
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "RetryPolicy":
+        """
+        환경변수에서 설정 읽기
+
+        환경변수 (prefix가 NAVER_OCR인 경우):
+            NAVER_OCR_MAX_ATTEMPTS: 최대 시도 횟수 (기본 3)
+            NAVER_OCR_BACKOFF_BASE / NAVER_OCR_BACKOFF_MAX: 재시도 대기 시간 (기본 0.5초 / 4초)
+            NAVER_OCR_DEADLINE: 기본 전체 제한 시간 (기본 45초)
+            NAVER_OCR_HEDGE: "true"면 헤지 요청 사용 (기본 false - 요청이 최대 2배로 늘 수 있음)
+            NAVER_OCR_HEDGE_DELAY: 표본이 모이기 전 헤지 시점 (기본 3초)
+        """
+        return cls(
+            max_attempts=int(os.getenv(f"{prefix}_MAX_ATTEMPTS", 3)),
+            backoff_base=float(os.getenv(f"{prefix}_BACKOFF_BASE", 0.5)),
+            backoff_max=float(os.getenv(f"{prefix}_BACKOFF_MAX", 4)),
+            deadline=float(os.getenv(f"{prefix}_DEADLINE", 45)),
+            hedge=os.getenv(f"{prefix}_HEDGE", "False").lower() == "true",
+            hedge_delay=float(os.getenv(f"{prefix}_HEDGE_DELAY", 3)),
+        )
+
+    def backoff(self, retry: int) -> float:
+        """
+        재시도 전 대기 시간 (전체 지터 - 동시에 실패한 요청들이 한꺼번에 재시도하지 않도록)
+
+        Args:
+            retry: 재시도 번호 (0부터)
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** retry)))
+
+    def hedge_after(self, tracker: LatencyTracker) -> float:
+        """헤지 요청을 보낼 시점 (학습된 분위수, 표본이 부족하면 기본값)"""
+        learned = tracker.quantile(self.hedge_quantile)
+        return self.hedge_delay if learned is None else learned
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+_hedge_executor = None
+_hedge_slots = threading.BoundedSemaphore(MAX_INFLIGHT_HEDGES)
+
+
+def get_latency_tracker(name: str) -> LatencyTracker:
+    """엔진별 공용 응답 시간 기록"""
+    with _trackers_lock:
+        tracker = _trackers.get(name)
+        if tracker is None:
+            tracker = LatencyTracker()
+            _trackers[name] = tracker
+        return tracker
+
+
+def latency_status() -> Dict:
+    """엔진별 응답 시간/재시도/헤지 통계 (상태 확인 엔드포인트용)"""
+    with _trackers_lock:
+        trackers = dict(_trackers)
+    return {name: tracker.snapshot() for name, tracker in trackers.items()}
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    """헤지 요청용 공용 스레드 풀 (처음 사용할 때 생성)"""
+    global _hedge_executor
+
+    with _trackers_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="ocr-hedge")
+        return _hedge_executor
+
+
+def _timed_call(send: Callable, deadline: Deadline, tracker: LatencyTracker):
+    """요청 1회 (남은 시간으로 타임아웃 설정, 성공 시 응답 시간 기록)"""
+    timeout = deadline.attempt_timeout()
+    tracker.count(attempts=1)
+    started = time.monotonic()
+    response = send(timeout)
+    tracker.record(time.monotonic() - started)
+    return response
+
+
+def _hedged_call(send: Callable, deadline: Deadline, policy: RetryPolicy, tracker: LatencyTracker):
+    """
+    요청 1회 + 늦으면 헤지 요청 1회 (먼저 성공한 응답 반환)
+
+    스레드에서 보낸 요청은 중간에 취소할 수 없어, 진 요청은 응답이나 자체 타임아웃까지 백그라운드에서 계속됩니다.
+    (호출한 쪽의 엔진 세마포어는 이미 반납된 뒤이므로 헤지 요청 수는 MAX_INFLIGHT_HEDGES로 따로 제한)
+    """
+    executor = _get_hedge_executor()
+    futures = [executor.submit(_timed_call, send, deadline, tracker)]
+
+    done, _ = wait(futures, timeout=deadline.cap(policy.hedge_after(tracker)))
+    if not done and not deadline.expired() and _hedge_slots.acquire(blocking=False):
+        tracker.count(hedges=1)
+        hedge = executor.submit(_timed_call, send, deadline, tracker)
+        hedge.add_done_callback(lambda _: _hedge_slots.release())
+        futures.append(hedge)
+
+    # 먼저 성공한 응답 사용
+    error = None
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            try:
+                response = future.result()
+            except Exception as e:
+                error = e
+                continue
+            if future is not futures[0]:
+                tracker.count(hedge_wins=1)
+            return response
+
+    raise error or DeadlineExceeded(deadline._message())
+
+
+def call_with_retries(
+    send: Callable,
+    is_transient: Callable[[Exception], bool],
+    policy: RetryPolicy,
+    tracker: LatencyTracker,
+    deadline: Optional[Deadline] = None,
+):
+    """
+    재시도/헤지를 적용한 요청 (동기)
+
+    Args:
+        send: (연결, 읽기) 타임아웃을 받아 요청 1회를 보내는 함수 (실패 시 예외)
+        is_transient: 재시도할 오류인지 판별하는 함수
+        policy: 재시도/헤지 설정
+        tracker: 응답 시간 기록
+        deadline: 호출자의 제한 시간 (None이면 policy.deadline)
+
+    Returns:
+        send가 돌려준 응답
+
+    Raises:
+        DeadlineExceeded: 제한 시간 초과
+        Exception: 재시도할 수 없는 오류 또는 마지막 시도의 오류
+    """
+    deadline = deadline or Deadline(policy.deadline)
+
+    for attempt in range(policy.max_attempts):
+        try:
+            if policy.hedge:
+                return _hedged_call(send, deadline, policy, tracker)
+            return _timed_call(send, deadline, tracker)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            if not is_transient(e) or attempt + 1 >= policy.max_attempts:
+                raise
+            delay = policy.backoff(attempt)
+            remaining = deadline.remaining()
+            if remaining is not None and delay >= remaining:
+                raise
+            tracker.count(retries=1)
+            time.sleep(delay)
+
+
+async def _timed_call_async(send: Callable, deadline: Deadline, tracker: LatencyTracker):
+    """요청 1회 (비동기)"""
+    timeout = deadline.attempt_timeout()
+    tracker.count(attempts=1)
+    started = time.monotonic()
+    response = await send(timeout)
+    tracker.record(time.monotonic() - started)
+    return response
+
+
+async def _hedged_call_async(send: Callable, deadline: Deadline, policy: RetryPolicy, tracker: LatencyTracker):
+    """요청 1회 + 늦으면 헤지 요청 1회 (비동기 - 진 요청은 취소)"""
+    primary = asyncio.ensure_future(_timed_call_async(send, deadline, tracker))
+    tasks = [primary]
+
+    done, _ = await asyncio.wait(tasks, timeout=deadline.cap(policy.hedge_after(tracker)))
+    if not done and not deadline.expired():
+        tracker.count(hedges=1)
+        tasks.append(asyncio.ensure_future(_timed_call_async(send, deadline, tracker)))
+
+    error = None
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=deadline.remaining(), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                    continue
+                if task is not primary:
+                    tracker.count(hedge_wins=1)
+                return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    raise error or DeadlineExceeded(deadline._message())
+
+
+async def call_with_retries_async(
+    send: Callable,
+    is_transient: Callable[[Exception], bool],
+    policy: RetryPolicy,
+    tracker: LatencyTracker,
+    deadline: Optional[Deadline] = None,
+):
+    """
+    재시도/헤지를 적용한 요청 (비동기, send는 코루틴 함수)
+
+    인자/반환값/예외는 call_with_retries와 같습니다.
+    """
+    deadline = deadline or Deadline(policy.deadline)
+
+    for attempt in range(policy.max_attempts):
+        try:
+            if policy.hedge:
+                return await _hedged_call_async(send, deadline, policy, tracker)
+            return await _timed_call_async(send, deadline, tracker)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            if not is_transient(e) or attempt + 1 >= policy.max_attempts:
+                raise
+            delay = policy.backoff(attempt)
+            remaining = deadline.remaining()
+            if remaining is not None and delay >= remaining:
+                raise
+            tracker.count(retries=1)
+            await asyncio.sleep(delay)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP 오류의 상태 코드 (requests/httpx 공통, 없으면 None)"""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_engine_failure(error: Exception) -> bool:
+    """
+    제공사/엔진 쪽 장애로 볼 오류인지 (회로 차단기 기록용)
+
+    타임아웃, 연결 실패, 429/5xx만 해당합니다. 잘못된 이미지, 4xx, 설정 오류처럼
+    요청 쪽 문제는 엔진이 정상이어도 생기므로 제외합니다.
+    SDK를 import하지 않도록 상태 코드 속성과 예외 클래스 이름으로 판별합니다.
+    (requests/httpx: response.status_code, openai: status_code, google.api_core: code)
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+
+    status = _status_code(error)
+    if status is None:
+        status = getattr(error, "status_code", None)
+    if status is None and isinstance(getattr(error, "code", None), int):
+        status = error.code
+    if isinstance(status, int):
+        return status in TRANSIENT_STATUS_CODES
+
+    names = [cls.__name__ for cls in type(error).__mro__]
+    return any(marker in name for name in names for marker in ("Timeout", "Connect", "Transport"))
+
+
+def is_transient_requests_error(error: Exception) -> bool:
+    """requests 오류 중 재시도할 오류 (타임아웃, 연결 실패, 429/5xx)"""
+    import requests
+
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError):
+        return _status_code(error) in TRANSIENT_STATUS_CODES
+    return False
+
+
+def is_transient_httpx_error(error: Exception) -> bool:
+    """httpx 오류 중 재시도할 오류 (타임아웃, 연결/전송 실패, 429/5xx)"""
+    import httpx
+
+    if isinstance(error, httpx.HTTPStatusError):
+        return _status_code(error) in TRANSIENT_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """
+    엔진별 회로 차단기 (스레드 안전)
+
+    최근 요청의 오류율/느린 응답 비율이 기준을 넘거나 연속 실패가 이어지면 열림(open) 상태가 되어
+    해당 엔진을 바로 건너뜁니다. 대기 시간이 지나면 반열림(half_open) 상태에서 요청 1건으로
+    회복 여부를 확인하고, 성공하면 닫힘(closed), 실패하면 다시 열림 상태가 됩니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        error_rate: float = 0.5,
+        min_requests: int = 5,
+        consecutive_failures: int = 3,
+        slow_call_seconds: float = 15.0,
+        window_seconds: float = 60.0,
+        cooldown: float = 30.0,
+    ):
+        """
+        초기화 함수
+
+        Args:
+            error_rate: 열림 기준 실패 비율 (느린 응답 포함, 0~1)
+            min_requests: 비율을 계산하기 위한 최소 요청 수 (최근 window_seconds초)
+            consecutive_failures: 이 횟수만큼 연속 실패하면 비율과 관계없이 바로 열림
+            slow_call_seconds: 이보다 오래 걸린 성공 응답은 실패로 집계
+            window_seconds: 집계할 최근 구간 (초)
+            cooldown: 열림 상태 유지 시간 (초, 이후 반열림으로 시험 요청)
+        """
+        self.error_rate = error_rate
+        self.min_requests = max(1, min_requests)
+        self.consecutive_failures = max(1, consecutive_failures)
+        self.slow_call_seconds = slow_call_seconds
+        self.window_seconds = window_seconds
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._outcomes = deque()  # (시각, 실패 여부)
+        self._consecutive = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+        self.opened = 0
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """
+        환경변수에서 설정 읽기
+
+        환경변수:
+            OCR_BREAKER_ERROR_RATE: 열림 기준 실패 비율 (기본 0.5)
+            OCR_BREAKER_MIN_REQUESTS: 최소 요청 수 (기본 5)
+            OCR_BREAKER_CONSECUTIVE_FAILURES: 연속 실패 기준 (기본 3)
+            OCR_BREAKER_SLOW_CALL_SECONDS: 느린 응답 기준 초 (기본 15)
+            OCR_BREAKER_WINDOW_SECONDS: 집계 구간 초 (기본 60)
+            OCR_BREAKER_COOLDOWN: 열림 유지 시간 초 (기본 30)
+        """
+        return cls(
+            error_rate=float(os.getenv("OCR_BREAKER_ERROR_RATE", 0.5)),
+            min_requests=int(os.getenv("OCR_BREAKER_MIN_REQUESTS", 5)),
+            consecutive_failures=int(os.getenv("OCR_BREAKER_CONSECUTIVE_FAILURES", 3)),
+            slow_call_seconds=float(os.getenv("OCR_BREAKER_SLOW_CALL_SECONDS", 15)),
+            window_seconds=float(os.getenv("OCR_BREAKER_WINDOW_SECONDS", 60)),
+            cooldown=float(os.getenv("OCR_BREAKER_COOLDOWN", 30)),
+        )
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (열림 유지 시간이 지났으면 반열림)"""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == self.OPEN and now - self._opened_at >= self.cooldown:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        요청을 보내도 되는지 확인
+
+        Returns:
+            닫힘 상태이거나 반열림 상태의 시험 요청이면 True (반열림에서는 1건만 허용)
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, success: bool, seconds: float = 0.0):
+        """
+        요청 결과 기록
+
+        Args:
+            success: 성공 여부
+            seconds: 응답 시간 (slow_call_seconds보다 길면 실패로 집계)
+        """
+        failed = not success or seconds > self.slow_call_seconds
+        now = time.monotonic()
+
+        with self._lock:
+            state = self._current_state(now)
+
+            if state == self.HALF_OPEN:
+                self._probing = False
+                if failed:
+                    self._open(now)
+                else:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                    self._consecutive = 0
+                return
+
+            self._outcomes.append((now, failed))
+            while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+                self._outcomes.popleft()
+            self._consecutive = self._consecutive + 1 if failed else 0
+
+            if state == self.CLOSED and self._should_open():
+                self._open(now)
+
+    def release(self):
+        """
+        결과를 기록하지 않고 시험 요청 자리만 반납
+        (속도 제한 초과나 예외처럼 엔진 상태를 판단할 수 없는 경우, 반열림에서 멈추지 않도록)
+        """
+        with self._lock:
+            if self._current_state(time.monotonic()) == self.HALF_OPEN:
+                self._probing = False
+
+    def _should_open(self) -> bool:
+        if self._consecutive >= self.consecutive_failures:
+            return True
+        if len(self._outcomes) < self.min_requests:
+            return False
+        failures = sum(1 for _, failed in self._outcomes if failed)
+        return failures / len(self._outcomes) >= self.error_rate
+
+    def _open(self, now: float):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._consecutive = 0
+        self._outcomes.clear()
+        self.opened += 1
+
+    def snapshot(self) -> Dict:
+        """현재 상태 (상태 확인용)"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            failures = sum(1 for _, failed in self._outcomes if failed)
+            return {
+                "state": state,
+                "recent_requests": len(self._outcomes),
+                "recent_failures": failures,
+                "retry_in": round(max(0.0, self.cooldown - (now - self._opened_at)), 1) if state == self.OPEN else 0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+_breakers = {}
+
+
+def circuit_breaker_enabled() -> bool:
+    """회로 차단기/자동 전환 사용 여부 (환경변수 OCR_CIRCUIT_BREAKER, 기본 false)"""
+    return os.getenv("OCR_CIRCUIT_BREAKER", "False").lower() == "true"
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """엔진별 공용 회로 차단기 (프로세스 단위)"""
+    with _trackers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker.from_env()
+            _breakers[name] = breaker
+        return breaker
+
+
+def get_fallback_chain(method: str) -> List[str]:
+    """
+    엔진 장애 시 차례로 시도할 대체 엔진 목록
+
+    환경변수:
+        OCR_FALLBACK_<METHOD>: 엔진별 대체 목록 (쉼표 구분, 예: OCR_FALLBACK_NAVER_CLOVA=pp_ocrv5,gpt4_vision)
+        OCR_FALLBACK_ENGINES: 엔진별 설정이 없을 때 공통 대체 목록
+
+    Returns:
+        대체 엔진 이름 목록 (자기 자신/중복 제외)
+    """
+    value = os.getenv(f"OCR_FALLBACK_{method.upper()}")
+    if value is None:
+        value = os.getenv("OCR_FALLBACK_ENGINES", "")
+
+    chain = []
+    for name in value.split(","):
+        name = name.strip()
+        if name and name != method and name not in chain:
+            chain.append(name)
+    return chain
+
+
+def circuit_status() -> Dict:
+    """엔진별 회로 차단기 상태 (상태 확인 엔드포인트용)"""
+    with _trackers_lock:
+        breakers = dict(_breakers)
+    return {
+        "enabled": circuit_breaker_enabled(),
+        "engines": {name: breaker.snapshot() for name, breaker in breakers.items()},
+    }
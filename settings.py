@@ -0,0 +1,184 @@
+"""
+환경 설정
+.env / sibangaiocr.env 파일을 한 번만 읽어 검증된 설정 객체로 제공
+(요청마다 파일을 다시 읽지 않고, 파일 수정 시각이 바뀐 경우에만 다시 로드)
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+# 설정 파일 (앞쪽 파일이 우선, 실제 환경변수는 항상 파일보다 우선)
+ENV_FILES = (".env", "sibangaiocr.env")
+
+# 파일 수정 시각 확인 주기 (초) - 요청마다 stat도 하지 않도록
+RELOAD_CHECK_INTERVAL = 1.0
+
+# 템플릿에서 복사만 하고 채우지 않은 값 (env_template.txt의 "여기에_...")
+PLACEHOLDER_MARK = "여기에"
+
+
+def _clean(value: Optional[str]) -> Optional[str]:
+    """빈 값/템플릿 자리표시자는 None으로"""
+    if value is None:
+        return None
+    value = value.strip()
+    if not value or PLACEHOLDER_MARK in value:
+        return None
+    return value
+
+
+class Settings:
+    """
+    검증된 설정 값 (읽기 전용)
+
+    OCR 엔진별 필수 값은 속성으로, 나머지는 get()으로 조회합니다.
+    """
+
+    def __init__(self, values: Dict[str, str], env_files: Tuple[str, ...] = ()):
+        """
+        초기화 함수
+
+        Args:
+            values: 환경변수 이름 → 값 (파일 값과 실제 환경변수를 합친 결과)
+            env_files: 실제로 읽은 설정 파일 목록
+        """
+        self._values = dict(values)
+        self.env_files = env_files
+        self.loaded_at = time.time()
+
+        self.openai_api_key = _clean(values.get("OPENAI_API_KEY"))
+        self.google_credentials = _clean(values.get("GOOGLE_APPLICATION_CREDENTIALS"))
+        self.naver_secret = _clean(values.get("NAVER_OCR_SECRET_KEY"))
+        self.naver_url = _clean(values.get("NAVER_OCR_API_URL"))
+        self.pp_ocrv5_model_path = _clean(values.get("PP_OCRV5_MODEL_PATH"))
+        self.pp_ocrv5_use_korean = (values.get("PP_OCRV5_USE_KOREAN") or "True").strip().lower() == "true"
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """임의 설정 값 조회"""
+        value = self._values.get(key)
+        return default if value is None else value
+
+    def missing_for(self, method: str) -> Optional[str]:
+        """
+        OCR 방법에 필요한 설정이 빠졌는지 검사
+
+        Args:
+            method: OCR 방법
+
+        Returns:
+            오류 메시지 (문제 없으면 None)
+        """
+        if method == "gpt4_vision" and not self.openai_api_key:
+            return "OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다."
+        if method == "google_vision" and not self.google_credentials:
+            return "GOOGLE_APPLICATION_CREDENTIALS가 설정되지 않았습니다."
+        if method == "naver_clova" and (not self.naver_secret or not self.naver_url):
+            return "Naver Clova OCR 설정이 완료되지 않았습니다."
+        return None
+
+    def require(self, method: str):
+        """
+        OCR 방법에 필요한 설정 확인
+
+        Raises:
+            ValueError: 필요한 설정이 없는 경우
+        """
+        message = self.missing_for(method)
+        if message:
+            raise ValueError(message)
+
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """설정 파일 파싱 (os.environ은 건드리지 않음)"""
+    from dotenv import dotenv_values
+
+    return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
+
+class _SettingsLoader:
+    """설정 파일 수정 시각을 추적하여 바뀐 경우에만 다시 읽는 로더"""
+
+    def __init__(self, env_files: Tuple[str, ...] = ENV_FILES):
+        self.env_files = env_files
+        self._lock = threading.Lock()
+        self._settings = None
+        self._mtimes = None
+        self._checked_at = 0.0
+        # 파일에서 os.environ으로 내보낸 값 (다시 로드할 때 이 값만 갱신)
+        self._exported = {}
+
+    def _current_mtimes(self) -> Tuple:
+        """설정 파일별 수정 시각 (없는 파일은 None)"""
+        mtimes = []
+        for path in self.env_files:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _load(self, mtimes: Tuple) -> Settings:
+        """파일을 읽어 Settings 생성 + os.environ 동기화"""
+        file_values = {}
+        loaded_files = []
+        # 뒤쪽 파일부터 읽어 앞쪽 파일 값이 덮어쓰도록
+        for path, mtime in reversed(list(zip(self.env_files, mtimes))):
+            if mtime is None:
+                continue
+            file_values.update(_read_env_file(path))
+            loaded_files.insert(0, path)
+
+        # os.getenv를 쓰는 다른 모듈을 위해 파일 값을 환경변수로 내보냄
+        # (실제 환경변수는 덮어쓰지 않고, 이전에 파일에서 가져온 값만 갱신/삭제)
+        for key in list(self._exported):
+            if key not in file_values and os.environ.get(key) == self._exported[key]:
+                del os.environ[key]
+                del self._exported[key]
+        for key, value in file_values.items():
+            if key not in os.environ or os.environ[key] == self._exported.get(key):
+                os.environ[key] = value
+                self._exported[key] = value
+
+        return Settings(dict(os.environ), tuple(loaded_files))
+
+    def get(self, force: bool = False) -> Settings:
+        """
+        현재 설정 반환 (파일이 바뀌었으면 다시 로드)
+
+        Args:
+            force: True면 수정 시각과 관계없이 다시 로드
+        """
+        now = time.monotonic()
+        if not force and self._settings is not None and now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return self._settings
+
+        with self._lock:
+            mtimes = self._current_mtimes()
+            self._checked_at = now
+            if force or self._settings is None or mtimes != self._mtimes:
+                if self._settings is not None:
+                    print("🔄 설정 파일 변경 감지 - 설정을 다시 로드합니다.")
+                self._settings = self._load(mtimes)
+                self._mtimes = mtimes
+            return self._settings
+
+
+_loader = _SettingsLoader()
+
+
+def get_settings() -> Settings:
+    """
+    프로세스 공용 설정 (처음 호출 시 로드, 이후 설정 파일이 바뀐 경우에만 다시 로드)
+
+    Returns:
+        Settings
+    """
+    return _loader.get()
+
+
+def reload_settings() -> Settings:
+    """설정 파일을 강제로 다시 로드"""
+    return _loader.get(force=True)
@@ -4,19 +4,16 @@ Sibang OCR 엔진 개발 가이드
 """
 
 import os
-import cv2
-import numpy as np
-from PIL import Image, ImageEnhance, ImageFilter
-import torch
-import torch.nn as nn
-import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader
-import pytesseract
-from transformers import TrOCRProcessor, VisionEncoderDecoderModel
 import json
 import re
-from typing import Dict, List, Tuple, Optional
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
+from settings import get_settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# cv2/numpy/PIL/torch/transformers/pytesseract는 사용하는 함수 안에서 import
+# (모듈을 import만 해도 torch를 로딩하던 수 초의 시작 지연 제거)
 
 class SibangOCREngine:
     """
@@ -31,13 +28,14 @@ class SibangOCREngine:
     
     def __init__(self):
         """Sibang OCR 엔진 초기화"""
-        load_dotenv("sibangaiocr.env")
+        get_settings()
         self.is_available = False
         self.version = "0.1.0-dev"
         
         # 모델 관련 속성들
         self.model = None
         self.processor = None
+        import torch
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         
         # 전통시장 특화 설정
@@ -84,10 +82,11 @@ class SibangOCREngine:
             r'\d+\s*/\s*개',              # 1000/개 등
         ]
 
-class SibangDataset(Dataset):
+class SibangDataset:
     """
     Sibang OCR용 데이터셋 클래스
     전통시장 이미지와 텍스트 쌍을 관리
+    (__len__/__getitem__을 구현하므로 torch DataLoader에 바로 사용 가능)
     """
     
     def __init__(self, image_paths: List[str], labels: List[str], transform=None):
@@ -107,6 +106,8 @@ class SibangDataset(Dataset):
         return len(self.image_paths)
     
     def __getitem__(self, idx):
+        from PIL import Image
+        
         # 이미지 로드
         image_path = self.image_paths[idx]
         image = Image.open(image_path).convert('RGB')
@@ -132,6 +133,8 @@ class SibangOCRProcessor:
     def _initialize_models(self):
         """모델 초기화"""
         try:
+            from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+            
             # TrOCR 모델 로드 (Microsoft의 Vision-Language 모델)
             model_name = "microsoft/trocr-base-printed"
             self.processor = TrOCRProcessor.from_pretrained(model_name)
@@ -145,7 +148,7 @@ class SibangOCRProcessor:
             self.model = None
             self.processor = None
     
-    def preprocess_image(self, image_path: str) -> np.ndarray:
+    def preprocess_image(self, image_path: str) -> "np.ndarray":
         """
         이미지 전처리 - 전통시장 특화
         
@@ -155,6 +158,9 @@ class SibangOCRProcessor:
         Returns:
             전처리된 이미지 배열
         """
+        import cv2
+        import numpy as np
+        
         # 이미지 읽기
         image = cv2.imread(image_path)
         if image is None:
@@ -187,7 +193,7 @@ class SibangOCRProcessor:
         
         return inverted
     
-    def extract_text_regions(self, image: np.ndarray) -> List[np.ndarray]:
+    def extract_text_regions(self, image: "np.ndarray") -> List["np.ndarray"]:
         """
         텍스트 영역 추출
         
@@ -197,6 +203,8 @@ class SibangOCRProcessor:
         Returns:
             텍스트 영역 리스트
         """
+        import cv2
+        
         # 윤곽선 찾기
         contours, _ = cv2.findContours(image, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
@@ -216,7 +224,7 @@ class SibangOCRProcessor:
         
         return text_regions
     
-    def recognize_with_trocr(self, image: np.ndarray) -> str:
+    def recognize_with_trocr(self, image: "np.ndarray") -> str:
         """
         TrOCR을 사용한 텍스트 인식
         
@@ -230,6 +238,8 @@ class SibangOCRProcessor:
             return ""
         
         try:
+            from PIL import Image
+            
             # PIL Image로 변환
             pil_image = Image.fromarray(image)
             
@@ -247,7 +257,7 @@ class SibangOCRProcessor:
             print(f"TrOCR 인식 오류: {e}")
             return ""
     
-    def recognize_with_tesseract(self, image: np.ndarray) -> str:
+    def recognize_with_tesseract(self, image: "np.ndarray") -> str:
         """
         Tesseract를 사용한 텍스트 인식 (백업)
         
@@ -258,6 +268,9 @@ class SibangOCRProcessor:
             인식된 텍스트
         """
         try:
+            import pytesseract
+            from PIL import Image
+            
             # PIL Image로 변환
             pil_image = Image.fromarray(image)
             
@@ -431,7 +444,7 @@ class SibangTrainer:
         self.optimizer = None
         self.criterion = None
     
-    def prepare_dataset(self, data_dir: str) -> Tuple[DataLoader, DataLoader]:
+    def prepare_dataset(self, data_dir: str) -> Tuple["DataLoader", "DataLoader"]:
         """
         데이터셋 준비
         
@@ -444,7 +457,7 @@ class SibangTrainer:
         # TODO: 데이터셋 로더 구현
         pass
     
-    def train_model(self, train_loader: DataLoader, val_loader: DataLoader, epochs: int = 10):
+    def train_model(self, train_loader: "DataLoader", val_loader: "DataLoader", epochs: int = 10):
         """
         모델 학습
         
@@ -4,7 +4,7 @@ Sibang OCR 엔진 - 전통시장 특화 OCR
 """
 
 import os
-from dotenv import load_dotenv
+from settings import get_settings
 
 class SibangOCREngine:
     """
@@ -19,7 +19,7 @@ class SibangOCREngine:
     
     def __init__(self):
         """Sibang OCR 엔진 초기화"""
-        load_dotenv("sibangaiocr.env")
+        get_settings()
         self.is_available = False  # 아직 개발 중
         self.version = "0.1.0-dev"
         
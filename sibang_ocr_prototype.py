@@ -4,15 +4,13 @@ TrOCR 기반 전통시장 특화 OCR 엔진
 """
 
 import os
-import cv2
-import numpy as np
-from PIL import Image, ImageEnhance
-import torch
-from transformers import TrOCRProcessor, VisionEncoderDecoderModel
 import json
 import re
 from typing import Dict, List, Optional
-from dotenv import load_dotenv
+from settings import get_settings
+
+# cv2/numpy/PIL/torch/transformers는 사용하는 함수 안에서 import
+# (모듈을 import만 해도 torch를 로딩하던 수 초의 시작 지연 제거)
 
 class SibangOCRPrototype:
     """
@@ -22,7 +20,9 @@ class SibangOCRPrototype:
     
     def __init__(self):
         """프로토타입 초기화"""
-        load_dotenv("sibangaiocr.env")
+        import torch
+        
+        get_settings()
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model = None
         self.processor = None
@@ -83,6 +83,8 @@ class SibangOCRPrototype:
         try:
             print("🔄 TrOCR 모델 로딩 중...")
             
+            from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+            
             # TrOCR 모델 로드 (한국어 지원 버전)
             model_name = "microsoft/trocr-base-printed"
             self.processor = TrOCRProcessor.from_pretrained(model_name)
@@ -97,7 +99,7 @@ class SibangOCRPrototype:
             self.model = None
             self.processor = None
     
-    def preprocess_image(self, image_path: str) -> np.ndarray:
+    def preprocess_image(self, image_path: str) -> "np.ndarray":
         """
         이미지 전처리 - 전통시장 특화
         
@@ -107,6 +109,9 @@ class SibangOCRPrototype:
         Returns:
             전처리된 이미지 배열
         """
+        import cv2
+        import numpy as np
+        
         # 이미지 읽기
         image = cv2.imread(image_path)
         if image is None:
@@ -138,7 +143,7 @@ class SibangOCRPrototype:
         
         return inverted
     
-    def recognize_text(self, image: np.ndarray) -> str:
+    def recognize_text(self, image: "np.ndarray") -> str:
         """
         TrOCR을 사용한 텍스트 인식
         
@@ -152,6 +157,8 @@ class SibangOCRPrototype:
             return "모델이 로드되지 않았습니다."
         
         try:
+            from PIL import Image
+            
             # PIL Image로 변환
             pil_image = Image.fromarray(image)
             
@@ -6,10 +6,8 @@ import os
 import base64
 import json
 from typing import Dict
-from openai import OpenAI
-from dotenv import load_dotenv
-
-load_dotenv("sibangaiocr.env")
+from ocr_clients import get_openai_client
+from settings import get_settings
 
 class SimpleOCRProcessor:
     """
@@ -18,11 +16,11 @@ class SimpleOCRProcessor:
     
     def __init__(self):
         """초기화"""
-        self.api_key = os.getenv("OPENAI_API_KEY")
+        self.api_key = get_settings().openai_api_key
         if not self.api_key:
             raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_openai_client(self.api_key)
     
     def encode_image_safe(self, image_path: str) -> str:
         """
@@ -47,7 +45,20 @@ class SimpleOCRProcessor:
         try:
             # 이미지 인코딩
             base64_image = self.encode_image_safe(image_path)
-            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "OCR 처리 중 오류가 발생했습니다."
+            }
+        
+        return self.process_base64(base64_image)
+    
+    def process_base64(self, base64_image: str) -> Dict:
+        """
+        Base64 인코딩된 이미지 OCR 처리 (업로드 스풀에서 바로 인코딩한 경우)
+        """
+        try:
             # 영어 프롬프트 (ASCII 전용)
             prompt = (
                 "Analyze this image of a market stall product and extract information. "
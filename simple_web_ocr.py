@@ -9,18 +9,19 @@ import os
 import base64
 import json
 import tempfile
+import threading
 import uuid
-from flask import Flask, request, jsonify, render_template_string
-from openai import OpenAI
-from dotenv import load_dotenv
+from flask import Flask, request, jsonify, render_template_string, url_for
+from ocr_clients import get_openai_client
+from settings import get_settings
+from upload_spool import UploadTooLarge, get_max_upload_bytes, spool_stream
 
-# 환경변수 로드 (.env 우선, 없으면 sibangaiocr.env 사용)
-if os.path.exists(".env"):
-    load_dotenv(".env")  # .env 파일이 있으면 우선 사용
-else:
-    load_dotenv("sibangaiocr.env")  # 없으면 sibangaiocr.env 사용
+# 환경변수 로드 (.env 우선, sibangaiocr.env는 빈 값 보충 - 이후 파일이 바뀔 때만 다시 로드)
+get_settings()
 
 app = Flask(__name__, static_folder='fonts', static_url_path='/fonts')
+# 요청 본문 크기 제한 (이미지 최대 크기 + 폼 필드 여유분) - 초과 시 Werkzeug가 413 응답
+app.config['MAX_CONTENT_LENGTH'] = get_max_upload_bytes() + 64 * 1024
 
 # HTML 템플릿 (드래그 앤 드롭 포함)
 HTML_TEMPLATE = """
@@ -541,13 +542,17 @@ def safe_process_image(image_data):
     """
     안전한 이미지 처리 - ASCII 인코딩 완전 회피
     """
+    # Base64 인코딩 (완전 안전한 방법)
+    base64_bytes = base64.b64encode(image_data)
+    return safe_process_base64(base64_bytes.decode('ascii'))
+
+def safe_process_base64(base64_image):
+    """
+    Base64 인코딩된 이미지 처리 (업로드 스풀에서 청크 단위로 인코딩한 문자열을 그대로 사용)
+    """
     try:
-        # OpenAI 클라이언트 생성
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        # Base64 인코딩 (완전 안전한 방법)
-        base64_bytes = base64.b64encode(image_data)
-        base64_image = base64_bytes.decode('ascii')
+        # 공용 OpenAI 클라이언트 (연결 풀 재사용)
+        client = get_openai_client()
         
         # 영어 프롬프트 (ASCII 안전)
         prompt = """Analyze this image and extract all text content. 
@@ -596,6 +601,28 @@ def safe_process_image(image_data):
             "message": f"OCR 처리 중 오류가 발생했습니다: {str(e)}"
         }
 
+def result_text(result_dict):
+    """
+    화면에 보여줄 인식 텍스트 (원문이 없는 결과 - 예: GPT-4 Vision으로 대체된 결과 - 는 상품 목록으로 구성)
+    
+    Args:
+        result_dict: MarketOCRProcessor 결과 딕셔너리
+        
+    Returns:
+        인식 텍스트 (없으면 빈 문자열)
+    """
+    text = (result_dict.get("text") or result_dict.get("raw_text") or "").strip()
+    if text:
+        return text
+    
+    lines = []
+    for product in result_dict.get("products", []):
+        parts = [product.get("product_name"), product.get("price"), product.get("unit")]
+        line = " ".join(str(part) for part in parts if part)
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
 def safe_process_image_from_file(file_path):
     """파일 경로에서 안전하게 이미지 처리"""
     try:
@@ -629,101 +656,25 @@ def index():
             selected_engine = request.form.get('ocr_engine', 'naver_clova')
             
             # 안전한 이미지 처리
+            upload = None
             try:
-                # 이미지 데이터 직접 읽기 (메모리에서 처리)
-                image_data = file.read()
+                # 청크 단위로 스풀링 (크기 제한 + 해시 동시 계산, 큰 파일은 임시 파일로)
+                upload = spool_stream(file.stream, filename=file.filename)
                 
                 # 선택된 엔진에 따라 처리
                 if selected_engine == 'tesseract':
                     try:
-                        # Tesseract OCR 처리 (고급 이미지 전처리)
-                        import pytesseract
-                        from PIL import Image, ImageFilter, ImageOps
-                        import io
-                        import numpy as np
-                        import cv2
-                        
-                        # 이미지 데이터를 PIL Image로 변환
-                        image = Image.open(io.BytesIO(image_data))
-                        
-                        # 고급 이미지 전처리
-                        # 1. 이미지를 OpenCV 형식으로 변환
-                        img_array = np.array(image)
-                        
-                        # 2. 그레이스케일 변환
-                        if len(img_array.shape) == 3:
-                            gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-                        else:
-                            gray = img_array
-                        
-                        # 3. 노이즈 제거 (가우시안 블러)
-                        denoised = cv2.GaussianBlur(gray, (3, 3), 0)
-                        
-                        # 4. 적응적 임계값 처리 (Adaptive Threshold)
-                        # 텍스트 영역을 더 명확하게 분리
-                        thresh = cv2.adaptiveThreshold(
-                            denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                            cv2.THRESH_BINARY, 11, 2
-                        )
+                        # Tesseract OCR 처리 (고급 이미지 전처리 + 다중 설정, 신뢰도 기준을 넘으면 조기 종료)
+                        # 백엔드(tesserocr/pytesseract) 미설치 시 워커에서 ImportError
+                        from tesseract_engine import recognize
                         
-                        # 5. 모폴로지 연산으로 노이즈 제거
-                        kernel = np.ones((1, 1), np.uint8)
-                        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+                        best_result = recognize(upload.read())
                         
-                        # 6. 이미지 크기 확대 (3배로 증가)
-                        height, width = cleaned.shape
-                        enlarged = cv2.resize(cleaned, (width * 3, height * 3), interpolation=cv2.INTER_CUBIC)
-                        
-                        # 7. PIL Image로 다시 변환
-                        processed_image = Image.fromarray(enlarged)
-                        
-                        # 8. 추가 선명도 향상
-                        from PIL import ImageEnhance
-                        enhancer = ImageEnhance.Sharpness(processed_image)
-                        processed_image = enhancer.enhance(1.5)
-                        
-                        # 9. 다중 OCR 설정으로 시도
-                        results = []
-                        
-                        # 설정 1: 기본 한국어 설정
-                        config1 = r'--oem 3 --psm 6 -l kor'
-                        text1 = pytesseract.image_to_string(processed_image, config=config1).strip()
-                        if text1:
-                            results.append(('기본한국어', text1))
-                        
-                        # 설정 2: 한국어+영어 설정
-                        config2 = r'--oem 3 --psm 6 -l kor+eng'
-                        text2 = pytesseract.image_to_string(processed_image, config=config2).strip()
-                        if text2:
-                            results.append(('한국어+영어', text2))
-                        
-                        # 설정 3: 단일 텍스트 라인 설정
-                        config3 = r'--oem 3 --psm 7 -l kor+eng'
-                        text3 = pytesseract.image_to_string(processed_image, config=config3).strip()
-                        if text3:
-                            results.append(('단일라인', text3))
-                        
-                        # 설정 4: 단일 단어 설정
-                        config4 = r'--oem 3 --psm 8 -l kor+eng'
-                        text4 = pytesseract.image_to_string(processed_image, config=config4).strip()
-                        if text4:
-                            results.append(('단일단어', text4))
-                        
-                        # 설정 5: 원본 이미지로도 시도
-                        config5 = r'--oem 3 --psm 6 -l kor+eng'
-                        text5 = pytesseract.image_to_string(image, config=config5).strip()
-                        if text5:
-                            results.append(('원본이미지', text5))
-                        
-                        # 가장 긴 결과를 선택 (일반적으로 더 정확함)
-                        if results:
-                            # 결과들을 길이순으로 정렬
-                            results.sort(key=lambda x: len(x[1]), reverse=True)
-                            best_result = results[0]
-                            text = best_result[1]
+                        if best_result:
+                            text = best_result["text"]
                             
                             # 디버그 정보 추가
-                            debug_info = f"[{best_result[0]}] "
+                            debug_info = f"[{best_result['pass']} {best_result['confidence']:.0f}%] "
                         else:
                             text = "텍스트를 인식할 수 없습니다."
                             debug_info = "[실패] "
@@ -746,7 +697,7 @@ def index():
                     except ImportError:
                         result = {
                             "type": "error",
-                            "message": "Tesseract OCR이 설치되지 않았습니다. 설치하려면: pip install pytesseract"
+                            "message": "Tesseract OCR이 설치되지 않았습니다. 설치하려면: pip install pytesseract (또는 pip install tesserocr)"
                         }
                     except Exception as e:
                         result = {
@@ -756,19 +707,11 @@ def index():
                 elif selected_engine == 'naver_clova':
                     try:
                         from ocr_processor import MarketOCRProcessor
-                        import os
-                        from dotenv import load_dotenv
-                        
-                        # 환경 변수 다시 로드 (ocr_processor와 동일하게)
-                        if os.path.exists(".env"):
-                            load_dotenv(".env", override=True)  # override=True로 덮어쓰기
-                        load_dotenv("sibangaiocr.env", override=True)  # sibangaiocr.env도 로드
                         
-                        # API 키 확인
-                        naver_secret = os.getenv("NAVER_OCR_SECRET_KEY")
-                        naver_url = os.getenv("NAVER_OCR_API_URL")
+                        # API 키 확인 (캐시된 설정 - 설정 파일이 수정된 경우에만 다시 읽음)
+                        settings = get_settings()
                         
-                        if not naver_secret or not naver_url:
+                        if settings.missing_for("naver_clova"):
                             raise ValueError(
                                 "Naver Clova OCR 설정이 완료되지 않았습니다.\n\n"
                                 "확인사항:\n"
@@ -777,29 +720,35 @@ def index():
                                 "3. 환경 변수 파일이 올바른 위치에 있는지 확인"
                             )
                         
-                        processor = MarketOCRProcessor(method="naver_clova")  # naver_clova 방법으로 초기화
-                        # Naver Clova OCR 처리 - 이미지 데이터를 직접 전달
-                        result_dict = processor.process_with_naver_clova_from_data(image_data)
+                        processor = MarketOCRProcessor(method="naver_clova", settings=settings)  # naver_clova 방법으로 초기화
+                        # 스풀에서 계산한 해시로 처리 - 같은 이미지를 연달아 눌러도 진행 중인 요청 결과를 공유(API 1번 호출),
+                        # 회로 차단기 사용 시 Clova 장애 중에는 타임아웃을 기다리지 않고 대체 엔진(OCR_FALLBACK_*)으로 전환
+                        result_dict = processor.process_image_bytes(
+                            upload.read(), image_path=upload.filename, image_digest=upload.digest
+                        )
                         
-                        # 에러 체크 (다른 엔진으로 fallback하지 않음)
+                        # 에러 체크 (회로 차단기를 켜지 않으면 다른 엔진으로 fallback하지 않음)
                         if "error" in result_dict:
                             error_msg = result_dict.get("error", "알 수 없는 오류")
                             raise Exception(f"Naver Clova OCR 처리 실패: {error_msg}")
                         
-                        text = result_dict.get('text', '') if isinstance(result_dict, dict) else str(result_dict)
+                        # 대체 엔진 결과처럼 원문이 없으면 상품 목록으로 표시
+                        text = result_text(result_dict) if isinstance(result_dict, dict) else str(result_dict)
                         
                         # 텍스트가 비어있으면 에러 처리
                         if not text or text.strip() == "":
                             raise Exception("텍스트를 인식할 수 없습니다. 이미지를 확인해주세요.")
                         
                         engine_used = 'Naver Clova OCR'
+                        if "failover" in result_dict:
+                            engine_used = f"{result_dict['failover']['used']} (Naver Clova 장애로 대체)"
                         result = {
                             "type": "success",
                             "message": text,
                             "engine": engine_used
                         }
                     except Exception as e:
-                        # 선택한 엔진만 사용 - 다른 엔진으로 fallback하지 않음
+                        # 선택한 엔진(+회로 차단기 사용 시 대체 엔진)이 모두 실패한 경우
                         import traceback
                         error_detail = str(e)
                         result = {
@@ -815,18 +764,11 @@ def index():
                     try:
                         from ocr_processor import MarketOCRProcessor
                         processor = MarketOCRProcessor(method="pp_ocrv5")
-                        # 이미지 데이터를 임시 파일로 저장
-                        import tempfile
-                        temp_fd, temp_path = tempfile.mkstemp(suffix='.jpg')
-                        os.close(temp_fd)
-                        with open(temp_path, 'wb') as f:
-                            f.write(image_data)
-                        
-                        # OCR 처리
-                        result_dict = processor.process_image(temp_path)
                         
-                        # 임시 파일 삭제
-                        os.unlink(temp_path)
+                        # OCR 처리 (메모리에서 바로 디코딩 - 임시 파일 사용 안 함)
+                        result_dict = processor.process_image_bytes(
+                            upload.read(), image_path=upload.filename, image_digest=upload.digest
+                        )
                         
                         # 결과 형식 통일
                         if "error" in result_dict:
@@ -852,16 +794,37 @@ def index():
                             "message": f"PP-OCRv5 처리 오류: {str(e)}"
                         }
                 else:
-                    # GPT-4 Vision (기본값)
-                    result = safe_process_image(image_data)
-                    if result and result.get('type') == 'success':
-                        result['engine'] = 'SibangOCR (GV engine)'
+                    # GPT-4 Vision (기본값) - 같은 이미지를 연달아 눌러도 진행 중인 요청 결과를 공유 (API 1번 호출)
+                    from ocr_processor import MarketOCRProcessor
+                    processor = MarketOCRProcessor(method="gpt4_vision", settings=get_settings())
+                    result_dict = processor.process_image_bytes(
+                        upload.read(), image_path=upload.filename, image_digest=upload.digest
+                    )
+                    if "error" in result_dict:
+                        result = {
+                            "type": "error",
+                            "message": f"OCR 처리 중 오류가 발생했습니다: {result_dict['error']}"
+                        }
+                    else:
+                        result = {
+                            "type": "success",
+                            "message": result_text(result_dict) or "텍스트를 인식할 수 없습니다.",
+                            "engine": 'SibangOCR (GV engine)'
+                        }
                         
+            except UploadTooLarge as e:
+                result = {
+                    "type": "error",
+                    "message": str(e)
+                }
             except Exception as e:
                 result = {
                     "type": "error",
                     "message": f"이미지 처리 중 오류가 발생했습니다: {str(e)}"
                 }
+            finally:
+                if upload is not None:
+                    upload.close()
             
             return render_template_string(HTML_TEMPLATE, result=result)
             
@@ -873,7 +836,126 @@ def index():
     
     return render_template_string(HTML_TEMPLATE)
 
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    비동기 OCR 작업 등록 - 작업 ID를 바로 반환 (202)
+    form: image (파일), ocr_engine (기본 naver_clova), callback_url (선택)
+    """
+    from ocr_processor import COMPOSITE_METHODS, SUPPORTED_METHODS
+    from ocr_jobs import get_job_queue
+    
+    file = request.files.get('image')
+    if file is None or file.filename == '':
+        return jsonify({"error": "No image uploaded"}), 400
+    
+    method = request.form.get('ocr_engine', 'naver_clova')
+    if method not in SUPPORTED_METHODS + COMPOSITE_METHODS:
+        return jsonify({"error": f"지원하지 않는 OCR 방법: {method}", "supported_methods": SUPPORTED_METHODS + COMPOSITE_METHODS}), 400
+    
+    try:
+        upload = spool_stream(file.stream, filename=file.filename)
+    except UploadTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    
+    with upload:
+        if upload.size == 0:
+            return jsonify({"error": "빈 파일입니다."}), 400
+        
+        # 스풀에서 작업 큐 보관 파일로 바로 복사 (전체를 메모리에 올리지 않음)
+        try:
+            job_id = get_job_queue().submit(
+                upload.stream(), method,
+                image_name=file.filename,
+                callback_url=request.form.get('callback_url') or None
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": url_for('get_job', job_id=job_id)
+    }), 202
+
+@app.errorhandler(413)
+def request_too_large(error):
+    """업로드 크기 초과 (MAX_CONTENT_LENGTH)"""
+    message = f"파일이 너무 큽니다 (최대 {get_max_upload_bytes() // (1024 * 1024)}MB)"
+    if request.path.startswith('/jobs'):
+        return jsonify({"error": message}), 413
+    return render_template_string(HTML_TEMPLATE, result={
+        "type": "error",
+        "message": message
+    }), 413
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """비동기 OCR 작업 상태/결과 조회 (폴링용)"""
+    from ocr_jobs import get_job_queue
+    
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다.", "job_id": job_id}), 404
+    return jsonify(job)
+
+@app.route('/health', methods=['GET'])
+def health():
+    """생존 확인 (프로세스가 응답하면 항상 200) + 엔진 상태, 속도 제한/월간 사용량, Tesseract 설정별 승률"""
+    from engine_registry import engine_status
+    from rate_limit import rate_limit_status
+    from resilience import circuit_status
+    from singleflight import inflight
+    from tesseract_engine import pass_stats
+    return jsonify({
+        "status": "ok",
+        "engines": engine_status(),
+        "rate_limits": rate_limit_status(),
+        "circuit_breakers": circuit_status(),
+        "singleflight": inflight.snapshot(),
+        "tesseract_passes": pass_stats.snapshot()
+    })
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """준비 상태 확인 - 로컬 엔진 예열이 끝나기 전에는 503 (로드밸런서 라우팅 기준)"""
+    from warmup import readiness
+    snapshot = readiness.snapshot()
+    return jsonify(snapshot), (200 if readiness.ready else 503)
+
+def start_background_services(prewarm: bool = True):
+    """
+    서버 시작 시 백그라운드 준비 작업
+    - 로컬 엔진 예열 (모델 로드 + 더미 추론, 끝나면 /ready가 200)
+    - Naver Clova OCR 엔드포인트 사전 연결
+    - 비동기 작업 큐 워커 시작
+    
+    Args:
+        prewarm: False면 예열 생략
+    """
+    if prewarm:
+        from warmup import start_prewarm
+        start_prewarm()
+    
+    from ocr_jobs import start_job_workers
+    start_job_workers()
+    
+    # Naver Clova OCR 엔드포인트 사전 연결 (첫 요청의 TLS 핸드셰이크 제거)
+    if get_settings().naver_url:
+        from ocr_clients import preconnect_naver
+        threading.Thread(target=preconnect_naver, daemon=True).start()
+
 if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="전통시장 AI OCR 웹 서버")
+    parser.add_argument(
+        "--production", action="store_true",
+        default=os.getenv("OCR_SERVER_MODE", "").lower() == "production",
+        help="운영 모드: 모델을 미리 로드한 뒤 워커 프로세스를 fork (디버그/리로더 끔)"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="운영 모드 워커 수 (기본: CPU 코어 수)")
+    args = parser.parse_args()
+    
     # 포트 설정 (환경변수 파일에서 읽기 - sibangaiocr.env 또는 .env)
     # 환경변수 FLASK_PORT가 설정되어 있으면 사용, 없으면 8081 (기본값)
     port = int(os.getenv('FLASK_PORT', 8081))
@@ -886,6 +968,22 @@ if __name__ == '__main__':
     print("🤖 기본 OCR 엔진: Naver Clova OCR (추천 첫번째 방법)")
     print("=" * 60)
     print("💡 다음에 실행할 때도 이 주소로 접속하세요: http://localhost:8081")
+    print("🩺 상태 확인: /health (생존), /ready (예열 완료 여부)")
     print("=" * 60)
-    app.run(debug=True, host='0.0.0.0', port=port)
-
+    
+    if args.production:
+        # 운영 모드: 마스터에서 모델 로드만 → fork → 워커끼리 모델 메모리 공유, 더미 추론은 워커마다
+        from prefork_server import serve_prefork
+        from warmup import prewarm
+        serve_prefork(
+            app, host='0.0.0.0', port=port,
+            workers=args.workers,
+            preload=lambda: prewarm(infer=False),
+            on_worker_start=start_background_services
+        )
+    else:
+        # 디버그 리로더는 감시 프로세스와 서버 프로세스 두 개를 띄우므로 서버 프로세스에서만 예열
+        if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+            start_background_services()
+        
+        app.run(debug=True, host='0.0.0.0', port=port)
@@ -0,0 +1,162 @@
+"""
+동일 요청 합치기 (singleflight)
+같은 이미지 + 같은 OCR 방법 요청이 동시에 들어오면 엔진은 한 번만 호출하고
+기다리던 호출자 모두에게 같은 결과를 돌려줌 (두 번 누른 업로드, 모바일 재시도 대비)
+완료된 결과를 보관하는 결과 캐시(ocr_cache)와 달리 진행 중인 요청만 다룸
+"""
+
+import asyncio
+import copy
+import os
+import threading
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+
+def singleflight_enabled() -> bool:
+    """동일 요청 합치기 사용 여부 (환경변수 OCR_SINGLEFLIGHT, 기본 true)"""
+    return os.getenv("OCR_SINGLEFLIGHT", "True").lower() == "true"
+
+
+class _Call:
+    """진행 중인 요청 1건 (결과를 기다리는 호출자들이 공유)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class _AsyncCall:
+    """진행 중인 비동기 요청 1건 (공유 작업 + 기다리는 호출자 수)"""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 1
+
+
+class SingleFlight:
+    """
+    진행 중인 요청 합치기 (스레드 안전)
+
+    같은 키로 동시에 do()를 호출하면 먼저 온 호출자만 함수를 실행하고,
+    나머지는 그 결과(복사본)를 받습니다. 함수가 끝나면 키를 지우므로 이후 요청은 다시 실행됩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Dict], timeout: Optional[float] = None) -> Tuple[Dict, bool]:
+        """
+        같은 키의 진행 중인 요청이 있으면 그 결과를 기다리고, 없으면 직접 실행
+
+        Args:
+            key: 요청 키 (이미지 해시 + 방법)
+            fn: 실제 처리 함수
+            timeout: 다른 호출자의 결과를 기다릴 최대 시간 (초, None이면 끝날 때까지)
+
+        Returns:
+            (결과, 다른 호출자의 결과를 받았는지 여부)
+
+        Raises:
+            TimeoutError: timeout 안에 다른 호출자의 처리가 끝나지 않은 경우
+            Exception: 실행 중 발생한 예외 (기다리던 호출자에게도 전달)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError("같은 이미지의 진행 중인 요청이 제한 시간 안에 끝나지 않았습니다.")
+            if call.error is not None:
+                raise call.error
+            # 호출자마다 결과를 고칠 수 있으므로 복사본 전달
+            return copy.deepcopy(call.result), True
+
+        result = None
+        try:
+            result = fn()
+            return result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                waiters = call.waiters
+            # 키를 지운 뒤에는 새로 기다리는 호출자가 없으므로, 있을 때만 원본과 분리된 사본 보관
+            # (먼저 온 호출자가 결과를 고쳐도 기다리던 호출자에게 영향 없도록)
+            if waiters and call.error is None:
+                call.result = copy.deepcopy(result)
+            call.done.set()
+
+    async def do_async(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Dict]],
+        timeout: Optional[float] = None
+    ) -> Tuple[Dict, bool]:
+        """
+        do()의 비동기 버전 (같은 이벤트 루프의 요청끼리 합침)
+
+        한 호출자가 취소/시간 초과되어도 기다리는 호출자가 남아 있으면 처리는 계속되고,
+        마지막 호출자까지 떠나면 공유 작업도 취소합니다 (race/헤지에서 진 요청의 엔진 호출 중단).
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+
+        with self._lock:
+            call = self._async_calls.get(loop_key)
+            leader = call is None
+            if leader:
+                call = _AsyncCall(loop.create_task(fn()))
+                self._async_calls[loop_key] = call
+                call.task.add_done_callback(lambda _: self._forget_async(loop_key, call))
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        # shield: 다른 호출자가 기다리는 동안에는 한 호출자의 취소가 공유 작업으로 번지지 않도록
+        try:
+            result = await asyncio.wait_for(asyncio.shield(call.task), None if leader else timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("같은 이미지의 진행 중인 요청이 제한 시간 안에 끝나지 않았습니다.")
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0
+            if abandoned and not call.task.done():
+                call.task.cancel()
+        # 같은 루프의 호출자끼리 같은 객체를 공유하지 않도록 모두 사본 전달
+        return copy.deepcopy(result), not leader
+
+    def _forget_async(self, loop_key, call):
+        with self._lock:
+            if self._async_calls.get(loop_key) is call:
+                del self._async_calls[loop_key]
+
+    def snapshot(self) -> Dict:
+        """현재 상태 (상태 확인용)"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls) + len(self._async_calls),
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+            }
+
+
+# 프로세스 공용 인스턴스 (처리기 인스턴스가 달라도 같은 요청이면 합침)
+inflight = SingleFlight()
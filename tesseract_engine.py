@@ -0,0 +1,427 @@
+"""
+Tesseract 다중 설정 OCR
+전처리 이미지/원본 이미지에 여러 psm·언어 설정을 적용해 가장 좋은 결과를 선택
+(설정별 실행은 프로세스 풀에서 동시에 처리, 단어 신뢰도가 기준을 넘으면 바로 종료)
+
+백엔드 (환경변수 TESSERACT_BACKEND):
+- pytesseract: 호출마다 tesseract 실행 파일을 새로 띄움 (traineddata 재로드 + 임시 파일)
+- tesserocr: 워커 프로세스 안에서 초기화된 API 핸들을 (언어, psm)별로 재사용하고 이미지 버퍼를 직접 전달
+- auto (기본): tesserocr가 설치되어 있으면 tesserocr, 아니면 pytesseract
+"""
+
+import hashlib
+import importlib.util
+import io
+import os
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+
+# 시도할 설정 (이름, tesseract 설정, 원본 이미지 사용 여부)
+TESSERACT_PASSES = [
+    ("기본한국어", r'--oem 3 --psm 6 -l kor', False),
+    ("한국어+영어", r'--oem 3 --psm 6 -l kor+eng', False),
+    ("단일라인", r'--oem 3 --psm 7 -l kor+eng', False),
+    ("단일단어", r'--oem 3 --psm 8 -l kor+eng', False),
+    ("원본이미지", r'--oem 3 --psm 6 -l kor+eng', True),
+]
+
+
+def get_tesseract_backend() -> str:
+    """
+    사용할 Tesseract 백엔드 (환경변수 TESSERACT_BACKEND: auto, tesserocr, pytesseract)
+
+    Returns:
+        "tesserocr" 또는 "pytesseract"
+    """
+    backend = os.getenv("TESSERACT_BACKEND", "auto").strip().lower()
+    if backend == "auto":
+        return "tesserocr" if importlib.util.find_spec("tesserocr") is not None else "pytesseract"
+    if backend not in ("tesserocr", "pytesseract"):
+        raise ValueError(f"지원하지 않는 TESSERACT_BACKEND: {backend}")
+    return backend
+
+
+def parse_tesseract_config(config: str) -> Tuple[str, int, int]:
+    """
+    tesseract 명령행 설정에서 언어/psm/oem 추출
+
+    Args:
+        config: 예) '--oem 3 --psm 6 -l kor+eng'
+
+    Returns:
+        (언어, psm, oem)
+    """
+    lang = re.search(r"-l\s+(\S+)", config)
+    psm = re.search(r"--psm\s+(\d+)", config)
+    oem = re.search(r"--oem\s+(\d+)", config)
+    return (
+        lang.group(1) if lang else "eng",
+        int(psm.group(1)) if psm else 3,
+        int(oem.group(1)) if oem else 3,
+    )
+
+
+def get_confidence_threshold() -> float:
+    """조기 종료 기준 평균 단어 신뢰도 0~100 (환경변수 TESSERACT_CONFIDENCE_THRESHOLD, 기본 80)"""
+    return float(os.getenv("TESSERACT_CONFIDENCE_THRESHOLD", 80))
+
+
+def get_tesseract_workers() -> int:
+    """프로세스 풀 크기 (환경변수 TESSERACT_MAX_WORKERS, 기본: 설정 수와 CPU 코어 수 중 작은 값)"""
+    default = min(len(TESSERACT_PASSES), os.cpu_count() or 1)
+    return max(1, int(os.getenv("TESSERACT_MAX_WORKERS", default)))
+
+
+def preprocess_for_tesseract(image):
+    """
+    Tesseract용 고급 이미지 전처리
+
+    Args:
+        image: PIL Image
+
+    Returns:
+        전처리된 PIL Image (그레이스케일 → 블러 → 적응적 이진화 → 3배 확대 → 선명도 향상)
+    """
+    import cv2
+    import numpy as np
+    from PIL import Image, ImageEnhance
+
+    # 1. 이미지를 OpenCV 형식으로 변환
+    img_array = np.array(image)
+
+    # 2. 그레이스케일 변환
+    if len(img_array.shape) == 3:
+        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+    else:
+        gray = img_array
+
+    # 3. 노이즈 제거 (가우시안 블러)
+    denoised = cv2.GaussianBlur(gray, (3, 3), 0)
+
+    # 4. 적응적 임계값 처리 (Adaptive Threshold)
+    # 텍스트 영역을 더 명확하게 분리
+    thresh = cv2.adaptiveThreshold(
+        denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY, 11, 2
+    )
+
+    # 5. 모폴로지 연산으로 노이즈 제거
+    kernel = np.ones((1, 1), np.uint8)
+    cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+
+    # 6. 이미지 크기 확대 (3배로 증가)
+    height, width = cleaned.shape
+    enlarged = cv2.resize(cleaned, (width * 3, height * 3), interpolation=cv2.INTER_CUBIC)
+
+    # 7. PIL Image로 다시 변환
+    processed_image = Image.fromarray(enlarged)
+
+    # 8. 추가 선명도 향상
+    enhancer = ImageEnhance.Sharpness(processed_image)
+    return enhancer.enhance(1.5)
+
+
+# 워커 프로세스별 최근 이미지 (같은 이미지의 여러 설정을 한 워커가 처리하면 디코딩/전처리 재사용)
+_worker_images = {}
+
+# 워커 프로세스별 tesserocr API 핸들 ((언어, psm, oem) → PyTessBaseAPI)
+# 워커는 한 번에 설정 하나만 실행하므로 핸들을 잠금 없이 재사용
+_api_handles = {}
+
+
+def _limit_omp_threads():
+    """
+    tesseract가 OpenMP로 코어를 여러 개 쓰지 않도록 제한 (프로세스 풀/다른 요청과 겹치면 과부하)
+    libtesseract가 처음 로드되기 전(tesserocr/pytesseract import 전)에 호출해야 적용됨
+    (서버 프로세스에서는 OMP_THREAD_LIMIT를 직접 설정했으면 그 값을 유지)
+    """
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+def _init_worker():
+    """
+    워커 프로세스 초기화 (프로세스 풀 initializer 전용)
+    설정별 병렬 실행과 겹치지 않도록 워커는 항상 OpenMP 스레드 1개
+    """
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _load_images(image_data: bytes, digest: str):
+    """이미지 디코딩 + 전처리 (워커별로 마지막 이미지 1개만 보관)"""
+    cached = _worker_images.get(digest)
+    if cached is None:
+        from PIL import Image
+
+        original = Image.open(io.BytesIO(image_data))
+        original.load()
+        cached = (original, preprocess_for_tesseract(original))
+        _worker_images.clear()
+        _worker_images[digest] = cached
+    return cached
+
+
+def _get_api(lang: str, psm: int, oem: int):
+    """(언어, psm, oem)별 tesserocr API 핸들 (워커에서 처음 한 번만 초기화)"""
+    key = (lang, psm, oem)
+    api = _api_handles.get(key)
+    if api is None:
+        _limit_omp_threads()
+        import tesserocr
+
+        api = tesserocr.PyTessBaseAPI(lang=lang, psm=psm, oem=oem)
+        _api_handles[key] = api
+    return api
+
+
+def _set_image_buffer(api, image):
+    """PIL 이미지를 numpy 버퍼로 바로 전달 (임시 파일/PNG 인코딩 없음)"""
+    import numpy as np
+
+    if image.mode not in ("L", "RGB", "RGBA"):
+        image = image.convert("RGB")
+    array = np.ascontiguousarray(np.asarray(image, dtype=np.uint8))
+    height, width = array.shape[:2]
+    bytes_per_pixel = 1 if array.ndim == 2 else array.shape[2]
+    api.SetImageBytes(array.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+
+
+def _run_pass_tesserocr(image, config: str) -> Tuple[str, float]:
+    """tesserocr 백엔드로 설정 하나 실행 (텍스트, 평균 단어 신뢰도)"""
+    api = _get_api(*parse_tesseract_config(config))
+    _set_image_buffer(api, image)
+    try:
+        return api.GetUTF8Text().strip(), float(api.MeanTextConf())
+    finally:
+        api.Clear()
+
+
+def _run_pass_pytesseract(image, config: str) -> Tuple[str, float]:
+    """
+    pytesseract 백엔드로 설정 하나 실행
+    image_to_data의 단어별 결과로 텍스트와 평균 신뢰도를 함께 계산 (호출 1번)
+    """
+    _limit_omp_threads()  # tesseract 실행 파일이 환경변수를 물려받음
+    import pytesseract
+
+    data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+
+    lines = {}
+    confidences = []
+    for index, word in enumerate(data["text"]):
+        word = (word or "").strip()
+        confidence = float(data["conf"][index])
+        # conf가 -1인 항목은 단어가 아닌 블록/줄 구분
+        if not word or confidence < 0:
+            continue
+        line_key = (data["block_num"][index], data["par_num"][index], data["line_num"][index])
+        lines.setdefault(line_key, []).append(word)
+        confidences.append(confidence)
+
+    text = "\n".join(" ".join(words) for words in lines.values())
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return text, confidence
+
+
+def _run_pass(
+    image_data: bytes,
+    digest: str,
+    config: str,
+    use_original: bool,
+    backend: str = "pytesseract"
+) -> Tuple[str, float]:
+    """
+    설정 하나로 OCR 실행 (프로세스 풀 워커에서 실행 - pickle 가능하도록 모듈 최상위 함수)
+
+    Args:
+        image_data: 원본 이미지 바이트 (전처리 결과보다 훨씬 작아 워커로 보내기 저렴)
+        digest: 이미지 해시 (워커 내 재사용 키)
+        config: tesseract 설정 문자열
+        use_original: True면 전처리하지 않은 원본 이미지 사용
+        backend: "tesserocr" 또는 "pytesseract"
+
+    Returns:
+        (인식된 텍스트, 평균 단어 신뢰도 0~100)
+    """
+    original, processed = _load_images(image_data, digest)
+    image = original if use_original else processed
+
+    if backend == "tesserocr":
+        return _run_pass_tesserocr(image, config)
+    return _run_pass_pytesseract(image, config)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """프로세스 공용 Tesseract 워커 풀"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=get_tesseract_workers(), initializer=_init_worker)
+        return _executor
+
+
+def _reset_executor():
+    """워커가 죽어 망가진 풀 폐기 (다음 요청에서 새로 생성)"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def warm_backend(image_data: bytes):
+    """
+    현재 프로세스에서 설정 하나를 실행하여 백엔드 로드 확인 (서버 예열용)
+
+    Raises:
+        ImportError: 백엔드 라이브러리가 설치되지 않은 경우
+    """
+    name, config, use_original = TESSERACT_PASSES[0]
+    _run_pass(image_data, hashlib.sha256(image_data).hexdigest(), config, use_original, get_tesseract_backend())
+
+
+class PassStats:
+    """
+    설정별 승률 기록 (스레드 안전)
+
+    요청마다 채택된 설정을 기록하고, 승률이 높은 설정부터 먼저 실행하도록 순서를 제공합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs = {name: 0 for name, _, _ in TESSERACT_PASSES}
+        self._wins = {name: 0 for name, _, _ in TESSERACT_PASSES}
+
+    def win_rate(self, name: str) -> float:
+        """평활화한 승률 (기록이 적을 때 한두 번의 결과에 휘둘리지 않도록)"""
+        return (self._wins.get(name, 0) + 1) / (self._runs.get(name, 0) + 2)
+
+    def ordered_passes(self) -> List[Tuple[str, str, bool]]:
+        """승률 높은 순으로 정렬한 설정 목록 (같으면 TESSERACT_PASSES 순서)"""
+        with self._lock:
+            return sorted(TESSERACT_PASSES, key=lambda item: -self.win_rate(item[0]))
+
+    def record(self, ran: List[str], winner: Optional[str]):
+        """
+        요청 1건 결과 기록
+
+        Args:
+            ran: 실행을 마친 설정 이름 목록
+            winner: 채택된 설정 이름 (없으면 None)
+        """
+        with self._lock:
+            for name in ran:
+                self._runs[name] = self._runs.get(name, 0) + 1
+            if winner is not None:
+                self._wins[winner] = self._wins.get(winner, 0) + 1
+
+    def snapshot(self) -> Dict:
+        """설정별 실행/채택 횟수와 승률 (상태 확인용)"""
+        with self._lock:
+            return {
+                name: {"runs": self._runs[name], "wins": self._wins[name], "win_rate": round(self.win_rate(name), 3)}
+                for name in self._runs
+            }
+
+
+pass_stats = PassStats()
+
+
+def _pick_best(results: Dict[str, Tuple[str, float]]) -> Optional[str]:
+    """텍스트를 찾은 설정 중 신뢰도가 가장 높은 설정 (같으면 더 긴 텍스트)"""
+    candidates = [name for name, (text, _) in results.items() if text]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda name: (results[name][1], len(results[name][0])))
+
+
+def _run_passes(image_data: bytes, passes: List[Tuple[str, str, bool]], threshold: float) -> Dict[str, Tuple[str, float]]:
+    """
+    설정 실행 - 가장 승률 높은 설정을 먼저 실행하고, 기준 미달이면 나머지를 동시에 실행
+    어느 설정이든 기준을 넘으면 남은 설정을 기다리지 않고 종료
+
+    Returns:
+        {설정 이름: (텍스트, 신뢰도)} - 완료된 설정만
+    """
+    digest = hashlib.sha256(image_data).hexdigest()
+    backend = get_tesseract_backend()
+    results = {}
+
+    def clears(name: str) -> bool:
+        text, confidence = results[name]
+        return bool(text) and confidence >= threshold
+
+    try:
+        executor = _get_executor()
+        first, rest = passes[0], passes[1:]
+
+        name, config, use_original = first
+        results[name] = executor.submit(_run_pass, image_data, digest, config, use_original, backend).result()
+        if clears(name) or not rest:
+            return results
+
+        pending = {
+            executor.submit(_run_pass, image_data, digest, config, use_original, backend): name
+            for name, config, use_original in rest
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                results[name] = future.result()
+                if clears(name):
+                    # 아직 시작하지 않은 설정은 취소 (실행 중인 설정은 결과를 버림)
+                    for other in pending:
+                        other.cancel()
+                    return results
+    except BrokenProcessPool:
+        # 워커가 비정상 종료된 경우 이번 요청은 현재 프로세스에서 순서대로 처리
+        # (현재 프로세스도 백엔드 import 전에 OMP_THREAD_LIMIT 제한 - _limit_omp_threads)
+        _reset_executor()
+        for name, config, use_original in passes:
+            if name in results:
+                continue
+            results[name] = _run_pass(image_data, digest, config, use_original, backend)
+            if clears(name):
+                break
+
+    return results
+
+
+def recognize(image_data: bytes, threshold: Optional[float] = None) -> Optional[Dict]:
+    """
+    다중 설정 Tesseract OCR - 단어 신뢰도 기준 조기 종료, 가장 신뢰도 높은 결과 선택
+
+    Args:
+        image_data: 이미지 바이트 데이터
+        threshold: 조기 종료 기준 신뢰도 (None이면 get_confidence_threshold())
+
+    Returns:
+        {"pass": 설정 이름, "text": 텍스트, "confidence": 신뢰도, "passes_run": 실행한 설정 수}
+        또는 텍스트를 찾지 못하면 None
+    """
+    threshold = get_confidence_threshold() if threshold is None else threshold
+
+    results = _run_passes(image_data, pass_stats.ordered_passes(), threshold)
+    winner = _pick_best(results)
+    pass_stats.record(list(results), winner)
+
+    if winner is None:
+        return None
+
+    text, confidence = results[winner]
+    return {
+        "pass": winner,
+        "text": text,
+        "confidence": round(confidence, 1),
+        "passes_run": len(results),
+    }
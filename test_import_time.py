@@ -0,0 +1,106 @@
+"""
+import 시간 벤치마크
+Naver만 쓰는 서버/CLI가 무거운 라이브러리(cv2, numpy, torch, paddle 등)를 로딩하지 않고
+1초 안에 시작되는지 확인
+
+실행:
+    python test_import_time.py
+    (IMPORT_TIME_BUDGET 환경변수로 허용 시간(초) 변경, 실패 시 종료 코드 1)
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+# 처음 쓸 때까지 import되면 안 되는 무거운 라이브러리
+HEAVY_MODULES = [
+    "cv2", "numpy", "PIL", "torch", "transformers",
+    "paddle", "paddleocr", "pytesseract", "tesserocr",
+    "openai", "google.cloud.vision",
+]
+
+# 확인할 모듈 (import 대상, 설명)
+TARGETS = [
+    ("ocr_processor", "OCR 프로세서"),
+    ("engine_registry", "엔진 레지스트리"),
+    ("tesseract_engine", "Tesseract 엔진"),
+    ("simple_web_ocr", "Flask 웹 서버"),
+    ("sibang_ocr_prototype", "Sibang 프로토타입"),
+    ("sibang_ocr_development", "Sibang 개발 버전"),
+]
+
+# 새 인터프리터에서 import 시간과 로딩된 무거운 모듈을 측정하는 코드
+MEASURE_CODE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure_import(module: str) -> dict:
+    """
+    새 파이썬 프로세스에서 모듈 import 시간 측정 (이미 import된 모듈 캐시의 영향 제거)
+
+    Args:
+        module: 모듈 이름
+
+    Returns:
+        {"seconds": import 시간, "heavy": 함께 로딩된 무거운 모듈} 또는 {"error": 메시지}
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", MEASURE_CODE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        last_line = (completed.stderr.strip().splitlines() or ["알 수 없는 오류"])[-1]
+        return {"error": last_line}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark() -> bool:
+    """
+    모든 대상 모듈의 import 시간/무거운 모듈 로딩 여부 확인
+
+    Returns:
+        모두 통과하면 True
+    """
+    budget = float(os.getenv("IMPORT_TIME_BUDGET", 1.0))
+
+    print("⏱️ import 시간 벤치마크")
+    print("=" * 50)
+    print(f"허용 시간: {budget:.2f}초")
+
+    passed = True
+    for module, description in TARGETS:
+        result = measure_import(module)
+
+        if "error" in result:
+            # 웹 프레임워크 등 필수 라이브러리가 없는 환경에서는 건너뜀
+            print(f"⚠️  {description} ({module}): 건너뜀 - {result['error']}")
+            continue
+
+        ok = result["seconds"] <= budget and not result["heavy"]
+        passed = passed and ok
+        mark = "✅" if ok else "❌"
+        print(f"{mark} {description} ({module}): {result['seconds']:.3f}초")
+        if result["heavy"]:
+            print(f"   ↳ 처음 사용 전에 로딩된 라이브러리: {', '.join(result['heavy'])}")
+
+    print("=" * 50)
+    print("🎉 통과" if passed else "❌ 실패 - 무거운 라이브러리는 사용하는 함수 안에서 import하세요.")
+    return passed
+
+
+def test_import_time():
+    """pytest 등 테스트 러너용 - 실패하면 AssertionError"""
+    assert run_benchmark(), "import 시간 허용치 초과 또는 무거운 라이브러리 로딩"
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
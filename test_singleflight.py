@@ -0,0 +1,106 @@
+"""
+동일 요청 합치기 테스트
+웹 페이지에서 "🚀 OCR 시작"을 연달아 눌러 같은 이미지가 동시에 두 번 들어와도
+유료 엔진(Naver Clova / GPT-4 Vision)은 한 번만 호출되는지 확인
+
+실행:
+    python test_singleflight.py
+    (실제 API는 호출하지 않음 - 엔진 실행 함수를 호출 횟수를 세는 함수로 교체)
+"""
+
+import io
+import os
+import sys
+import time
+import threading
+
+# 실제 키가 없어도 설정 확인을 통과하도록 (실제 환경변수가 설정 파일보다 우선)
+os.environ.setdefault("NAVER_OCR_SECRET_KEY", "test-secret")
+os.environ.setdefault("NAVER_OCR_API_URL", "https://example.invalid/ocr")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ["OCR_SINGLEFLIGHT"] = "true"
+os.environ["OCR_CACHE_ENABLED"] = "false"
+
+from ocr_processor import MarketOCRProcessor
+
+IMAGE_DATA = b"\xff\xd8\xff\xe0" + b"singleflight-test-image" * 64
+ENGINE_SECONDS = 0.5
+
+
+def _patch_engine(calls: list) -> None:
+    """엔진 실행을 느린 가짜 엔진으로 교체 (호출된 방법을 calls에 기록)"""
+
+    def fake_run_engine(self, image_data, method, image_path=None, deadline=None):
+        calls.append(method)
+        time.sleep(ENGINE_SECONDS)
+        return {
+            "raw_text": "사과 1000원",
+            "products": [{"product_name": "사과", "price": "1000", "unit": "원"}],
+        }
+
+    MarketOCRProcessor._run_engine = fake_run_engine
+    MarketOCRProcessor._check_dependencies = lambda self, method: None
+
+
+def _run_twice(submit) -> list:
+    """같은 요청을 두 스레드에서 동시에 실행하고 결과 목록 반환"""
+    results = [None, None]
+    start = threading.Barrier(2)
+
+    def worker(index):
+        start.wait()
+        results[index] = submit()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _submit_page(client, engine: str):
+    """Flask 페이지에 같은 이미지 업로드 (없으면 None)"""
+    return lambda: client.post(
+        "/",
+        data={"ocr_engine": engine, "image": (io.BytesIO(IMAGE_DATA), "market.jpg")},
+        content_type="multipart/form-data",
+    )
+
+
+def test_concurrent_duplicate_uploads_call_engine_once():
+    """같은 이미지를 동시에 두 번 올리면 엔진별로 한 번만 호출되어야 함"""
+    try:
+        import simple_web_ocr
+    except ImportError:
+        simple_web_ocr = None
+
+    for engine in ("naver_clova", "gpt4_vision"):
+        calls = []
+        _patch_engine(calls)
+
+        if simple_web_ocr is not None:
+            client = simple_web_ocr.app.test_client()
+            responses = _run_twice(_submit_page(client, engine))
+            assert all(response.status_code == 200 for response in responses)
+        else:
+            # 웹 프레임워크가 없는 환경 - 페이지와 같은 방식(스풀 해시 전달)으로 직접 호출
+            import hashlib
+            digest = hashlib.sha256(IMAGE_DATA).hexdigest()
+            processor = MarketOCRProcessor(method=engine)
+            results = _run_twice(lambda: processor.process_image_bytes(
+                IMAGE_DATA, image_path="market.jpg", image_digest=digest
+            ))
+            assert all("error" not in result for result in results), results
+
+        print(f"{engine}: 엔진 호출 {len(calls)}회")
+        assert calls == [engine], f"{engine} 엔진이 {len(calls)}번 호출됨 (기대: 1번)"
+
+
+if __name__ == "__main__":
+    try:
+        test_concurrent_duplicate_uploads_call_engine_once()
+    except AssertionError as e:
+        print(f"❌ 실패: {e}")
+        sys.exit(1)
+    print("🎉 통과 - 동시에 들어온 같은 이미지는 엔진을 한 번만 호출")
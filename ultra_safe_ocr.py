@@ -7,13 +7,9 @@
 import os
 import base64
 import json
-import tempfile
-import uuid
 from typing import Dict
 
-# 환경변수 로드
-from dotenv import load_dotenv
-load_dotenv("sibangaiocr.env")
+from settings import get_settings
 
 class UltraSafeOCR:
     """
@@ -22,47 +18,33 @@ class UltraSafeOCR:
     
     def __init__(self):
         """초기화"""
-        self.api_key = os.getenv("OPENAI_API_KEY")
+        self.api_key = get_settings().openai_api_key
         if not self.api_key:
             raise ValueError("OpenAI API key not found")
         
-        # OpenAI 클라이언트 생성
-        from openai import OpenAI
-        self.client = OpenAI(api_key=self.api_key)
+        # 공용 OpenAI 클라이언트 (연결 풀 재사용)
+        from ocr_clients import get_openai_client
+        self.client = get_openai_client(self.api_key)
     
     def safe_encode_image(self, image_path: str) -> str:
         """
         완전히 안전한 이미지 인코딩
+        바이너리 모드로 바로 읽어 Base64 인코딩 (임시 파일 복사 없음)
         """
         try:
-            # 1단계: 안전한 임시 파일 생성
-            safe_filename = f"safe_image_{uuid.uuid4().hex}.jpg"
-            temp_dir = tempfile.gettempdir()
-            safe_path = os.path.join(temp_dir, safe_filename)
-            
-            # 2단계: 원본 파일을 안전한 경로로 복사
-            import shutil
-            shutil.copy2(image_path, safe_path)
-            
-            # 3단계: 안전한 경로에서 이미지 읽기
-            with open(safe_path, "rb") as f:
+            with open(image_path, "rb") as f:
                 image_data = f.read()
-            
-            # 4단계: Base64 인코딩 (ASCII 디코딩)
-            encoded = base64.b64encode(image_data)
-            result = encoded.decode('ascii')
-            
-            # 5단계: 임시 파일 정리
-            try:
-                os.unlink(safe_path)
-            except:
-                pass
-            
-            return result
+            return self.safe_encode_bytes(image_data)
             
         except Exception as e:
             raise Exception(f"Image encoding failed: {str(e)}")
     
+    def safe_encode_bytes(self, image_data: bytes) -> str:
+        """
+        이미지 바이트를 Base64 문자열로 인코딩 (ASCII 디코딩)
+        """
+        return base64.b64encode(image_data).decode('ascii')
+    
     def process_image(self, image_path: str) -> Dict:
         """
         이미지 OCR 처리 (완전 안전 버전)
@@ -70,7 +52,20 @@ class UltraSafeOCR:
         try:
             # 이미지 인코딩
             base64_image = self.safe_encode_image(image_path)
-            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": "OCR processing failed"
+            }
+        
+        return self.process_base64(base64_image)
+    
+    def process_base64(self, base64_image: str) -> Dict:
+        """
+        Base64 인코딩된 이미지 OCR 처리 (업로드 스풀에서 바로 인코딩한 경우)
+        """
+        try:
             # 영어 프롬프트 (ASCII 전용)
             prompt = """Analyze this image and extract product information. 
             Return JSON format: {"products": [{"product_name": "name", "price": "price"}]}
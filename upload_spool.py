@@ -0,0 +1,153 @@
+"""
+업로드 파일 스풀링
+업로드를 청크 단위로 받아 크기 제한을 적용하고, 받는 동안 해시를 계산
+(작은 파일은 메모리, 큰 파일은 임시 파일에 보관하여 요청당 메모리 사용량을 제한)
+"""
+
+import base64
+import hashlib
+import io
+import os
+import tempfile
+from typing import BinaryIO, Optional
+
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB 단위로 읽기
+# Base64는 3바이트 단위로 끊어 인코딩해야 청크를 이어 붙여도 결과가 같음
+BASE64_CHUNK_SIZE = 3 * 256 * 1024
+
+
+def get_max_upload_bytes() -> int:
+    """업로드 최대 크기 (환경변수 OCR_MAX_UPLOAD_MB, 기본 20MB)"""
+    return int(float(os.getenv("OCR_MAX_UPLOAD_MB", 20)) * 1024 * 1024)
+
+
+def get_spool_memory_bytes() -> int:
+    """이 크기를 넘으면 임시 파일로 넘김 (환경변수 OCR_UPLOAD_SPOOL_MB, 기본 1MB)"""
+    return int(float(os.getenv("OCR_UPLOAD_SPOOL_MB", 1)) * 1024 * 1024)
+
+
+class UploadTooLarge(ValueError):
+    """업로드가 최대 크기를 넘은 경우"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"파일이 너무 큽니다 (최대 {max_bytes // (1024 * 1024)}MB)")
+        self.max_bytes = max_bytes
+
+
+class SpooledUpload:
+    """
+    크기 제한이 있는 업로드 스풀
+
+    write()로 청크를 받을 때마다 SHA-256을 갱신하므로
+    캐시 키 계산을 위해 전체 바이트를 다시 읽을 필요가 없습니다.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        memory_bytes: Optional[int] = None,
+        filename: Optional[str] = None,
+        file: Optional[BinaryIO] = None
+    ):
+        """
+        초기화 함수
+
+        Args:
+            max_bytes: 최대 크기 (None이면 get_max_upload_bytes())
+            memory_bytes: 메모리에 둘 최대 크기 (None이면 get_spool_memory_bytes())
+            filename: 원본 파일명 (결과 메타데이터용)
+            file: 웹 프레임워크가 이미 스풀한 파일 객체 (주어지면 복사하지 않고 그대로 사용,
+                  write()는 그 내용을 읽으며 크기/해시만 갱신)
+        """
+        self.max_bytes = get_max_upload_bytes() if max_bytes is None else max_bytes
+        self.filename = filename
+        self.size = 0
+        self._adopted = file is not None
+        self.file = file if file is not None else tempfile.SpooledTemporaryFile(
+            max_size=get_spool_memory_bytes() if memory_bytes is None else memory_bytes
+        )
+        self._sha256 = hashlib.sha256()
+
+    def write(self, chunk: bytes):
+        """
+        청크 추가 (최대 크기 초과 시 즉시 중단)
+
+        Raises:
+            UploadTooLarge: 최대 크기를 넘은 경우
+        """
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge(self.max_bytes)
+        self._sha256.update(chunk)
+        if not self._adopted:
+            self.file.write(chunk)
+
+    @property
+    def digest(self) -> str:
+        """지금까지 받은 바이트의 SHA-256 16진수 문자열"""
+        return self._sha256.hexdigest()
+
+    def stream(self) -> BinaryIO:
+        """처음부터 읽을 수 있는 파일 객체 (PIL.Image.open 등에 바로 전달)"""
+        self.file.seek(0)
+        return self.file
+
+    def read(self) -> bytes:
+        """전체 바이트 (엔진이 바이트를 요구할 때 한 번만 읽기)"""
+        return self.stream().read()
+
+    def base64(self) -> str:
+        """원본 바이트 전체를 메모리에 올리지 않고 청크 단위로 Base64 인코딩"""
+        stream = self.stream()
+        encoded = io.StringIO()
+        while True:
+            chunk = stream.read(BASE64_CHUNK_SIZE)
+            if not chunk:
+                break
+            encoded.write(base64.b64encode(chunk).decode("ascii"))
+        return encoded.getvalue()
+
+    def close(self):
+        """스풀 정리 (임시 파일 삭제)"""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def spool_stream(
+    stream: BinaryIO,
+    max_bytes: Optional[int] = None,
+    filename: Optional[str] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> SpooledUpload:
+    """
+    파일 객체를 청크 단위로 읽어 스풀에 저장
+
+    Args:
+        stream: 업로드 파일 객체 (Flask FileStorage.stream, Streamlit UploadedFile 등)
+        max_bytes: 최대 크기 (None이면 get_max_upload_bytes())
+        filename: 원본 파일명
+        chunk_size: 한 번에 읽을 크기
+
+    Returns:
+        SpooledUpload (사용 후 close() 필요)
+
+    Raises:
+        UploadTooLarge: 최대 크기를 넘은 경우
+    """
+    upload = SpooledUpload(max_bytes, filename=filename)
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            upload.write(chunk)
+    except Exception:
+        upload.close()
+        raise
+    return upload
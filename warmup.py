@@ -0,0 +1,185 @@
+"""
+서버 시작 시 로컬 OCR 엔진 예열
+모델 로드 + 더미 추론을 미리 끝내고 준비 상태(readiness)를 제공
+"""
+
+import io
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# 예열 대상 로컬 엔진 (OCR_PREWARM_ENGINES로 변경, 빈 값이면 예열 안 함)
+DEFAULT_PREWARM_ENGINES = "pp_ocrv5,tesseract"
+
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts", "Paperlogy-4Regular.ttf")
+
+
+def get_prewarm_engines() -> List[str]:
+    """예열할 엔진 목록 (환경변수 OCR_PREWARM_ENGINES, 쉼표 구분)"""
+    value = os.getenv("OCR_PREWARM_ENGINES", DEFAULT_PREWARM_ENGINES)
+    return [engine.strip() for engine in value.split(",") if engine.strip()]
+
+
+def make_synthetic_image() -> bytes:
+    """
+    더미 추론용 가격표 이미지 생성 (PNG 바이트)
+
+    Returns:
+        흰 바탕에 "사과 1,000원"이 적힌 PNG 이미지
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new("RGB", (480, 120), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.truetype(FONT_PATH, 48)
+        text = "사과 1,000원"
+    except Exception:
+        font = ImageFont.load_default()
+        text = "1,000"
+    draw.text((20, 30), text, fill=(0, 0, 0), font=font)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _warm_pp_ocrv5(image_data: Optional[bytes]):
+    """PP-OCRv5 모델 로드 + 더미 추론 (image_data가 None이면 로드만)"""
+    from ocr_processor import MarketOCRProcessor
+
+    processor = MarketOCRProcessor(method="pp_ocrv5", use_cache=False)
+    processor._load_pp_ocrv5_model()  # 미설치 시 ImportError
+    if image_data is None:
+        return
+    result = processor.process_with_pp_ocrv5_bytes(image_data)
+    # 텍스트를 못 찾는 것은 괜찮지만 모델 로드/실행 오류는 실패로 처리
+    if "error" in result and result.get("raw_text") is None:
+        raise Exception(result["error"])
+
+
+def _warm_tesseract(image_data: Optional[bytes]):
+    """Tesseract 백엔드 import + 한국어 traineddata 로드 확인 (image_data가 None이면 import만)"""
+    import importlib
+
+    from tesseract_engine import get_tesseract_backend, warm_backend
+
+    if image_data is None:
+        importlib.import_module(get_tesseract_backend())  # 미설치 시 ImportError
+        return
+    warm_backend(image_data)
+
+
+WARMERS = {
+    "pp_ocrv5": _warm_pp_ocrv5,
+    "tesseract": _warm_tesseract,
+}
+
+
+class ReadinessState:
+    """
+    예열 진행 상태 (스레드 안전)
+
+    엔진별 상태: pending → warming → ready / unavailable(라이브러리 미설치) / failed
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = False
+        self._engines = {}
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def ready(self) -> bool:
+        """모든 예열이 끝났는지 여부"""
+        return self._ready
+
+    def set_engine(self, engine: str, status: str, **details):
+        """엔진 상태 기록"""
+        with self._lock:
+            self._engines[engine] = {"status": status, **details}
+
+    def mark_started(self, engines: List[str]):
+        """예열 시작"""
+        with self._lock:
+            self._ready = False
+            self.started_at = datetime.now().isoformat()
+            self._engines = {engine: {"status": "pending"} for engine in engines}
+
+    def mark_ready(self):
+        """예열 완료"""
+        with self._lock:
+            self.finished_at = datetime.now().isoformat()
+            self._ready = True
+
+    def snapshot(self) -> Dict:
+        """현재 상태 딕셔너리 (준비 상태 엔드포인트 응답용)"""
+        with self._lock:
+            return {
+                "status": "ready" if self._ready else "warming",
+                "engines": {name: dict(info) for name, info in self._engines.items()},
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+readiness = ReadinessState()
+
+
+def prewarm(engines: Optional[List[str]] = None, state: ReadinessState = readiness, infer: bool = True) -> Dict:
+    """
+    로컬 엔진 예열 (모델 로드 + 합성 이미지 더미 추론)
+
+    설치되지 않은 엔진은 unavailable로 표시하고 준비 상태를 막지 않습니다.
+
+    Args:
+        engines: 예열할 엔진 목록 (None이면 환경변수 설정)
+        state: 상태를 기록할 ReadinessState
+        infer: False면 모델 로드만 (프리포크 마스터용 - fork 전에 추론하면 추론 라이브러리가 만든
+               스레드 풀/잠금 상태가 워커에 복사되어 멈출 수 있으므로 추론은 워커에서)
+
+    Returns:
+        예열 후 상태 스냅샷
+    """
+    engines = get_prewarm_engines() if engines is None else engines
+    state.mark_started(engines)
+
+    image_data = None
+    for engine in engines:
+        warmer = WARMERS.get(engine)
+        if warmer is None:
+            state.set_engine(engine, "unavailable", error="예열을 지원하지 않는 엔진")
+            continue
+
+        state.set_engine(engine, "warming")
+        started = time.perf_counter()
+        try:
+            if infer and image_data is None:
+                image_data = make_synthetic_image()
+            warmer(image_data if infer else None)
+            state.set_engine(engine, "ready", seconds=round(time.perf_counter() - started, 2))
+            print(f"🔥 {engine} {'예열' if infer else '모델 로드'} 완료 ({time.perf_counter() - started:.1f}초)")
+        except ImportError as e:
+            state.set_engine(engine, "unavailable", error=str(e))
+        except Exception as e:
+            state.set_engine(engine, "failed", error=str(e))
+            print(f"⚠️ {engine} 예열 실패: {e}")
+
+    state.mark_ready()
+    return state.snapshot()
+
+
+def start_prewarm(engines: Optional[List[str]] = None, state: ReadinessState = readiness) -> threading.Thread:
+    """
+    백그라운드 스레드에서 예열 시작 (서버는 바로 요청을 받되 준비 전에는 readiness가 503)
+
+    Returns:
+        예열 스레드
+    """
+    thread = threading.Thread(target=prewarm, args=(engines, state), name="ocr-prewarm", daemon=True)
+    thread.start()
+    return thread